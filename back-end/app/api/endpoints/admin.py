@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, Path, HTTPException, status
+from fastapi.responses import FileResponse
+from datetime import datetime
+from app.core.dependencies import require_admin
+from app.core.profiling import profile_store
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+router = APIRouter(
+    prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin)]
+)
+
+
+@router.get("/profiles")
+async def list_profiles():
+    """List captured request profiles, newest first"""
+
+    try:
+        return {
+            "success": True,
+            "data": {"profiles": profile_store.list()},
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+        }
+
+    except Exception as e:
+        logger.error("Error listing profiles: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error",
+        )
+
+
+@router.get("/profiles/{name}")
+async def download_profile(name: str = Path(..., description="Profile file name")):
+    """Download a profile in collapsed-stack format"""
+
+    path = profile_store.path_for(name)
+    if not path:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Profile '{name}' not found",
+        )
+
+    return FileResponse(path, media_type="text/plain", filename=name)
@@ -3,6 +3,7 @@ from typing import Optional
 from datetime import datetime
 from app.services.course_service import CourseService
 from app.schemas.responses import CourseListResponse, CourseDetailResponse
+from app.core.deadline import TIMEOUT_ERRORS, DeadlineExceeded
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -79,8 +80,10 @@ async def get_courses(
             timestamp=datetime.utcnow().isoformat() + "Z",
         )
 
+    except TIMEOUT_ERRORS:
+        raise DeadlineExceeded()
     except Exception as e:
-        logger.error(f"Error fetching courses: {str(e)}")
+        logger.error("Error fetching courses: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error",
@@ -135,8 +138,10 @@ async def search_courses(
 
     except HTTPException:
         raise
+    except TIMEOUT_ERRORS:
+        raise DeadlineExceeded()
     except Exception as e:
-        logger.error(f"Error searching courses: {str(e)}")
+        logger.error("Error searching courses: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error",
@@ -162,8 +167,10 @@ async def get_course(courseId: str = Path(..., description="Course identifier"))
 
     except HTTPException:
         raise
+    except TIMEOUT_ERRORS:
+        raise DeadlineExceeded()
     except Exception as e:
-        logger.error(f"Error fetching course {courseId}: {str(e)}")
+        logger.error("Error fetching course %s: %s", courseId, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error",
@@ -171,11 +178,20 @@ async def get_course(courseId: str = Path(..., description="Course identifier"))
 
 
 @router.get("/{courseId}/prerequisites")
-async def get_prerequisites(courseId: str = Path(..., description="Course identifier")):
+async def get_prerequisites(
+    courseId: str = Path(..., description="Course identifier"),
+    completed: Optional[str] = Query(
+        None,
+        description="Comma-separated completed course IDs to check against",
+    ),
+):
     """Get course prerequisites"""
 
     try:
-        result = CourseService.get_prerequisites(courseId)
+        completed_courses = None
+        if completed is not None:
+            completed_courses = [c for c in completed.split(",") if c.strip()]
+        result = CourseService.get_prerequisites(courseId, completed_courses)
 
         if not result:
             raise HTTPException(
@@ -191,8 +207,10 @@ async def get_prerequisites(courseId: str = Path(..., description="Course identi
 
     except HTTPException:
         raise
+    except TIMEOUT_ERRORS:
+        raise DeadlineExceeded()
     except Exception as e:
-        logger.error(f"Error fetching prerequisites for {courseId}: {str(e)}")
+        logger.error("Error fetching prerequisites for %s: %s", courseId, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error",
@@ -223,8 +241,50 @@ async def get_instructors(
 
     except HTTPException:
         raise
+    except TIMEOUT_ERRORS:
+        raise DeadlineExceeded()
+    except Exception as e:
+        logger.error("Error fetching instructors for %s: %s", courseId, e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error",
+        )
+
+
+@router.get("/{courseId}/grades")
+async def get_grades(
+    courseId: str = Path(..., description="Course identifier"),
+    instructor: Optional[str] = Query(
+        None, description="Only this instructor (e.g. 'Challen, Geoffrey W')"
+    ),
+):
+    """Get the course's grade histograms, weighted GPA and percentiles"""
+
+    try:
+        result = CourseService.get_grades(courseId, instructor=instructor)
+
+        if not result:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=(
+                    f"No grade data for '{instructor}' in course '{courseId}'"
+                    if instructor
+                    else f"No grade data for course '{courseId}'"
+                ),
+            )
+
+        return {
+            "success": True,
+            "data": result,
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+        }
+
+    except HTTPException:
+        raise
+    except TIMEOUT_ERRORS:
+        raise DeadlineExceeded()
     except Exception as e:
-        logger.error(f"Error fetching instructors for {courseId}: {str(e)}")
+        logger.error("Error fetching grades for %s: %s", courseId, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error",
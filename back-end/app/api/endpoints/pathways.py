@@ -4,6 +4,7 @@ from datetime import datetime
 from app.services.pathway_service import PathwayService
 from app.services.recommendation_service import RecommendationService
 from app.schemas.requests import RecommendationRequest
+from app.core.deadline import TIMEOUT_ERRORS, DeadlineExceeded
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -24,8 +25,10 @@ async def get_pathways():
             "timestamp": datetime.utcnow().isoformat() + "Z",
         }
 
+    except TIMEOUT_ERRORS:
+        raise DeadlineExceeded()
     except Exception as e:
-        logger.error(f"Error fetching pathways: {str(e)}")
+        logger.error("Error fetching pathways: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error",
@@ -53,8 +56,10 @@ async def get_pathway(pathwayId: str = Path(..., description="Pathway identifier
 
     except HTTPException:
         raise
+    except TIMEOUT_ERRORS:
+        raise DeadlineExceeded()
     except Exception as e:
-        logger.error(f"Error fetching pathway {pathwayId}: {str(e)}")
+        logger.error("Error fetching pathway %s: %s", pathwayId, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error",
@@ -88,8 +93,10 @@ async def get_pathway_courses(
 
     except HTTPException:
         raise
+    except TIMEOUT_ERRORS:
+        raise DeadlineExceeded()
     except Exception as e:
-        logger.error(f"Error fetching courses for pathway {pathwayId}: {str(e)}")
+        logger.error("Error fetching courses for pathway %s: %s", pathwayId, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error",
@@ -133,8 +140,10 @@ async def get_recommendations(
 
     except HTTPException:
         raise
+    except TIMEOUT_ERRORS:
+        raise DeadlineExceeded()
     except Exception as e:
-        logger.error(f"Error generating recommendations for {pathwayId}: {str(e)}")
+        logger.error("Error generating recommendations for %s: %s", pathwayId, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error",
@@ -6,6 +6,7 @@ from app.schemas.responses import (
     TaggedCourseListResponse,
     TaggedCourseDetailResponse,
 )
+from app.core.deadline import TIMEOUT_ERRORS, DeadlineExceeded
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -57,8 +58,10 @@ async def list_tagged_courses(
             timestamp=datetime.utcnow().isoformat() + "Z",
         )
 
+    except TIMEOUT_ERRORS:
+        raise DeadlineExceeded()
     except Exception as e:
-        logger.error(f"Error listing tagged courses: {str(e)}")
+        logger.error("Error listing tagged courses: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error",
@@ -85,8 +88,10 @@ async def get_tags_for_course(courseId: str = Path(..., description="Course ID")
 
     except HTTPException:
         raise
+    except TIMEOUT_ERRORS:
+        raise DeadlineExceeded()
     except Exception as e:
-        logger.error(f"Error getting tags for course {courseId}: {str(e)}")
+        logger.error("Error getting tags for course %s: %s", courseId, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error",
@@ -0,0 +1,147 @@
+import asyncio
+import re
+from typing import Dict, Optional
+from app.core.config import settings
+from app.core.deadline import deadline_var, set_deadline
+from app.core.exceptions import ServiceUnavailableError, error_response
+from app.core.logging import get_logger
+from app.core.metrics import ADMISSION_REJECTIONS, ADMISSION_WAIT
+
+logger = get_logger(__name__)
+
+# Requests are grouped by how expensive they are; each class gets its own
+# in-flight limit so a burst of recommends can't starve cheap lookups.
+ROUTE_CLASSES = (
+    ("recommend", "POST", re.compile(r"^/api/v1/pathways/[^/]+/recommend$")),
+    ("search", "GET", re.compile(r"^/api/v1/courses/search$")),
+    ("listing", "GET", re.compile(r"^/api/v1/(courses|tagged-courses)$")),
+    ("listing", "GET", re.compile(r"^/api/v1/pathways/[^/]+/courses$")),
+)
+DEFAULT_CLASS = "default"
+
+# Operational endpoints must answer even when the API is saturated
+EXEMPT_PREFIXES = ("/health", "/metrics", "/api/v1/admin", "/docs", "/openapi.json")
+
+
+def parse_limits(spec: str) -> Dict[str, int]:
+    """Parse ``"recommend=4,listing=8,default=32"`` into per-class limits"""
+    limits = {}
+    for part in spec.split(","):
+        if "=" not in part:
+            continue
+        name, value = part.split("=", 1)
+        try:
+            limits[name.strip()] = int(value)
+        except ValueError:
+            logger.warning("Ignoring invalid admission limit %r", part)
+    return limits
+
+
+def classify(method: str, path: str) -> Optional[str]:
+    """Route class for a request, or None if it bypasses admission control"""
+    if path.startswith(EXEMPT_PREFIXES) or method == "OPTIONS":
+        return None
+    for name, route_method, pattern in ROUTE_CLASSES:
+        if method == route_method and pattern.match(path):
+            return name
+    return DEFAULT_CLASS
+
+
+class AdmissionGate:
+    """Concurrency limit for one route class with a bounded wait queue"""
+
+    def __init__(self, name: str, limit: int, max_queue: int):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(limit)
+
+    async def acquire(self, timeout: float) -> Optional[str]:
+        """
+        Wait up to ``timeout`` seconds for a slot
+
+        Returns:
+            None once admitted, otherwise the rejection reason
+        """
+        if self._semaphore.locked() and self.waiting >= self.max_queue:
+            # Shed immediately rather than grow a queue nobody will drain in time
+            return "queue_full"
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout)
+            return None
+        except asyncio.TimeoutError:
+            return "timeout"
+        finally:
+            self.waiting -= 1
+
+    def release(self) -> None:
+        self._semaphore.release()
+
+
+class AdmissionMiddleware:
+    """ASGI middleware enforcing per-route-class in-flight limits and deadlines.
+
+    Each request gets a deadline of REQUEST_DEADLINE_MS from arrival (queueing
+    counts against it), which services pass to Mongo as maxTimeMS. Requests
+    that can't get a slot within ADMISSION_QUEUE_TIMEOUT_MS are answered with
+    503 and Retry-After instead of waiting behind a backlog.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        limits = parse_limits(settings.ADMISSION_LIMITS)
+        default_limit = limits.get(DEFAULT_CLASS, 32)
+        names = {name for name, _, _ in ROUTE_CLASSES} | {DEFAULT_CLASS}
+        self.gates = {
+            name: AdmissionGate(
+                name, limits.get(name, default_limit), settings.ADMISSION_MAX_QUEUE
+            )
+            for name in names
+        }
+        self.deadline = settings.REQUEST_DEADLINE_MS / 1000
+        self.queue_timeout = settings.ADMISSION_QUEUE_TIMEOUT_MS / 1000
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.ADMISSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        route_class = classify(scope["method"], scope["path"])
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        token = set_deadline(self.deadline)
+        gate = self.gates[route_class]
+        try:
+            start = asyncio.get_running_loop().time()
+            reason = await gate.acquire(min(self.queue_timeout, self.deadline))
+            ADMISSION_WAIT.labels(route_class=route_class).observe(
+                asyncio.get_running_loop().time() - start
+            )
+            if reason is not None:
+                ADMISSION_REJECTIONS.labels(
+                    route_class=route_class, reason=reason
+                ).inc()
+                await self._reject(scope, receive, send)
+                return
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                gate.release()
+        finally:
+            deadline_var.reset(token)
+
+    @staticmethod
+    async def _reject(scope, receive, send):
+        # Same body as a DeadlineExceeded raised in a route, so clients see
+        # one 503 format whichever way the request was shed
+        response = error_response(
+            ServiceUnavailableError(
+                "Server is busy, please retry shortly",
+                retry_after=settings.ADMISSION_RETRY_AFTER,
+            )
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,157 @@
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+from pymongo.errors import PyMongoError
+from app.core.config import settings
+from app.core.deadline import remaining_ms
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Written by data/db_scripts/db_import.py: {"_id": CATALOG_ALIAS_ID,
+# "version": n, "collections": {"courses": "courses__v<n>", ...},
+# "digests": {"courses": <content digest>, ...},
+# "retired": {"courses__v<n-1>": <replaced at>, ...}, "switched_at": ...}
+ALIAS_COLLECTION = "collection_aliases"
+CATALOG_ALIAS_ID = "catalog"
+
+CATALOG_VERSION_HEADER = b"x-catalog-version"
+
+# Stamped on every catalog document by data/db_scripts/catalog_hash.py; pass
+# HIDDEN_FIELDS as the projection of every read that reaches a response
+HASH_FIELD = "content_hash"
+HIDDEN_FIELDS = {HASH_FIELD: 0}
+
+
+class AliasMap:
+    """Logical collection name -> physical collection of one catalog version"""
+
+    __slots__ = ("version", "collections", "digests")
+
+    def __init__(
+        self,
+        version: Optional[int],
+        collections: Dict[str, str],
+        digests: Optional[Dict[str, str]] = None,
+    ):
+        self.version = version
+        self.collections = collections
+        # Logical name -> content digest, compared with the catalog snapshot's
+        self.digests = digests or {}
+
+    def resolve(self, name: str) -> str:
+        return self.collections.get(name, name)
+
+
+# No alias document: every name is its own collection
+UNVERSIONED = AliasMap(None, {})
+
+# Per-request holder for the AliasMap pinned on first use, set by
+# CatalogVersionMiddleware; None outside requests (scripts, startup)
+_pin_var: ContextVar[Optional[dict]] = ContextVar("alias_pin", default=None)
+
+
+class CollectionAliases:
+    """Per-process view of which catalog version is live.
+
+    The importer loads a new version into fresh collections and then flips
+    the alias document in one write. Workers re-read it at most every
+    ``COLLECTION_ALIAS_CHECK_INTERVAL`` seconds. A request resolves every
+    collection through the map it saw first, so it never mixes versions
+    even if the switch happens while it runs.
+    """
+
+    _current: AliasMap = UNVERSIONED
+    _checked_at: float = 0.0
+    _lock = threading.Lock()
+
+    @classmethod
+    def current(cls, db) -> AliasMap:
+        """The live AliasMap, refreshed from ``db`` when the interval is up"""
+        now = time.monotonic()
+        if now - cls._checked_at < settings.COLLECTION_ALIAS_CHECK_INTERVAL:
+            return cls._current
+
+        with cls._lock:
+            if now - cls._checked_at >= settings.COLLECTION_ALIAS_CHECK_INTERVAL:
+                cls._checked_at = now
+                cls._refresh(db)
+        return cls._current
+
+    @classmethod
+    def _refresh(cls, db) -> None:
+        try:
+            doc = db[ALIAS_COLLECTION].find_one(
+                {"_id": CATALOG_ALIAS_ID}, max_time_ms=remaining_ms()
+            )
+        except PyMongoError as e:
+            logger.warning("Reading collection aliases failed; keeping last: %s", e)
+            return
+
+        aliases = (
+            AliasMap(doc["version"], doc["collections"], doc.get("digests"))
+            if doc
+            else UNVERSIONED
+        )
+        if aliases.version != cls._current.version:
+            logger.info(
+                "Catalog version %s -> %s", cls._current.version, aliases.version
+            )
+        cls._current = aliases
+
+    @classmethod
+    def for_request(cls, db) -> AliasMap:
+        """The AliasMap pinned by the current request (pinning it if needed)"""
+        pin = _pin_var.get()
+        if pin is None:
+            return cls.current(db)
+        if "aliases" not in pin:
+            pin["aliases"] = cls.current(db)
+        return pin["aliases"]
+
+    @classmethod
+    def reset(cls) -> None:
+        """Forget the cached map (e.g. after fork or in tests)"""
+        with cls._lock:
+            cls._current = UNVERSIONED
+            cls._checked_at = 0.0
+
+
+class CatalogVersionMiddleware:
+    """ASGI middleware pinning one catalog version per request.
+
+    Responses of requests that read the catalog carry ``X-Catalog-Version``
+    (when the catalog is versioned), so clients can drop cached data when
+    it changes.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        pin: dict = {}
+        token = _pin_var.set(pin)
+
+        async def send_wrapper(message):
+            aliases = pin.get("aliases")
+            if (
+                message["type"] == "http.response.start"
+                and aliases is not None
+                and aliases.version is not None
+            ):
+                headers = list(message.get("headers", []))
+                headers.append(
+                    (CATALOG_VERSION_HEADER, str(aliases.version).encode("latin-1"))
+                )
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _pin_var.reset(token)
@@ -10,13 +10,78 @@ class Settings(BaseSettings):
     SERVER_HOST: str = "0.0.0.0"
     SERVER_PORT: int = int(os.getenv("PORT", "8000"))
     DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
+    # Defer DB connectivity checks and diagnostics off the startup path
+    FAST_START: bool = os.getenv("FAST_START", "False").lower() == "true"
+
+    # Logging settings
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    # "json" for structured one-line records, "text" for the classic format
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json")
+    # Per-module overrides, e.g. "pymongo=WARNING,app.services=DEBUG"
+    LOG_LEVELS: str = os.getenv("LOG_LEVELS", "pymongo=WARNING")
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    # Repeated WARNING+ lines from one call site allowed per window
+    LOG_RATE_LIMIT_BURST: int = int(os.getenv("LOG_RATE_LIMIT_BURST", "10"))
+    LOG_RATE_LIMIT_WINDOW: float = float(os.getenv("LOG_RATE_LIMIT_WINDOW", "60"))
+
+    # Admission control settings (per-worker in-flight limits by route class)
+    ADMISSION_ENABLED: bool = os.getenv("ADMISSION_ENABLED", "True").lower() == "true"
+    ADMISSION_LIMITS: str = os.getenv(
+        "ADMISSION_LIMITS", "recommend=4,listing=8,search=16,default=32"
+    )
+    ADMISSION_MAX_QUEUE: int = int(os.getenv("ADMISSION_MAX_QUEUE", "64"))
+    ADMISSION_QUEUE_TIMEOUT_MS: float = float(
+        os.getenv("ADMISSION_QUEUE_TIMEOUT_MS", "250")
+    )
+    ADMISSION_RETRY_AFTER: int = int(os.getenv("ADMISSION_RETRY_AFTER", "1"))
+    # Time budget per request from arrival; passed to Mongo as maxTimeMS
+    REQUEST_DEADLINE_MS: float = float(os.getenv("REQUEST_DEADLINE_MS", "5000"))
 
     # MongoDB settings
     MONGODB_URL: str = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
     MONGODB_DB_NAME: str = os.getenv("MONGODB_DB_NAME", "semester_planner")
+    MONGODB_TIMEOUT_MS: int = int(os.getenv("MONGODB_TIMEOUT_MS", "10000"))
+    # Pool sizing is per worker process; gunicorn runs 4, so the cluster sees
+    # up to 4x MONGODB_MAX_POOL_SIZE connections (Atlas M0 allows 500)
+    MONGODB_MAX_POOL_SIZE: int = int(os.getenv("MONGODB_MAX_POOL_SIZE", "20"))
+    MONGODB_MIN_POOL_SIZE: int = int(os.getenv("MONGODB_MIN_POOL_SIZE", "0"))
+    MONGODB_MAX_IDLE_TIME_MS: int = int(os.getenv("MONGODB_MAX_IDLE_TIME_MS", "60000"))
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int = int(
+        os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "2000")
+    )
+    # Wire compression in preference order; unavailable codecs are skipped
+    MONGODB_COMPRESSORS: str = os.getenv("MONGODB_COMPRESSORS", "zstd,snappy,zlib")
+    MONGODB_READ_PREFERENCE: str = os.getenv("MONGODB_READ_PREFERENCE", "primary")
+
+    # Catalog snapshot settings (memory-mapped, shared across workers)
+    CATALOG_SNAPSHOT_PATH: str = os.getenv("CATALOG_SNAPSHOT_PATH", "")
+    CATALOG_SNAPSHOT_CHECK_INTERVAL: float = float(
+        os.getenv("CATALOG_SNAPSHOT_CHECK_INTERVAL", "5")
+    )
+
+    # How often each worker re-reads which versioned collections are live
+    # (written by data/db_scripts/db_import.py)
+    COLLECTION_ALIAS_CHECK_INTERVAL: float = float(
+        os.getenv("COLLECTION_ALIAS_CHECK_INTERVAL", "5")
+    )
 
     # Firebase settings
     FIREBASE_CREDENTIALS_PATH: str = os.getenv("FIREBASE_CREDENTIALS_PATH", "")
+    AUTH_TOKEN_CACHE_SIZE: int = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "1024"))
+    FIREBASE_CERT_REFRESH_SECONDS: float = float(
+        os.getenv("FIREBASE_CERT_REFRESH_SECONDS", "3600")
+    )
+
+    # Admin settings (operational endpoints and on-demand profiling)
+    ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN", "")
+
+    # Profiling settings
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "False").lower() == "true"
+    PROFILING_SAMPLE_RATE: float = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+    PROFILING_SLOW_MS: float = float(os.getenv("PROFILING_SLOW_MS", "1000"))
+    PROFILING_INTERVAL_MS: float = float(os.getenv("PROFILING_INTERVAL_MS", "5"))
+    PROFILING_DIR: str = os.getenv("PROFILING_DIR", "/tmp/semester-planner-profiles")
+    PROFILING_MAX_FILES: int = int(os.getenv("PROFILING_MAX_FILES", "200"))
 
     # OpenAI settings
     openai_api_key: str | None = None
@@ -1,12 +1,48 @@
+import importlib.util
 import os
+import threading
 from pymongo import MongoClient
 from pymongo.collection import Collection
+from app.core.aliases import AliasMap, CollectionAliases
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.metrics import MongoCommandListener, MongoPoolListener
 from contextlib import contextmanager
 
 logger = get_logger(__name__)
 
+# Optional modules backing each wire compressor (zlib is in the stdlib)
+COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+
+
+def available_compressors(spec: str) -> list:
+    """Compressors from ``spec`` whose codec module is installed, in order"""
+    names = [name.strip() for name in spec.split(",") if name.strip()]
+    return [
+        name
+        for name in names
+        if name in COMPRESSOR_MODULES
+        and importlib.util.find_spec(COMPRESSOR_MODULES[name]) is not None
+    ]
+
+
+def client_options() -> dict:
+    """MongoClient keyword arguments derived from Settings"""
+    options = {
+        "serverSelectionTimeoutMS": settings.MONGODB_TIMEOUT_MS,
+        "connectTimeoutMS": settings.MONGODB_TIMEOUT_MS,
+        "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGODB_MIN_POOL_SIZE,
+        "maxIdleTimeMS": settings.MONGODB_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+        "readPreference": settings.MONGODB_READ_PREFERENCE,
+        "event_listeners": [MongoCommandListener(), MongoPoolListener()],
+    }
+    compressors = available_compressors(settings.MONGODB_COMPRESSORS)
+    if compressors:
+        options["compressors"] = ",".join(compressors)
+    return options
+
 
 class MongoDBClient:
     """MongoDB client for database operations"""
@@ -14,30 +50,39 @@ class MongoDBClient:
     _instance = None
     _client = None
     _db = None
+    _lock = threading.Lock()
 
     @classmethod
     def get_instance(cls):
         """Get singleton instance of MongoDBClient"""
         if cls._instance is None:
-            cls._instance = cls()
+            # Startup diagnostics may run in a background thread alongside requests
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
         return cls._instance
 
     def __init__(self):
         """Initialize MongoDB connection"""
         if MongoDBClient._client is None:
             try:
-                # Allow a sane default for server selection/connect timeouts if not provided via URI
-                timeout_ms = int(os.getenv("MONGODB_TIMEOUT_MS", "10000"))
-                MongoDBClient._client = MongoClient(
-                    settings.MONGODB_URL,
-                    serverSelectionTimeoutMS=timeout_ms,
-                    connectTimeoutMS=timeout_ms,
+                # Options in the URI (e.g. ?maxPoolSize=) take precedence
+                options = client_options()
+                MongoDBClient._client = MongoClient(settings.MONGODB_URL, **options)
+                logger.info(
+                    "MongoDB pool: maxPoolSize=%s minPoolSize=%s compressors=%s "
+                    "readPreference=%s",
+                    options["maxPoolSize"],
+                    options["minPoolSize"],
+                    options.get("compressors", "none"),
+                    options["readPreference"],
                 )
-                # Test connection
-                MongoDBClient._client.admin.command("ping")
-                logger.info("Connected to MongoDB successfully")
+                # Test connection; in fast-start mode the first query connects instead
+                if not settings.FAST_START:
+                    MongoDBClient._client.admin.command("ping")
+                    logger.info("Connected to MongoDB successfully")
             except Exception as e:
-                logger.error(f"Failed to connect to MongoDB: {str(e)}")
+                logger.error("Failed to connect to MongoDB: %s", e)
                 raise
 
         if MongoDBClient._db is None:
@@ -51,12 +96,18 @@ class MongoDBClient:
         return MongoDBClient._db
 
     @staticmethod
-    def get_collection(collection_name: str) -> Collection:
-        """Get a specific collection"""
+    def get_aliases() -> AliasMap:
+        """The catalog version the current request reads (pinned on first use)"""
         db = MongoDBClient.get_database()
         if db is None:
             raise RuntimeError("Database not initialized")
-        return db[collection_name]
+        return CollectionAliases.for_request(db)
+
+    @staticmethod
+    def get_collection(collection_name: str) -> Collection:
+        """Get a specific collection, resolved to the live catalog version"""
+        db = MongoDBClient.get_database()
+        return db[MongoDBClient.get_aliases().resolve(collection_name)]
 
     @staticmethod
     def close():
@@ -67,5 +118,16 @@ class MongoDBClient:
             MongoDBClient._db = None
             logger.info("MongoDB connection closed")
 
+    @staticmethod
+    def reset_after_fork():
+        """Drop client state inherited from a pre-fork parent without closing it"""
+        MongoDBClient._instance = None
+        MongoDBClient._client = None
+        MongoDBClient._db = None
+        MongoDBClient._lock = threading.Lock()
+
 
-# Do not initialize on module import to avoid fork-safety issues with pre-fork servers
+# Do not initialize on module import to avoid fork-safety issues with pre-fork servers.
+# A client (and its pool sockets) inherited across fork() must never be used,
+# so every forked child starts with an empty registry, gunicorn or not.
+os.register_at_fork(after_in_child=MongoDBClient.reset_after_fork)
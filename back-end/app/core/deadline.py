@@ -0,0 +1,54 @@
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+from pymongo.errors import ExecutionTimeout
+from app.core.exceptions import ServiceUnavailableError
+
+# Absolute time.monotonic() by which the current request must finish, set by
+# AdmissionMiddleware. Services pass what's left to Mongo as maxTimeMS:
+# ``find(..., max_time_ms=remaining_ms())`` / ``count_documents(..., **deadline_kwargs())``
+deadline_var: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+# Never hand Mongo a budget so small the command can't even be scheduled
+MIN_MAX_TIME_MS = 5
+
+
+class DeadlineExceeded(ServiceUnavailableError):
+    """The request ran out of time before (or while) querying the database"""
+
+    def __init__(self):
+        super().__init__(detail="Request deadline exceeded")
+
+
+# Errors that mean "out of time", raised by us or by the server (maxTimeMS)
+TIMEOUT_ERRORS = (DeadlineExceeded, ExecutionTimeout)
+
+
+def set_deadline(seconds: float):
+    """Start a deadline ``seconds`` from now; returns the ContextVar token"""
+    return deadline_var.set(time.monotonic() + seconds)
+
+
+def remaining_ms() -> Optional[int]:
+    """
+    Milliseconds left before the request deadline
+
+    Returns:
+        None when no deadline is set (scripts, background tasks)
+
+    Raises:
+        DeadlineExceeded: if the deadline has already passed
+    """
+    deadline = deadline_var.get()
+    if deadline is None:
+        return None
+    remaining = int((deadline - time.monotonic()) * 1000)
+    if remaining <= 0:
+        raise DeadlineExceeded()
+    return max(remaining, MIN_MAX_TIME_MS)
+
+
+def deadline_kwargs() -> Dict[str, Any]:
+    """maxTimeMS keyword for commands that take it (count_documents, aggregate)"""
+    budget = remaining_ms()
+    return {"maxTimeMS": budget} if budget is not None else {}
@@ -1,39 +1,88 @@
-import firebase_admin
-from firebase_admin import credentials, auth
-from fastapi import HTTPException, status, Depends
+import threading
+from fastapi import HTTPException, status, Depends, Header
 from fastapi.security import HTTPBearer
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.metrics import record_cache_lookup
+from app.core.profiling import is_admin_token
+from app.core.startup import startup_timer
+from app.core.token_cache import TokenCache, CertificateRefresher
 import os
 
 logger = get_logger(__name__)
 security = HTTPBearer()
 
+# firebase_admin pulls in the Google auth/HTTP stack, so it is imported and
+# initialized on the first authenticated request instead of at worker boot.
+_firebase_lock = threading.Lock()
+_firebase_ready = False
+
+token_cache = TokenCache(max_size=settings.AUTH_TOKEN_CACHE_SIZE)
+_cert_refresher = None
+
 
 def init_firebase():
-    """Initialize Firebase Admin SDK"""
-    if not firebase_admin._apps:
-        if settings.FIREBASE_CREDENTIALS_PATH and os.path.exists(
-            settings.FIREBASE_CREDENTIALS_PATH
-        ):
-            cred = credentials.Certificate(settings.FIREBASE_CREDENTIALS_PATH)
-            firebase_admin.initialize_app(cred)
-            logger.info("Firebase initialized with credentials file")
-        else:
-            # If no credentials file, initialize with default credentials
-            try:
-                firebase_admin.initialize_app()
-                logger.info("Firebase initialized with default credentials")
-            except ValueError:
-                # Already initialized or error
-                logger.debug("Firebase already initialized")
-                pass
-
-
-def verify_firebase_token(credentials=Depends(security)) -> dict:
+    """Initialize Firebase Admin SDK (idempotent, thread-safe)"""
+    global _firebase_ready, _cert_refresher
+    if _firebase_ready:
+        return
+
+    with _firebase_lock:
+        if _firebase_ready:
+            return
+
+        with startup_timer.phase("init:firebase"):
+            import firebase_admin
+            from firebase_admin import credentials
+
+            if not firebase_admin._apps:
+                if settings.FIREBASE_CREDENTIALS_PATH and os.path.exists(
+                    settings.FIREBASE_CREDENTIALS_PATH
+                ):
+                    cred = credentials.Certificate(settings.FIREBASE_CREDENTIALS_PATH)
+                    firebase_admin.initialize_app(cred)
+                    logger.info("Firebase initialized with credentials file")
+                else:
+                    # If no credentials file, initialize with default credentials
+                    try:
+                        firebase_admin.initialize_app()
+                        logger.info("Firebase initialized with default credentials")
+                    except ValueError:
+                        # Already initialized or error
+                        logger.debug("Firebase already initialized")
+                        pass
+
+        _cert_refresher = CertificateRefresher(settings.FIREBASE_CERT_REFRESH_SECONDS)
+        _cert_refresher.start()
+        _firebase_ready = True
+
+
+def reset_firebase_after_fork():
+    """Forget pre-fork Firebase state so each worker initializes its own app"""
+    global _firebase_lock, _firebase_ready, _cert_refresher
+    _firebase_lock = threading.Lock()
+    _firebase_ready = False
+    # Threads do not survive fork; the worker starts its own refresher
+    _cert_refresher = None
+    token_cache.clear()
+
+
+def _verify_id_token(token: str) -> dict:
+    """Blocking signature verification (may fetch Google certificates)"""
+    init_firebase()
+    from firebase_admin import auth
+
+    return auth.verify_id_token(token)
+
+
+async def verify_firebase_token(credentials=Depends(security)) -> dict:
     """
     Verify Firebase ID token and extract user information
 
+    Previously verified tokens are served from an in-memory cache until they
+    expire; misses are verified in the threadpool, off the event loop.
+
     Args:
         credentials: HTTP bearer token credentials
 
@@ -45,12 +94,18 @@ def verify_firebase_token(credentials=Depends(security)) -> dict:
     """
     token = credentials.credentials
 
+    decoded_token = token_cache.get(token)
+    record_cache_lookup("firebase_token", decoded_token is not None)
+    if decoded_token is not None:
+        return decoded_token
+
     try:
         # Verify the token
-        decoded_token = auth.verify_id_token(token)
+        decoded_token = await run_in_threadpool(_verify_id_token, token)
+        token_cache.put(token, decoded_token)
         return decoded_token
     except Exception as e:
-        logger.error(f"Firebase token verification failed: {str(e)}")
+        logger.error("Firebase token verification failed: %s", e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Invalid authentication credentials",
@@ -76,5 +131,15 @@ def get_current_user(decoded_token: dict = Depends(verify_firebase_token)) -> di
     }
 
 
-# Initialize Firebase on module import
-init_firebase()
+def require_admin(x_admin_token: str = Header(None)) -> None:
+    """
+    Guard operational endpoints with the shared ADMIN_TOKEN
+
+    Raises:
+        HTTPException: If no admin token is configured or it does not match
+    """
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin token required",
+        )
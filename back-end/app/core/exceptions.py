@@ -1,4 +1,5 @@
 from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
 from typing import Optional
 from app.core.logging import get_logger
 
@@ -55,6 +56,20 @@ class InternalServerError(APIException):
         )
 
 
+class ServiceUnavailableError(APIException):
+    """Server is overloaded or out of time; the client should retry later"""
+
+    def __init__(
+        self, detail: str = "Service temporarily unavailable", retry_after: int = 1
+    ):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            error_code="SERVICE_UNAVAILABLE",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
 class UnauthorizedError(APIException):
     """Unauthorized access error"""
 
@@ -67,6 +82,15 @@ class UnauthorizedError(APIException):
         )
 
 
+def error_response(exc: HTTPException) -> JSONResponse:
+    """The response FastAPI sends for ``exc``, for code running outside a route"""
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+        headers=exc.headers,
+    )
+
+
 def log_exception(exc: Exception, context: str = "") -> None:
     """Log exception with context"""
     error_msg = (
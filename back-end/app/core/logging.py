@@ -1,14 +1,217 @@
+import atexit
+import json
 import logging
-from typing import Optional
+import queue
+import sys
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+from app.core.config import settings
 
 # Configure logging format
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 LOG_LEVEL = logging.INFO
 
+# Server loggers that install their own (synchronous) handlers; they are
+# re-pointed at the root queue so nothing writes to stdout on the event loop.
+SERVER_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access", "gunicorn.error")
 
-def configure_logging(level: int = LOG_LEVEL, format_string: str = LOG_FORMAT):
-    """Configure global logging"""
-    logging.basicConfig(level=level, format=format_string)
+# Attributes every LogRecord has; anything else was passed via ``extra=``
+_RECORD_ATTRS = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", (), None)).keys()
+) | {"message", "request_id"}
+
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+_listener: Optional[QueueListener] = None
+_listener_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with request ID and any ``extra`` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+            "pid": record.process,
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        elif record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the request ID of the task that logged them"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """Let through ``burst`` copies of a WARNING+ line per window, drop the rest.
+
+    Lines are keyed on their call site, so an error storm from one
+    ``except`` block collapses to a handful of records plus a
+    ``suppressed`` count on the first record of the next window.
+    """
+
+    def __init__(self, burst: int, window: float):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self._lock = threading.Lock()
+        self._buckets: Dict[Tuple, list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING or self.burst <= 0:
+            return True
+        key = (record.name, record.levelno, record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None or now - bucket[0] >= self.window:
+                suppressed = bucket[2] if bucket else 0
+                self._buckets[key] = [now, 1, 0]
+                if len(self._buckets) > 10000:
+                    self._buckets.clear()
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            if bucket[1] < self.burst:
+                bucket[1] += 1
+                return True
+            bucket[2] += 1
+            return False
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only do the work that must happen on the caller's thread: merge
+        # args and render tracebacks (frames can't outlive the call). JSON
+        # encoding and the stdout write happen on the listener thread.
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.dropped:
+            # Report the gap on the first record that makes it through
+            record.dropped = self.dropped
+        try:
+            self.queue.put_nowait(record)
+            self.dropped = 0
+        except queue.Full:
+            self.dropped += 1
+
+
+def parse_levels(spec: str) -> Dict[str, int]:
+    """Parse ``"pymongo=WARNING,app.services=DEBUG"`` into logger levels"""
+    levels = {}
+    for part in spec.split(","):
+        if "=" not in part:
+            continue
+        name, level = part.split("=", 1)
+        levels[name.strip()] = logging.getLevelName(level.strip().upper())
+    return {name: level for name, level in levels.items() if isinstance(level, int)}
+
+
+def _build_output_handler(format_name: str, format_string: str) -> logging.Handler:
+    handler = logging.StreamHandler(sys.stdout)
+    if format_name == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(format_string))
+    return handler
+
+
+def configure_logging(level: Optional[int] = None, format_string: str = LOG_FORMAT):
+    """Configure global logging.
+
+    The root logger gets a single non-blocking queue handler; a listener
+    thread formats records and writes them to stdout.
+    """
+    global _listener
+
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+        log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+        queue_handler = NonBlockingQueueHandler(log_queue)
+        queue_handler.addFilter(RequestIdFilter())
+        queue_handler.addFilter(
+            RateLimitFilter(
+                settings.LOG_RATE_LIMIT_BURST, settings.LOG_RATE_LIMIT_WINDOW
+            )
+        )
+
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(queue_handler)
+        root.setLevel(
+            level
+            if level is not None
+            else logging.getLevelName(settings.LOG_LEVEL.upper())
+        )
+
+        for name in SERVER_LOGGERS:
+            server_logger = logging.getLogger(name)
+            server_logger.handlers.clear()
+            server_logger.propagate = True
+
+        for name, module_level in parse_levels(settings.LOG_LEVELS).items():
+            logging.getLogger(name).setLevel(module_level)
+
+        output = _build_output_handler(settings.LOG_FORMAT, format_string)
+        _listener = QueueListener(log_queue, output, respect_handler_level=True)
+        _listener.start()
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def reset_logging_after_fork():
+    """Rebuild the queue and listener thread in a forked worker.
+
+    Threads don't survive fork, and the inherited queue's locks may have been
+    held by the master's listener at fork time, so start from scratch.
+    """
+    global _listener, _listener_lock
+    _listener = None
+    _listener_lock = threading.Lock()
+    configure_logging()
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -16,5 +219,44 @@ def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(name)
 
 
+class RequestIdMiddleware:
+    """ASGI middleware that assigns each request an ID for log correlation.
+
+    An incoming ``X-Request-ID`` is reused (so IDs follow a request across
+    services); otherwise one is generated. The ID is echoed in the response.
+    """
+
+    header = b"x-request-id"
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for key, value in scope.get("headers", []):
+            if key == self.header:
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((self.header, request_id.encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
+
+
 # Initialize logging on module import
 configure_logging()
+atexit.register(shutdown_logging)
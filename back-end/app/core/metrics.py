@@ -0,0 +1,242 @@
+import os
+import threading
+import time
+from typing import Dict
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from pymongo import monitoring
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Under gunicorn each worker writes its samples to PROMETHEUS_MULTIPROC_DIR
+# (set in start.sh) and /metrics merges them, so any worker can answer a scrape.
+MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.075,
+    0.1,
+    0.25,
+    0.5,
+    0.75,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "HTTP response body size by route template",
+    ["method", "route"],
+    buckets=SIZE_BUCKETS,
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "In-process cache lookups by cache and result (hit/miss)",
+    ["cache", "result"],
+)
+MONGO_COMMAND_LATENCY = Histogram(
+    "mongodb_command_duration_seconds",
+    "MongoDB command latency by command and collection",
+    ["command", "collection", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+ADMISSION_WAIT = Histogram(
+    "admission_wait_seconds",
+    "Time spent waiting for an admission slot by route class",
+    ["route_class"],
+    buckets=LATENCY_BUCKETS,
+)
+ADMISSION_REJECTIONS = Counter(
+    "admission_rejections_total",
+    "Requests shed with 503 by route class and reason",
+    ["route_class", "reason"],
+)
+MONGO_POOL_CHECKOUT_WAIT = Histogram(
+    "mongodb_pool_checkout_wait_seconds",
+    "Time spent waiting to check a connection out of the pool",
+    ["result"],
+    buckets=LATENCY_BUCKETS,
+)
+MONGO_POOL_IN_USE = Gauge(
+    "mongodb_pool_connections_in_use",
+    "Connections currently checked out of the pool",
+    multiprocess_mode="livesum",
+)
+MONGO_POOL_OPEN = Gauge(
+    "mongodb_pool_connections_open",
+    "Connections currently open to the server",
+    multiprocess_mode="livesum",
+)
+MONGO_POOL_EVENTS = Counter(
+    "mongodb_pool_events_total",
+    "Connection pool churn: connections created/closed (by reason), pool clears",
+    ["event", "reason"],
+)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_LOOKUPS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Serialize metrics for a scrape, aggregated across workers if configured"""
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop a dead worker's live gauges (called from gunicorn child_exit)"""
+    if MULTIPROC_DIR:
+        multiprocess.mark_process_dead(pid)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, in-flight and response size per route.
+
+    Routes are labelled by their path template (``/api/v1/pathways/{pathwayId}``)
+    rather than the raw URL to keep label cardinality bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        body_size = 0
+
+        async def send_wrapper(message):
+            nonlocal status_code, body_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                body_size += len(message.get("body", b""))
+            await send(message)
+
+        in_flight = REQUESTS_IN_FLIGHT.labels(method=method)
+        in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_flight.dec()
+            # The router stores the matched route in the (shared) scope
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            REQUEST_LATENCY.labels(
+                method=method, route=route_path, status=str(status_code)
+            ).observe(elapsed)
+            RESPONSE_SIZE.labels(method=method, route=route_path).observe(body_size)
+
+
+class MongoPoolListener(monitoring.ConnectionPoolListener):
+    """Records pool checkouts, checkout waits and connection churn"""
+
+    def connection_checked_out(self, event):
+        MONGO_POOL_CHECKOUT_WAIT.labels(result="ok").observe(event.duration)
+        MONGO_POOL_IN_USE.inc()
+
+    def connection_check_out_failed(self, event):
+        # reason is "timeout" when the wait queue timed out, i.e. pool too small
+        MONGO_POOL_CHECKOUT_WAIT.labels(result=event.reason).observe(event.duration)
+
+    def connection_checked_in(self, event):
+        MONGO_POOL_IN_USE.dec()
+
+    def connection_created(self, event):
+        MONGO_POOL_EVENTS.labels(event="created", reason="").inc()
+        MONGO_POOL_OPEN.inc()
+
+    def connection_closed(self, event):
+        MONGO_POOL_EVENTS.labels(event="closed", reason=event.reason).inc()
+        MONGO_POOL_OPEN.dec()
+
+    def pool_cleared(self, event):
+        MONGO_POOL_EVENTS.labels(event="pool_cleared", reason="").inc()
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """Records per-collection MongoDB command latency"""
+
+    def __init__(self):
+        self._collections: Dict[tuple, str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(event) -> tuple:
+        return (event.connection_id, event.request_id, event.operation_id)
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        if not isinstance(collection, str):
+            collection = "-"
+        # Label by logical collection ("courses", not "courses__v3") so series
+        # carry across catalog versions
+        collection = collection.split("__v")[0]
+        with self._lock:
+            self._collections[self._key(event)] = collection
+
+    def _observe(self, event, status: str):
+        with self._lock:
+            collection = self._collections.pop(self._key(event), "-")
+        MONGO_COMMAND_LATENCY.labels(
+            command=event.command_name, collection=collection, status=status
+        ).observe(event.duration_micros / 1_000_000)
+
+    def succeeded(self, event):
+        self._observe(event, "ok")
+
+    def failed(self, event):
+        self._observe(event, "error")
@@ -14,8 +14,11 @@ class InstructorStats(BaseModel):
 class PrerequisiteNode(BaseModel):
     """Represents a single node in prerequisite tree"""
 
-    type: str  # "AND" or "OR"
-    courses: List[Any] = []  # Can be strings or nested PrerequisiteNode
+    type: str  # "AND", "OR", "SINGLE" or "CONDITION"
+    courses: List[Any] = []  # AND/OR: course ID strings or nested PrerequisiteNode
+    course: Optional[str] = None  # SINGLE
+    concurrent: bool = False  # SINGLE: may also be taken in the same term
+    text: Optional[str] = None  # CONDITION, e.g. "consent of instructor"
 
 
 class Course(BaseModel):
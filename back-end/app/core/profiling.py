@@ -0,0 +1,185 @@
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+from typing import Dict, List, Optional
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_SUFFIX = ".collapsed"
+MAX_STACK_DEPTH = 128
+
+
+class StackSampler:
+    """Background thread that periodically samples one thread's Python stack.
+
+    Samples are kept in a bounded ring buffer with timestamps, so the stacks
+    seen during any recent time window (i.e. a slow request) can be collected
+    after the fact without having profiled that request up front.
+    """
+
+    def __init__(self, interval_seconds: float, window_seconds: float = 60.0):
+        self.interval_seconds = interval_seconds
+        max_samples = max(1, int(window_seconds / interval_seconds))
+        self._samples: deque = deque(maxlen=max_samples)
+        self._target_thread: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self, target_thread: int) -> None:
+        self._target_thread = target_thread
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    @staticmethod
+    def _walk(frame) -> tuple:
+        stack = []
+        while frame is not None and len(stack) < MAX_STACK_DEPTH:
+            code = frame.f_code
+            filename = os.path.basename(code.co_filename)
+            stack.append(f"{code.co_name} ({filename}:{code.co_firstlineno})")
+            frame = frame.f_back
+        stack.reverse()
+        return tuple(stack)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            frame = sys._current_frames().get(self._target_thread)
+            if frame is not None:
+                self._samples.append((time.perf_counter(), self._walk(frame)))
+
+    def collect(self, start: float, end: float) -> Counter:
+        """Aggregate the stacks sampled between two perf_counter() timestamps"""
+        stacks: Counter = Counter()
+        for ts, stack in list(self._samples):
+            if start <= ts <= end:
+                stacks[stack] += 1
+        return stacks
+
+
+class ProfileStore:
+    """Directory of collapsed-stack profiles (flamegraph.pl / speedscope input)"""
+
+    def __init__(self, directory: str, max_files: int):
+        self.directory = directory
+        self.max_files = max_files
+
+    def save(self, label: str, elapsed_ms: float, stacks: Counter) -> Optional[str]:
+        if not stacks:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+        safe_label = re.sub(r"[^A-Za-z0-9_.-]+", "_", label).strip("_")
+        name = f"{stamp}-{os.getpid()}-{safe_label}-{int(elapsed_ms)}ms{PROFILE_SUFFIX}"
+        with open(os.path.join(self.directory, name), "w", encoding="utf-8") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{';'.join(stack)} {count}\n")
+        self._prune()
+        return name
+
+    def _prune(self) -> None:
+        names = sorted(self.list_names())
+        for name in names[: max(0, len(names) - self.max_files)]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+
+    def list_names(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        return [n for n in os.listdir(self.directory) if n.endswith(PROFILE_SUFFIX)]
+
+    def list(self) -> List[Dict]:
+        profiles = []
+        for name in sorted(self.list_names(), reverse=True):
+            path = os.path.join(self.directory, name)
+            try:
+                size = os.path.getsize(path)
+            except FileNotFoundError:
+                continue
+            profiles.append({"name": name, "size_bytes": size})
+        return profiles
+
+    def path_for(self, name: str) -> Optional[str]:
+        """Resolve a listed profile name to its path (no traversal)"""
+        if os.path.basename(name) != name or not name.endswith(PROFILE_SUFFIX):
+            return None
+        path = os.path.join(self.directory, name)
+        return path if os.path.isfile(path) else None
+
+
+profile_store = ProfileStore(settings.PROFILING_DIR, settings.PROFILING_MAX_FILES)
+
+
+def is_admin_token(value: Optional[str]) -> bool:
+    """Constant-time check against the configured ADMIN_TOKEN"""
+    if not settings.ADMIN_TOKEN or not value:
+        return False
+    return hmac.compare_digest(value, settings.ADMIN_TOKEN)
+
+
+class ProfilingMiddleware:
+    """ASGI middleware that saves stack profiles for selected requests.
+
+    A request is profiled when it carries ``X-Profile: <ADMIN_TOKEN>``, when it
+    falls into the ``PROFILING_SAMPLE_RATE`` sample, or - regardless of either -
+    when it takes longer than ``PROFILING_SLOW_MS``. Stacks come from a sampler
+    watching the event-loop thread, which is where the blocking PyMongo calls
+    in the services run.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._sampler: Optional[StackSampler] = None
+        self._sampler_pid: Optional[int] = None
+
+    def _ensure_sampler(self) -> StackSampler:
+        # Started lazily so each forked worker gets its own thread
+        if self._sampler is None or self._sampler_pid != os.getpid():
+            self._sampler = StackSampler(settings.PROFILING_INTERVAL_MS / 1000)
+            self._sampler.start(threading.get_ident())
+            self._sampler_pid = os.getpid()
+        return self._sampler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.PROFILING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        sampler = self._ensure_sampler()
+        headers = dict(scope.get("headers") or [])
+        forced = is_admin_token(headers.get(PROFILE_HEADER, b"").decode("latin-1"))
+        sampled = random.random() < settings.PROFILING_SAMPLE_RATE
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            end = time.perf_counter()
+            elapsed_ms = (end - start) * 1000
+            if forced or sampled or elapsed_ms >= settings.PROFILING_SLOW_MS:
+                route = getattr(scope.get("route"), "path", None) or scope["path"]
+                label = f"{scope['method']} {route}"
+                stacks = sampler.collect(start, end)
+                name = await run_in_threadpool(
+                    profile_store.save, label, elapsed_ms, stacks
+                )
+                if name:
+                    logger.info(
+                        "Saved profile %s (%s, %.1fms)", name, label, elapsed_ms
+                    )
@@ -0,0 +1,242 @@
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import record_cache_lookup
+
+logger = get_logger(__name__)
+
+# Binary layout written by data/db_scripts/build_catalog_snapshot.py
+MAGIC = b"UCSNAP01"
+VERSION = 2
+HEADER = struct.Struct("<8sHHIIIIIII32s")
+RECORD = struct.Struct("<IIIIIfffBBBB")
+OFFSET = struct.Struct("<I")
+NULL_REF = 0xFFFFFFFF
+
+SEMESTER_BITS = (("spring", 1), ("summer", 2), ("fall", 4))
+FLAG_GEN_ED = 1
+FLAG_CREDIT_RANGE = 2
+FLAG_CREDIT_NULL = 4
+
+
+class SnapshotReader:
+    """Read-only view over a memory-mapped catalog snapshot.
+
+    The file is mapped with ``ACCESS_READ`` so every gunicorn worker shares the
+    same physical pages through the OS page cache. Nothing is decoded up front;
+    lookups binary-search the fixed-width record column and only decode the
+    strings and blobs of the rows they return.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.path = path
+        self.identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+        (
+            magic,
+            version,
+            record_size,
+            self._n_records,
+            self._n_strings,
+            self._n_blobs,
+            self._records_off,
+            self._strings_off,
+            self._blobs_off,
+            end,
+            digest,
+        ) = HEADER.unpack_from(self._mm, 0)
+
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            raise ValueError(f"Unsupported catalog snapshot format: {path}")
+        if end != len(self._mm):
+            raise ValueError(f"Truncated catalog snapshot: {path}")
+        # Content digest of the courses it holds (see data/db_scripts/catalog_hash.py)
+        self.digest = digest.hex()
+
+        self._string_data = self._strings_off + (self._n_strings + 1) * OFFSET.size
+        self._blob_data = self._blobs_off + (self._n_blobs + 1) * OFFSET.size
+
+    def __len__(self) -> int:
+        return self._n_records
+
+    def _slice(self, index_off: int, data_off: int, ref: int) -> Optional[bytes]:
+        if ref == NULL_REF:
+            return None
+        pos = index_off + ref * OFFSET.size
+        start = OFFSET.unpack_from(self._mm, pos)[0]
+        stop = OFFSET.unpack_from(self._mm, pos + OFFSET.size)[0]
+        return self._mm[data_off + start : data_off + stop]
+
+    def _string(self, ref: int) -> Optional[str]:
+        raw = self._slice(self._strings_off, self._string_data, ref)
+        return raw.decode("utf-8") if raw is not None else None
+
+    def _record(self, row: int) -> tuple:
+        return RECORD.unpack_from(self._mm, self._records_off + row * RECORD.size)
+
+    def _course_id_bytes(self, row: int) -> bytes:
+        return self._slice(self._strings_off, self._string_data, self._record(row)[0])
+
+    def _find_row(self, course_id: str) -> Optional[int]:
+        key = course_id.encode("utf-8")
+        lo, hi = 0, self._n_records
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._course_id_bytes(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._n_records and self._course_id_bytes(lo) == key:
+            return lo
+        return None
+
+    def _decode(self, row: int) -> Dict[str, Any]:
+        (
+            course_ref,
+            dept_ref,
+            title_ref,
+            desc_ref,
+            blob_ref,
+            rating,
+            difficulty,
+            gpa,
+            credit_lo,
+            credit_hi,
+            flags,
+            semester_mask,
+        ) = self._record(row)
+
+        if flags & FLAG_CREDIT_NULL:
+            credit_hours = None
+        elif flags & FLAG_CREDIT_RANGE:
+            credit_hours = [credit_lo, credit_hi]
+        else:
+            credit_hours = credit_lo
+
+        blob = self._slice(self._blobs_off, self._blob_data, blob_ref)
+        nested = json.loads(blob) if blob is not None else {}
+
+        course_id = self._string(course_ref)
+        return {
+            "_id": course_id,
+            "course_id": course_id,
+            "department": self._string(dept_ref),
+            "title": self._string(title_ref),
+            "description": self._string(desc_ref),
+            "credit_hours": credit_hours,
+            "prerequisites": nested.get("prerequisites"),
+            "instructors": nested.get("instructors", {}),
+            "course_avg_rating": _optional_float(rating),
+            "course_avg_difficulty": _optional_float(difficulty),
+            "course_avg_gpa": _optional_float(gpa),
+            "semesters": [s for s, bit in SEMESTER_BITS if semester_mask & bit],
+            "gen_ed": bool(flags & FLAG_GEN_ED),
+        }
+
+    def get(self, course_id: str) -> Optional[Dict[str, Any]]:
+        """Decode a single course by ID, or None if absent"""
+        row = self._find_row(course_id)
+        return self._decode(row) if row is not None else None
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for row in range(self._n_records):
+            yield self._decode(row)
+
+
+def _optional_float(value: float) -> Optional[float]:
+    # Stored as float32, so round back to the 2 decimals the pipeline emits
+    return None if math.isnan(value) else round(value, 2)
+
+
+class CatalogSnapshot:
+    """Per-process handle on the current catalog snapshot file.
+
+    The pipeline publishes a new snapshot with an atomic rename, so a changed
+    inode/mtime at the configured path means a complete new file. The path is
+    re-stat'ed at most every ``CATALOG_SNAPSHOT_CHECK_INTERVAL`` seconds and the
+    reader is swapped; in-flight lookups keep their reference to the old
+    mapping until they finish.
+    """
+
+    _reader: Optional[SnapshotReader] = None
+    _checked_at: float = 0.0
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_reader(cls) -> Optional[SnapshotReader]:
+        """Return the current reader, or None if no snapshot is configured"""
+        path = settings.CATALOG_SNAPSHOT_PATH
+        if not path:
+            return None
+
+        now = time.monotonic()
+        if (
+            cls._reader is not None
+            and now - cls._checked_at < settings.CATALOG_SNAPSHOT_CHECK_INTERVAL
+        ):
+            return cls._reader
+
+        with cls._lock:
+            if now - cls._checked_at >= settings.CATALOG_SNAPSHOT_CHECK_INTERVAL:
+                cls._checked_at = now
+                cls._refresh(path)
+        return cls._reader
+
+    @classmethod
+    def _refresh(cls, path: str) -> None:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            if cls._reader is not None:
+                logger.warning(
+                    "Catalog snapshot %s disappeared; keeping last one", path
+                )
+            return
+
+        identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if cls._reader is not None and cls._reader.identity == identity:
+            return
+
+        try:
+            cls._reader = SnapshotReader(path)
+            logger.info(
+                "Loaded catalog snapshot %s (%s courses)", path, len(cls._reader)
+            )
+        except Exception as e:
+            logger.error("Failed to load catalog snapshot %s: %s", path, e)
+
+    @classmethod
+    def get_course(
+        cls, course_id: str, digest: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Look up a course in the snapshot; None if absent or disabled.
+
+        With ``digest`` (the courses digest of the catalog version being
+        read), a snapshot built from other course data is skipped too.
+        """
+        reader = cls.get_reader()
+        if reader is None:
+            return None
+        if digest is not None and reader.digest != digest:
+            record_cache_lookup("catalog_snapshot", False)
+            return None
+        doc = reader.get(course_id)
+        record_cache_lookup("catalog_snapshot", doc is not None)
+        return doc
+
+    @classmethod
+    def reset(cls) -> None:
+        """Drop the current mapping (e.g. after fork or in shutdown)"""
+        with cls._lock:
+            cls._reader = None
+            cls._checked_at = 0.0
@@ -0,0 +1,43 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List
+import logging
+
+
+class StartupTimer:
+    """Collects wall-clock timings for import and init phases of a worker"""
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self.phases: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the enclosed block and record it under ``name``"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.phases.append({"name": name, "ms": round(seconds * 1000, 2)})
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "elapsed_ms": round((time.perf_counter() - self._origin) * 1000, 2),
+                "phases": list(self.phases),
+            }
+
+    def log_report(self, logger: logging.Logger) -> None:
+        report = self.report()
+        breakdown = ", ".join(f"{p['name']}={p['ms']}ms" for p in report["phases"])
+        logger.info("Startup timing: total=%sms (%s)", report["elapsed_ms"], breakdown)
+
+
+# Created at first import so the clock starts as early as main.py allows
+startup_timer = StartupTimer()
@@ -0,0 +1,99 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class TokenCache:
+    """LRU cache of verified ID-token claims, valid until each token's ``exp``.
+
+    Keys are SHA-256 digests so raw bearer tokens are never held in memory
+    longer than the request that carried them.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[dict]:
+        """Return cached claims for ``token`` if present and unexpired"""
+        key = self.key_for(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, claims = entry
+            if time.time() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return claims
+
+    def put(self, token: str, claims: dict) -> None:
+        """Cache verified claims until the token's ``exp`` claim"""
+        expires_at = claims.get("exp")
+        if not expires_at or self.max_size <= 0:
+            return
+        key = self.key_for(token)
+        with self._lock:
+            self._entries[key] = (float(expires_at), claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CertificateRefresher:
+    """Daemon thread that keeps Firebase's public signing certificates warm.
+
+    firebase_admin caches the certificate response according to its HTTP
+    cache headers; re-fetching through the verifier's own transport before
+    that expires means a request never waits on the Google endpoint.
+    """
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self.interval_seconds <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="firebase-cert-refresher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def refresh(self) -> None:
+        from firebase_admin import auth, _token_gen
+
+        # Private API: the verifier's CacheControl-backed transport
+        verifier = auth._get_client(None)._token_verifier
+        verifier.request(url=_token_gen.ID_TOKEN_CERT_URI)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+                logger.debug("Refreshed Firebase signing certificates")
+            except Exception as e:
+                logger.warning("Firebase certificate refresh failed: %s", e)
+            self._stop.wait(self.interval_seconds)
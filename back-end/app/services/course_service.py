@@ -1,6 +1,10 @@
 from typing import Optional, List, Dict, Any
 import re
+from app.core.aliases import HIDDEN_FIELDS
 from app.core.database import MongoDBClient
+from app.core.deadline import deadline_kwargs, remaining_ms
+from app.core.snapshot import CatalogSnapshot
+from app.utils.prerequisites import evaluate_prerequisites
 from app.utils.serialization import to_jsonable
 from app.core.logging import get_logger
 
@@ -11,6 +15,26 @@ class CourseService:
     """Service for course-related database operations"""
 
     COLLECTION_NAME = "courses"
+    GRADES_COLLECTION_NAME = "course_grades"
+
+    # Layout of the histogram arrays written by data/scrapers/Courser_Gpa_Scraper.py
+    GRADE_LABELS = [
+        "A+",
+        "A",
+        "A-",
+        "B+",
+        "B",
+        "B-",
+        "C+",
+        "C",
+        "C-",
+        "D+",
+        "D",
+        "D-",
+        "F",
+        "W",
+    ]
+    GRADE_PERCENTILES = [10, 25, 50, 75, 90]
 
     @staticmethod
     def get_collection():
@@ -38,18 +62,51 @@ class CourseService:
         skip = (page - 1) * limit
 
         # Get total count
-        total = collection.count_documents(query)
+        total = collection.count_documents(query, **deadline_kwargs())
 
         # Get paginated results
-        courses = list(collection.find(query).sort(sort_by, 1).skip(skip).limit(limit))
+        courses = list(
+            collection.find(query, HIDDEN_FIELDS, max_time_ms=remaining_ms())
+            .sort(sort_by, 1)
+            .skip(skip)
+            .limit(limit)
+        )
 
         return to_jsonable(courses), total
 
+    @staticmethod
+    def find_course(course_id: str) -> Optional[Dict]:
+        """Get a raw course document, served from the catalog snapshot when available"""
+        aliases = MongoDBClient.get_aliases()
+        doc = None
+        # A versioned catalog only uses a snapshot of the courses its pinned
+        # version holds; without a recorded digest there is nothing to check
+        digest = aliases.digests.get(CourseService.COLLECTION_NAME)
+        if aliases.version is None or digest is not None:
+            doc = CatalogSnapshot.get_course(course_id, digest)
+        if doc is None:
+            doc = CourseService.get_collection().find_one(
+                {"course_id": course_id},
+                HIDDEN_FIELDS,
+                max_time_ms=remaining_ms(),
+            )
+        return doc
+
+    @staticmethod
+    def find_courses(course_ids: List[str]) -> List[Dict]:
+        """Get raw course documents for ``course_ids`` (in catalog order)"""
+        return list(
+            CourseService.get_collection().find(
+                {"course_id": {"$in": course_ids}},
+                HIDDEN_FIELDS,
+                max_time_ms=remaining_ms(),
+            )
+        )
+
     @staticmethod
     def get_course_by_id(course_id: str) -> Optional[Dict]:
         """Get a single course by ID"""
-        collection = CourseService.get_collection()
-        doc = collection.find_one({"course_id": course_id})
+        doc = CourseService.find_course(course_id)
         return to_jsonable(doc) if doc else None
 
     @staticmethod
@@ -103,23 +160,37 @@ class CourseService:
             search_filter = base_filter
 
         skip = (page - 1) * limit
-        total = collection.count_documents(search_filter)
+        total = collection.count_documents(search_filter, **deadline_kwargs())
 
         courses = list(
-            collection.find(search_filter).sort("course_id", 1).skip(skip).limit(limit)
+            collection.find(search_filter, HIDDEN_FIELDS, max_time_ms=remaining_ms())
+            .sort("course_id", 1)
+            .skip(skip)
+            .limit(limit)
         )
 
         return to_jsonable(courses), total
 
     @staticmethod
-    def get_prerequisites(course_id: str) -> Optional[Dict]:
-        """Get prerequisites for a course"""
+    def get_prerequisites(
+        course_id: str, completed: Optional[List[str]] = None
+    ) -> Optional[Dict]:
+        """
+        Get the prerequisite tree for a course; with ``completed`` courses,
+        also whether they satisfy it (True/False, or None if it depends on a
+        condition such as instructor consent)
+        """
         course = CourseService.get_course_by_id(course_id)
         if course:
-            return {
+            result = {
                 "course_id": course_id,
                 "prerequisites": course.get("prerequisites"),
             }
+            if completed is not None:
+                result["satisfied"] = evaluate_prerequisites(
+                    course.get("prerequisites"), completed
+                )
+            return result
         return None
 
     @staticmethod
@@ -148,3 +219,41 @@ class CourseService:
 
             return {"course_id": course_id, "instructors": instructor_list}
         return None
+
+    @staticmethod
+    def get_grades(course_id: str, instructor: Optional[str] = None) -> Optional[Dict]:
+        """
+        Get the precomputed grade distribution for a course (a single _id
+        lookup), optionally narrowed to one instructor
+        """
+        doc = MongoDBClient.get_collection(
+            CourseService.GRADES_COLLECTION_NAME
+        ).find_one({"_id": course_id}, max_time_ms=remaining_ms())
+        if not doc:
+            return None
+
+        instructors = doc.get("instructors", {})
+        if instructor is not None:
+            if instructor not in instructors:
+                return None
+            instructors = {instructor: instructors[instructor]}
+
+        result = {
+            key: doc.get(key)
+            for key in (
+                "course_id",
+                "histogram",
+                "sections",
+                "students",
+                "withdrawals",
+                "weighted_gpa",
+                "percentiles",
+                "terms",
+            )
+        }
+        result["instructors"] = instructors
+        return {
+            "grade_labels": CourseService.GRADE_LABELS,
+            "percentile_ranks": CourseService.GRADE_PERCENTILES,
+            **to_jsonable(result),
+        }
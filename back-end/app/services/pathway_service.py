@@ -1,5 +1,7 @@
 from typing import Optional, List, Dict, Any
+from app.core.aliases import HIDDEN_FIELDS
 from app.core.database import MongoDBClient
+from app.core.deadline import remaining_ms
 from app.utils.serialization import to_jsonable
 from bson import ObjectId
 from bson.errors import InvalidId
@@ -22,7 +24,7 @@ class PathwayService:
     def get_all_pathways() -> List[Dict]:
         """Get all pathways"""
         collection = PathwayService.get_collection()
-        docs = list(collection.find({}))
+        docs = list(collection.find({}, HIDDEN_FIELDS, max_time_ms=remaining_ms()))
         return to_jsonable(docs)
 
     @staticmethod
@@ -33,7 +35,9 @@ class PathwayService:
             obj_id = ObjectId(pathway_id)
         except Exception:
             return None
-        doc = collection.find_one({"_id": obj_id})
+        doc = collection.find_one(
+            {"_id": obj_id}, HIDDEN_FIELDS, max_time_ms=remaining_ms()
+        )
         return to_jsonable(doc) if doc else None
 
     @staticmethod
@@ -61,14 +65,12 @@ class PathwayService:
 
         from app.services.course_service import CourseService
 
-        collection = CourseService.get_collection()
-
         for ct in course_types:
             course_ids = pathway.get(f"{ct}_courses", [])
 
             if include_details:
                 # Get full course details
-                courses = list(collection.find({"course_id": {"$in": course_ids}}))
+                courses = CourseService.find_courses(course_ids)
                 result["courses"][ct] = to_jsonable(courses)
             else:
                 # Just return IDs
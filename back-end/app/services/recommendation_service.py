@@ -3,6 +3,7 @@ from app.core.database import MongoDBClient
 from app.core.logging import get_logger
 from app.services.pathway_service import PathwayService
 from app.services.course_service import CourseService
+from app.utils.prerequisites import evaluate_prerequisites
 
 logger = get_logger(__name__)
 
@@ -41,8 +42,6 @@ class RecommendationService:
         avoid_gen_eds = preferences.get("avoid_gen_eds", False)
         prioritize_pathway = preferences.get("prioritize_pathway", True)
 
-        collection = CourseService.get_collection()
-
         # Get all pathway courses
         core_courses = pathway.get("core_courses", [])
         recommended_courses = pathway.get("recommended_courses", [])
@@ -59,19 +58,23 @@ class RecommendationService:
         total_credits = 0
         total_difficulty = 0
         course_count = 0
+        # False once a recommendation's prerequisites hinge on a condition
+        # (e.g. instructor consent) that can't be checked automatically
+        prerequisites_satisfied = True
 
         # Get course details and apply filters
         def score_and_filter_courses(course_ids, priority, reason_prefix):
             """Score courses and apply filters"""
             nonlocal recommendations, total_credits, total_difficulty, course_count
+            nonlocal prerequisites_satisfied
 
             for course_id in course_ids:
-                course = collection.find_one({"course_id": course_id})
+                course = CourseService.find_course(course_id)
                 if not course:
                     continue
 
                 # Check filters
-                difficulty = course.get("course_avg_difficulty", 0)
+                difficulty = course.get("course_avg_difficulty") or 0
                 if difficulty > max_difficulty:
                     continue
 
@@ -84,8 +87,21 @@ class RecommendationService:
                 if current_semester not in semesters:
                     continue
 
+                # Skip courses whose prerequisites are definitely unmet; courses
+                # already picked for this semester count for concurrent ones
+                prereqs_met = evaluate_prerequisites(
+                    course.get("prerequisites"),
+                    completed_courses,
+                    [r["course"].get("course_id", "") for r in recommendations],
+                )
+                if prereqs_met is False:
+                    continue
+
                 # Calculate remaining credits
                 course_credits = course.get("credit_hours", 3)
+                # Variable-credit courses are stored as [min, max]; plan for the minimum
+                if isinstance(course_credits, list):
+                    course_credits = min(course_credits)
                 if total_credits + course_credits > credits_per_semester:
                     continue
 
@@ -111,6 +127,8 @@ class RecommendationService:
                 total_credits += course_credits
                 total_difficulty += difficulty
                 course_count += 1
+                if prereqs_met is None:
+                    prerequisites_satisfied = False
 
                 if total_credits >= credits_per_semester:
                     break
@@ -143,5 +161,5 @@ class RecommendationService:
             "recommendations": recommendations,
             "total_credits": total_credits,
             "avg_difficulty": avg_difficulty,
-            "prerequisites_satisfied": True,  # Simplified - should check prerequisites
+            "prerequisites_satisfied": prerequisites_satisfied,
         }
@@ -1,5 +1,7 @@
 from typing import Optional, List, Dict, Any, Tuple
+from app.core.aliases import HIDDEN_FIELDS
 from app.core.database import MongoDBClient
+from app.core.deadline import deadline_kwargs, remaining_ms
 from app.core.logging import get_logger
 from app.utils.serialization import to_jsonable
 
@@ -24,14 +26,20 @@ class TaggedCourseService:
         collection = TaggedCourseService.get_collection()
         query = filters or {}
         skip = (page - 1) * limit
-        total = collection.count_documents(query)
-        docs = list(collection.find(query).skip(skip).limit(limit))
+        total = collection.count_documents(query, **deadline_kwargs())
+        docs = list(
+            collection.find(query, HIDDEN_FIELDS, max_time_ms=remaining_ms())
+            .skip(skip)
+            .limit(limit)
+        )
         return to_jsonable(docs), total
 
     @staticmethod
     def get_by_course_id(course_id: str) -> Optional[Dict[str, Any]]:
         collection = TaggedCourseService.get_collection()
-        doc = collection.find_one({"course_id": course_id})
+        doc = collection.find_one(
+            {"course_id": course_id}, HIDDEN_FIELDS, max_time_ms=remaining_ms()
+        )
         return to_jsonable(doc) if doc else None
 
     @staticmethod
@@ -41,6 +49,10 @@ class TaggedCourseService:
         collection = TaggedCourseService.get_collection()
         query = {"skills": {"$in": skills}}
         skip = (page - 1) * limit
-        total = collection.count_documents(query)
-        docs = list(collection.find(query).skip(skip).limit(limit))
+        total = collection.count_documents(query, **deadline_kwargs())
+        docs = list(
+            collection.find(query, HIDDEN_FIELDS, max_time_ms=remaining_ms())
+            .skip(skip)
+            .limit(limit)
+        )
         return to_jsonable(docs), total
@@ -0,0 +1,41 @@
+from typing import Any, Iterable, Optional
+
+
+def evaluate_prerequisites(
+    tree: Any, completed: Iterable[str], concurrent: Iterable[str] = ()
+) -> Optional[bool]:
+    """Evaluate a prerequisite tree built by data/scrapers/prereq_parser.py.
+
+    - Course leaves are met by ``completed``; leaves flagged ``concurrent``
+      are also met by ``concurrent`` (courses taken in the same term)
+    - CONDITION leaves ("consent of instructor") can't be checked and are
+      unknown; AND/OR combine with three-valued logic
+
+    Returns True (met), False (definitely not met) or None (depends on an
+    unknown condition). A course without prerequisites is met.
+    """
+    completed = {c.strip().upper() for c in completed}
+    concurrent = {c.strip().upper() for c in concurrent}
+    return _evaluate(tree, completed, concurrent)
+
+
+def _evaluate(node: Any, completed: set, concurrent: set) -> Optional[bool]:
+    if node is None:
+        return True
+    if isinstance(node, str):
+        return node in completed
+
+    kind = node.get("type")
+    if kind == "SINGLE":
+        course = node.get("course")
+        if course in completed:
+            return True
+        return bool(node.get("concurrent")) and course in concurrent
+    if kind in ("AND", "OR"):
+        results = [_evaluate(child, completed, concurrent) for child in node["courses"]]
+        decisive = kind == "OR"
+        if decisive in results:
+            return decisive
+        return None if None in results else not decisive
+    # CONDITION, or RAW text from an older import
+    return None
@@ -0,0 +1,78 @@
+import argparse
+import json
+import sys
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def load_report(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(baseline: dict, candidate: dict, threshold_pct: float) -> list:
+    """
+    Compare two load_test reports endpoint by endpoint
+
+    Returns:
+        List of (endpoint, metric, baseline, candidate, change_pct, regressed) rows
+    """
+    rows = []
+    for name, base_stats in baseline["endpoints"].items():
+        cand_stats = candidate["endpoints"].get(name)
+        if not cand_stats:
+            continue
+        for metric in METRICS:
+            before, after = base_stats.get(metric), cand_stats.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before * 100
+            rows.append((name, metric, before, after, change, change > threshold_pct))
+
+        before, after = base_stats["throughput_rps"], cand_stats["throughput_rps"]
+        if before:
+            change = (after - before) / before * 100
+            rows.append(
+                (name, "throughput_rps", before, after, change, -change > threshold_pct)
+            )
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two load_test reports")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=15.0,
+        help="Percent change that counts as a regression",
+    )
+    args = parser.parse_args(argv)
+
+    baseline = load_report(args.baseline)
+    candidate = load_report(args.candidate)
+    rows = compare(baseline, candidate, args.threshold)
+
+    print(
+        f"baseline={baseline['meta'].get('git_revision')} "
+        f"candidate={candidate['meta'].get('git_revision')} "
+        f"threshold={args.threshold}%"
+    )
+    regressions = 0
+    for name, metric, before, after, change, regressed in rows:
+        flag = "REGRESSION" if regressed else ""
+        regressions += regressed
+        print(
+            f"{name:<12} {metric:<15} {before:>10.2f} -> {after:>10.2f} "
+            f"({change:+6.1f}%) {flag}"
+        )
+
+    if regressions:
+        print(f"\n{regressions} regression(s) over {args.threshold}%")
+        sys.exit(1)
+    print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import httpx
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCHMARKS_DIR)
+REPO_ROOT = os.path.dirname(BACKEND_DIR)
+SYNTHETIC_GENERATOR = os.path.join(
+    REPO_ROOT, "data", "db_scripts", "generate_synthetic_catalog.py"
+)
+BASE_COURSE_COUNT = 963
+API_PREFIX = "/api/v1"
+
+# Traffic mix: (scenario, weight)
+DEFAULT_MIX = {
+    "typeahead": 40,
+    "listing": 25,
+    "pathway": 20,
+    "recommend": 15,
+}
+SEMESTERS = ["spring", "summer", "fall"]
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class Workload:
+    """Builds randomized requests for each scenario from live catalog data"""
+
+    def __init__(self, rng: random.Random, course_ids: List[str], pathways: List):
+        self.rng = rng
+        self.course_ids = course_ids
+        self.departments = sorted({c.split(" ")[0] for c in course_ids})
+        self.pathways = pathways
+
+    def typeahead(self):
+        # Users type the first few characters of a course code, often without a space
+        course_id = self.rng.choice(self.course_ids)
+        q = course_id[: self.rng.randint(2, len(course_id))]
+        if self.rng.random() < 0.5:
+            q = q.replace(" ", "")
+        return "GET", f"{API_PREFIX}/courses/search", {"params": {"q": q, "limit": 10}}
+
+    def listing(self):
+        params = {
+            "department": self.rng.choice(self.departments),
+            "page": self.rng.randint(1, 3),
+            "limit": 50,
+        }
+        if self.rng.random() < 0.5:
+            params["semester"] = self.rng.choice(SEMESTERS)
+        if self.rng.random() < 0.3:
+            params["max_difficulty"] = 3.5
+        return "GET", f"{API_PREFIX}/courses", {"params": params}
+
+    def pathway(self):
+        pathway_id = self.rng.choice(self.pathways)["_id"]
+        if self.rng.random() < 0.5:
+            return "GET", f"{API_PREFIX}/pathways/{pathway_id}", {}
+        return (
+            "GET",
+            f"{API_PREFIX}/pathways/{pathway_id}/courses",
+            {"params": {"include_details": "true"}},
+        )
+
+    def recommend(self):
+        pathway = self.rng.choice(self.pathways)
+        pool = pathway.get("core_courses", []) + pathway.get("recommended_courses", [])
+        completed = self.rng.sample(pool, k=min(len(pool), self.rng.randint(0, 6)))
+        body = {
+            "completed_courses": completed,
+            "current_semester": self.rng.choice(SEMESTERS),
+            "credits_per_semester": self.rng.choice([12, 15, 18]),
+        }
+        return (
+            "POST",
+            f"{API_PREFIX}/pathways/{pathway['_id']}/recommend",
+            {"json": body},
+        )
+
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.25)
+    raise RuntimeError("API did not become ready in time")
+
+
+async def load_workload(client: httpx.AsyncClient, seed: int) -> Workload:
+    pathways = (await client.get(f"{API_PREFIX}/pathways")).json()["data"]["pathways"]
+    courses = (await client.get(f"{API_PREFIX}/courses", params={"limit": 1000})).json()
+    course_ids = [c["course_id"] for c in courses["data"]["courses"]]
+    if not pathways or not course_ids:
+        raise RuntimeError("Benchmark database has no courses or pathways")
+    return Workload(random.Random(seed), course_ids, pathways)
+
+
+async def run_load(
+    base_url: str,
+    duration: float,
+    warmup: float,
+    concurrency: int,
+    mix: Dict[str, int],
+    seed: int,
+) -> Dict:
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=30
+    ) as client:
+        await wait_until_ready(client)
+        workload = await load_workload(client, seed)
+
+        scenarios = list(mix)
+        weights = [mix[s] for s in scenarios]
+        latencies: Dict[str, List[float]] = defaultdict(list)
+        # scenario -> status class ("4xx", "5xx", ...) -> count
+        errors: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+        start = time.perf_counter()
+        measure_from = start + warmup
+        stop_at = measure_from + duration
+
+        async def worker():
+            while True:
+                now = time.perf_counter()
+                if now >= stop_at:
+                    return
+                scenario = workload.rng.choices(scenarios, weights)[0]
+                method, url, kwargs = getattr(workload, scenario)()
+                t0 = time.perf_counter()
+                try:
+                    resp = await client.request(method, url, **kwargs)
+                    # A 404 from a bad seed ID or a 422 from bad params is as
+                    # broken as a 500, so only 2xx counts towards latency
+                    failure = (
+                        None
+                        if 200 <= resp.status_code < 300
+                        else f"{resp.status_code // 100}xx"
+                    )
+                except httpx.HTTPError:
+                    failure = "transport"
+                t1 = time.perf_counter()
+                if t0 < measure_from:
+                    continue
+                if failure:
+                    errors[scenario][failure] += 1
+                else:
+                    latencies[scenario].append((t1 - t0) * 1000)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    return summarize(latencies, errors, duration)
+
+
+def summarize(
+    latencies: Dict[str, List[float]], errors: Dict[str, Dict[str, int]], duration
+):
+    def stats(values: List[float], error_counts: Dict[str, int]) -> Dict:
+        values = sorted(values)
+        return {
+            "requests": len(values),
+            "errors": sum(error_counts.values()),
+            "errors_by_class": dict(sorted(error_counts.items())),
+            "throughput_rps": round(len(values) / duration, 2),
+            "mean_ms": round(sum(values) / len(values), 3) if values else None,
+            "p50_ms": _round(percentile(values, 50)),
+            "p95_ms": _round(percentile(values, 95)),
+            "p99_ms": _round(percentile(values, 99)),
+            "max_ms": _round(values[-1] if values else None),
+        }
+
+    endpoints = {
+        name: stats(latencies.get(name, []), errors.get(name, {}))
+        for name in sorted(set(latencies) | set(errors))
+    }
+    all_values = [v for values in latencies.values() for v in values]
+    all_errors: Dict[str, int] = defaultdict(int)
+    for counts in errors.values():
+        for failure, count in counts.items():
+            all_errors[failure] += count
+    return {"endpoints": endpoints, "total": stats(all_values, all_errors)}
+
+
+def _round(value):
+    return round(value, 3) if value is not None else None
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except Exception:
+        return None
+
+
+def start_server(args) -> subprocess.Popen:
+    cmd = [sys.executable, "-m", "benchmarks.serve", "--port", str(args.port)]
+    if args.mongo_url:
+        cmd += ["--mongo-url", args.mongo_url]
+    if args.data_dir:
+        cmd += ["--data-dir", args.data_dir]
+    return subprocess.Popen(cmd, cwd=BACKEND_DIR)
+
+
+def synthetic_data_dir(scale: float, seed: int) -> str:
+    """Return (generating on first use) a synthetic catalog at ``scale``x today's"""
+    n_courses = int(BASE_COURSE_COUNT * scale)
+    data_dir = os.path.join(REPO_ROOT, "data", "synthetic", str(n_courses))
+    if not os.path.exists(os.path.join(data_dir, "uiuc_courses_flatten.json")):
+        subprocess.check_call(
+            [
+                sys.executable,
+                SYNTHETIC_GENERATOR,
+                "--courses",
+                str(n_courses),
+                "--seed",
+                str(seed),
+                "--output-dir",
+                data_dir,
+            ]
+        )
+    return data_dir
+
+
+def parse_mix(text: Optional[str]) -> Dict[str, int]:
+    if not text:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for part in text.split(","):
+        name, weight = part.split("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Unknown scenario '{name}'")
+        mix[name] = int(weight)
+    return mix
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP load test for the API")
+    parser.add_argument(
+        "--url",
+        default=None,
+        help="Target an already running API instead of booting one",
+    )
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--mongo-url", default=None, help="Default: mongomock")
+    parser.add_argument("--data-dir", default=None)
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=None,
+        help="Serve a synthetic catalog this many times today's size (e.g. 10, 100)",
+    )
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--mix",
+        default=None,
+        help="e.g. typeahead=40,listing=25,pathway=20,recommend=15",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Write JSON report here")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    mix = parse_mix(args.mix)
+    if args.scale:
+        args.data_dir = synthetic_data_dir(args.scale, args.seed)
+
+    server = None
+    base_url = args.url
+    if not base_url:
+        server = start_server(args)
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    try:
+        results = asyncio.run(
+            run_load(
+                base_url, args.duration, args.warmup, args.concurrency, mix, args.seed
+            )
+        )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    report = {
+        "meta": {
+            "git_revision": git_revision(),
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "target": args.url or ("mongo" if args.mongo_url else "mongomock"),
+            "data_dir": args.data_dir,
+            "scale": args.scale or 1,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "concurrency": args.concurrency,
+            "mix": mix,
+            "seed": args.seed,
+        },
+        **results,
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"Saved benchmark report → {args.output}")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
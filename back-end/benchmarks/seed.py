@@ -0,0 +1,64 @@
+import json
+import os
+from typing import Dict
+
+# Resolve paths
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(os.path.dirname(BENCHMARKS_DIR))
+PROCESSED_DIR = os.path.join(REPO_ROOT, "data", "processed")
+
+COURSES_PATH = os.path.join(PROCESSED_DIR, "uiuc_courses_flatten.json")
+TAGGED_COURSES_PATH = os.path.join(PROCESSED_DIR, "tagged_courses.json")
+CAREER_PATHS_PATH = os.path.join(PROCESSED_DIR, "career_pathways.json")
+COURSE_GRADES_PATH = os.path.join(PROCESSED_DIR, "uiuc_course_grades.json")
+
+
+def load_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def seed_database(db, data_dir: str = PROCESSED_DIR) -> Dict[str, int]:
+    """
+    Load the processed datasets into ``db`` the same way the importers do
+
+    Args:
+        db: pymongo or mongomock Database
+        data_dir: Directory holding the processed JSON files
+
+    Returns:
+        Document counts per collection
+    """
+    courses = load_json(os.path.join(data_dir, os.path.basename(COURSES_PATH)))
+    tagged = load_json(os.path.join(data_dir, os.path.basename(TAGGED_COURSES_PATH)))
+    paths = load_json(os.path.join(data_dir, os.path.basename(CAREER_PATHS_PATH)))
+
+    course_docs = []
+    for course_id, course in courses.items():
+        doc = dict(course)
+        doc["_id"] = course_id
+        course_docs.append(doc)
+
+    # Grade distributions are optional (synthetic catalogs don't have them)
+    grades_path = os.path.join(data_dir, os.path.basename(COURSE_GRADES_PATH))
+    grades = load_json(grades_path) if os.path.exists(grades_path) else {}
+    grade_docs = [{**doc, "_id": course_id} for course_id, doc in grades.items()]
+
+    for name in ("courses", "tagged_courses", "career_paths", "course_grades"):
+        db.drop_collection(name)
+
+    db["courses"].insert_many(course_docs)
+    db["tagged_courses"].insert_many([dict(doc) for doc in tagged])
+    db["career_paths"].insert_many([dict(doc) for doc in paths])
+    if grade_docs:
+        db["course_grades"].insert_many(grade_docs)
+
+    db["courses"].create_index("course_id")
+    db["tagged_courses"].create_index("course_id")
+
+    return {
+        "courses": len(course_docs),
+        "tagged_courses": len(tagged),
+        "career_paths": len(paths),
+        "course_grades": len(grade_docs),
+    }
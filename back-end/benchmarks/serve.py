@@ -0,0 +1,65 @@
+import argparse
+import os
+import sys
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCHMARKS_DIR)
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.seed import PROCESSED_DIR, seed_database
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run main:app against a seeded MongoDB or in-memory mongomock"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument(
+        "--mongo-url",
+        default=None,
+        help="Real MongoDB to seed and serve from (default: in-memory mongomock)",
+    )
+    parser.add_argument("--db-name", default="semester_planner_bench")
+    parser.add_argument("--data-dir", default=PROCESSED_DIR)
+    parser.add_argument(
+        "--no-seed", action="store_true", help="Serve an already seeded database"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Settings are read at import time, so configure the environment first
+    os.environ["MONGODB_DB_NAME"] = args.db_name
+    if args.mongo_url:
+        os.environ["MONGODB_URL"] = args.mongo_url
+
+    from app.core.database import MongoDBClient
+
+    if args.mongo_url:
+        from pymongo import MongoClient
+
+        client = MongoClient(args.mongo_url)
+    else:
+        import mongomock
+
+        client = mongomock.MongoClient()
+        # Pre-populate the singleton so the app never opens a real connection
+        MongoDBClient._client = client
+        MongoDBClient._db = client[args.db_name]
+
+    if not args.no_seed:
+        counts = seed_database(client[args.db_name], args.data_dir)
+        print(f"Seeded {args.db_name}: {counts}", flush=True)
+
+    import uvicorn
+    from main import app
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
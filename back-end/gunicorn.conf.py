@@ -0,0 +1,26 @@
+# Gunicorn hooks for the API (used by start.sh)
+#
+# start.sh runs with --preload, which imports main:app once in the master so
+# workers share the FastAPI/Pydantic import work copy-on-write. Anything that
+# holds sockets or threads (MongoClient, Firebase, snapshot mmaps, the log
+# listener) is created lazily per worker; post_fork clears any of it that
+# leaked into the master.
+
+
+def post_fork(server, worker):
+    from app.core.database import MongoDBClient
+    from app.core.dependencies import reset_firebase_after_fork
+    from app.core.logging import reset_logging_after_fork
+    from app.core.snapshot import CatalogSnapshot
+
+    reset_logging_after_fork()
+    MongoDBClient.reset_after_fork()
+    CatalogSnapshot.reset()
+    reset_firebase_after_fork()
+    server.log.info("Worker %s reset pre-fork client state", worker.pid)
+
+
+def child_exit(server, worker):
+    from app.core.metrics import mark_process_dead
+
+    mark_process_dead(worker.pid)
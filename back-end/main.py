@@ -1,44 +1,67 @@
 import os
-from fastapi import FastAPI, Depends
-from fastapi.responses import JSONResponse
-from fastapi.middleware.cors import CORSMiddleware
+import asyncio
+
+# Start the startup clock before the heavy framework imports
+from app.core.startup import startup_timer
+
+with startup_timer.phase("import:fastapi"):
+    from fastapi import FastAPI, Depends
+    from fastapi.responses import JSONResponse, Response
+    from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from datetime import datetime
 
 # Import configuration and database
-from app.core.config import settings
-from app.core.database import MongoDBClient
-from app.core.logging import get_logger
-from app.core.exceptions import InternalServerError
+with startup_timer.phase("import:core"):
+    from app.core.config import settings
+    from app.core.database import MongoDBClient
+    from app.core.logging import RequestIdMiddleware, get_logger
+    from app.core.exceptions import InternalServerError
+    from app.core.admission import AdmissionMiddleware
+    from app.core.aliases import CatalogVersionMiddleware
+    from app.core.metrics import MetricsMiddleware, render_metrics
+    from app.core.profiling import ProfilingMiddleware
 
 # Import routes
-from app.api.endpoints.courses import router as courses_router
-from app.api.endpoints.pathways import router as pathways_router
-from app.api.endpoints.tagged_courses import router as tagged_courses_router
+with startup_timer.phase("import:routes"):
+    from app.api.endpoints.courses import router as courses_router
+    from app.api.endpoints.pathways import router as pathways_router
+    from app.api.endpoints.tagged_courses import router as tagged_courses_router
+    from app.api.endpoints.admin import router as admin_router
 
 logger = get_logger(__name__)
 
 
+def log_db_diagnostics():
+    """Initialize DB for this worker and log basic diagnostics"""
+    with startup_timer.phase("init:mongodb"):
+        try:
+            MongoDBClient.get_instance()
+            try:
+                courses_col = MongoDBClient.get_collection("courses")
+                career_paths_col = MongoDBClient.get_collection("career_paths")
+                logger.info(
+                    "DB diagnostics - counts: courses=%s, career_paths=%s",
+                    courses_col.estimated_document_count(),
+                    career_paths_col.estimated_document_count(),
+                )
+            except Exception as inner_e:
+                logger.warning("DB diagnostics failed: %s", str(inner_e))
+        except Exception as e:
+            logger.error("DB initialization failed on startup: %s", str(e))
+
+
 # Lifespan context manager for startup/shutdown
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Handle startup and shutdown events"""
     logger.info("Application starting up...")
-    # Initialize DB per worker and log basic diagnostics
-    try:
-        MongoDBClient.get_instance()
-        try:
-            courses_col = MongoDBClient.get_collection("courses")
-            career_paths_col = MongoDBClient.get_collection("career_paths")
-            logger.info(
-                "DB diagnostics - counts: courses=%s, career_paths=%s",
-                courses_col.estimated_document_count(),
-                career_paths_col.estimated_document_count(),
-            )
-        except Exception as inner_e:
-            logger.warning("DB diagnostics failed: %s", str(inner_e))
-    except Exception as e:
-        logger.error("DB initialization failed on startup: %s", str(e))
+    if settings.FAST_START:
+        # Don't hold the worker's first request behind Atlas round-trips
+        asyncio.get_running_loop().run_in_executor(None, log_db_diagnostics)
+    else:
+        log_db_diagnostics()
+    startup_timer.log_report(logger)
     yield
     logger.info("Application shutting down...")
     MongoDBClient.close()
@@ -59,8 +82,25 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let browser clients read the pinned catalog version and request ID
+    expose_headers=["X-Catalog-Version", "X-Request-ID"],
 )
 
+# Capture stack profiles for slow, sampled or admin-flagged requests
+app.add_middleware(ProfilingMiddleware)
+
+# Read every collection of a request from the same catalog version
+app.add_middleware(CatalogVersionMiddleware)
+
+# Bound in-flight work per route class and shed excess load with 503s
+app.add_middleware(AdmissionMiddleware)
+
+# Record per-route latency, in-flight requests and response sizes
+app.add_middleware(MetricsMiddleware)
+
+# Tag every log line written while serving a request with its X-Request-ID
+app.add_middleware(RequestIdMiddleware)
+
 
 # Health check endpoint
 @app.get("/health")
@@ -69,10 +109,26 @@ async def health_check():
     return {"status": "healthy", "timestamp": datetime.utcnow().isoformat() + "Z"}
 
 
+# Startup timing report
+@app.get("/health/startup")
+async def startup_report():
+    """Import and init phase timings for this worker"""
+    return {"fast_start": settings.FAST_START, **startup_timer.report()}
+
+
+# Prometheus metrics endpoint
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics, aggregated across gunicorn workers"""
+    content, content_type = render_metrics()
+    return Response(content=content, media_type=content_type)
+
+
 # Include routers
 app.include_router(courses_router, prefix="/api/v1")
 app.include_router(pathways_router, prefix="/api/v1")
 app.include_router(tagged_courses_router, prefix="/api/v1")
+app.include_router(admin_router, prefix="/api/v1")
 
 
 # Root endpoint
@@ -86,7 +142,7 @@ async def root():
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler"""
-    logger.error(f"Unhandled exception: {str(exc)}", exc_info=exc)
+    logger.error("Unhandled exception: %s", exc, exc_info=exc)
     return JSONResponse(
         status_code=500,
         content={
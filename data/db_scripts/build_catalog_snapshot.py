@@ -0,0 +1,181 @@
+import json
+import os
+import struct
+import sys
+
+from catalog_hash import content_hash, digest
+
+# Resolve paths
+DB_SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.dirname(DB_SCRIPTS_DIR)
+
+JSON_PATH = os.path.join(DATA_DIR, "processed", "uiuc_courses_flatten.json")
+SNAPSHOT_PATH = os.getenv(
+    "CATALOG_SNAPSHOT_PATH", os.path.join(DATA_DIR, "processed", "catalog.snap")
+)
+
+# ============================================================
+#  SNAPSHOT FORMAT
+# ============================================================
+#
+# Must stay in sync with back-end/app/core/snapshot.py.
+#
+#   header   : HEADER_FORMAT, ending in the catalog_hash.digest of the
+#              courses (as db_import.py records it in the catalog alias)
+#   records  : n_records fixed-width rows (RECORD_FORMAT), sorted by course_id
+#   strings  : (n_strings + 1) uint32 offsets, then UTF-8 bytes
+#   blobs    : (n_blobs + 1) uint32 offsets, then compact JSON bytes
+#
+# Floats use NaN for null. Strings and blobs are referenced by index;
+# NULL_REF marks a missing value.
+
+MAGIC = b"UCSNAP01"
+VERSION = 2
+HEADER_FORMAT = "<8sHHIIIIIII32s"
+RECORD_FORMAT = "<IIIIIfffBBBB"
+NULL_REF = 0xFFFFFFFF
+
+SEMESTER_BITS = {"spring": 1, "summer": 2, "fall": 4}
+FLAG_GEN_ED = 1
+FLAG_CREDIT_RANGE = 2
+FLAG_CREDIT_NULL = 4
+
+
+class _Table:
+    """Deduplicated, offset-indexed byte table"""
+
+    def __init__(self):
+        self.index = {}
+        self.items = []
+
+    def add(self, data):
+        if data is None:
+            return NULL_REF
+        ref = self.index.get(data)
+        if ref is None:
+            ref = len(self.items)
+            self.index[data] = ref
+            self.items.append(data)
+        return ref
+
+    def pack(self):
+        offsets = [0]
+        for item in self.items:
+            offsets.append(offsets[-1] + len(item))
+        return struct.pack(f"<{len(offsets)}I", *offsets) + b"".join(self.items)
+
+
+def _encode(text):
+    return text.encode("utf-8") if text is not None else None
+
+
+def _float(value):
+    return float(value) if value is not None else float("nan")
+
+
+def _credit_columns(credit_hours):
+    """Map int | [lo, hi] | None onto (lo, hi, flags)"""
+    if credit_hours is None:
+        return 0, 0, FLAG_CREDIT_NULL
+    if isinstance(credit_hours, list):
+        return min(credit_hours), max(credit_hours), FLAG_CREDIT_RANGE
+    return credit_hours, credit_hours, 0
+
+
+def courses_digest(courses):
+    """Digest of a {course_id: course} mapping, matching db_import.py's"""
+    return digest({course_id: content_hash(c) for course_id, c in courses.items()})
+
+
+def build_snapshot(courses):
+    """Serialize a {course_id: course} mapping into snapshot bytes"""
+    strings = _Table()
+    blobs = _Table()
+    rows = []
+
+    ordered = sorted(courses.values(), key=lambda c: c["course_id"].encode("utf-8"))
+    for course in ordered:
+        credit_lo, credit_hi, flags = _credit_columns(course.get("credit_hours"))
+        if course.get("gen_ed"):
+            flags |= FLAG_GEN_ED
+
+        semester_mask = 0
+        for semester in course.get("semesters") or []:
+            semester_mask |= SEMESTER_BITS.get(semester, 0)
+
+        blob = json.dumps(
+            {
+                "prerequisites": course.get("prerequisites"),
+                "instructors": course.get("instructors") or {},
+            },
+            separators=(",", ":"),
+            ensure_ascii=False,
+        ).encode("utf-8")
+
+        rows.append(
+            struct.pack(
+                RECORD_FORMAT,
+                strings.add(_encode(course["course_id"])),
+                strings.add(_encode(course.get("department"))),
+                strings.add(_encode(course.get("title"))),
+                strings.add(_encode(course.get("description"))),
+                blobs.add(blob),
+                _float(course.get("course_avg_rating")),
+                _float(course.get("course_avg_difficulty")),
+                _float(course.get("course_avg_gpa")),
+                credit_lo,
+                credit_hi,
+                flags,
+                semester_mask,
+            )
+        )
+
+    records = b"".join(rows)
+    string_section = strings.pack()
+    blob_section = blobs.pack()
+
+    header_size = struct.calcsize(HEADER_FORMAT)
+    records_off = header_size
+    strings_off = records_off + len(records)
+    blobs_off = strings_off + len(string_section)
+
+    header = struct.pack(
+        HEADER_FORMAT,
+        MAGIC,
+        VERSION,
+        struct.calcsize(RECORD_FORMAT),
+        len(rows),
+        len(strings.items),
+        len(blobs.items),
+        records_off,
+        strings_off,
+        blobs_off,
+        blobs_off + len(blob_section),
+        bytes.fromhex(courses_digest(courses)),
+    )
+    return header + records + string_section + blob_section
+
+
+def write_snapshot(data, path):
+    """Write snapshot bytes and atomically swap them into place"""
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    # os.replace gives readers either the old or the new file, never a partial one
+    os.replace(tmp_path, path)
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else JSON_PATH
+    target = sys.argv[2] if len(sys.argv) > 2 else SNAPSHOT_PATH
+
+    with open(source, "r", encoding="utf-8") as f:
+        courses = json.load(f)
+    print(f"Loaded {len(courses)} courses.")
+
+    data = build_snapshot(courses)
+    os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+    write_snapshot(data, target)
+    print(f"Saved catalog snapshot ({len(data)} bytes) → {target}")
@@ -0,0 +1,31 @@
+"""
+Content hashes shared by db_import.py and build_catalog_snapshot.py.
+
+db_import.py stores content_hash() on every document and records each
+collection's digest() in the catalog alias document. The snapshot builder
+stamps its file with the digest of the courses it holds, so the API can tell
+whether a snapshot matches the catalog version a request reads.
+"""
+
+import hashlib
+import json
+
+# Kept out of API responses by HIDDEN_FIELDS in back-end/app/core/aliases.py
+HASH_FIELD = "content_hash"
+
+
+def content_hash(doc):
+    """sha256 of the document's canonical JSON (sorted keys, no whitespace)"""
+    content = {k: v for k, v in doc.items() if k not in ("_id", HASH_FIELD)}
+    canonical = json.dumps(
+        content, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def digest(hashes):
+    """sha256 over a {key: content hash} mapping, independent of order"""
+    total = hashlib.sha256()
+    for key in sorted(hashes, key=str):
+        total.update(f"{key}\0{hashes[key]}\n".encode("utf-8"))
+    return total.hexdigest()
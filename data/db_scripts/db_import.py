@@ -1,8 +1,39 @@
+"""
+Imports the processed catalog (courses, grade distributions, tagged courses
+and career paths) into MongoDB as one new catalog version.
+
+Each source file is first diffed, read-only, against the content hashes of
+its live collection. A collection with nothing to change stays live as it
+is, and if no collection changed the import stops there. Every other
+collection gets a fresh staging collection (``courses__v<n>``, ...): it
+starts as a server-side copy of the live collection, and the source file is
+then applied to it. The JSON is streamed with ijson, so memory
+stays flat however large the catalog is. Documents go out in unordered
+batches of BATCH_SIZE, several batches at a time, and every stored document
+carries a hash of its content in HASH_FIELD. Documents whose hash hasn't
+changed are skipped, and documents no longer in the source are removed.
+
+Once every staging collection has its indexes and passes validation, the
+alias document in ALIAS_COLLECTION is switched to the new version in a
+single write. The API resolves collection names through it, so readers go
+from one complete version to the next and never see a half-imported
+catalog. A collection replaced by the switch is kept for RETIRE_AFTER
+seconds, long enough for every API worker to see the switch and for
+requests still pinned to the old version to finish, and dropped by the first
+import after that.
+"""
+
+import argparse
 import json
 import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+
 import certifi
-from pymongo import MongoClient, UpdateOne
-from typing import Optional
+from pymongo import IndexModel, MongoClient, ReplaceOne
+
+from catalog_hash import HASH_FIELD, content_hash, digest
 
 # Load environment from repo root if python-dotenv is available
 try:
@@ -10,6 +41,12 @@ try:
 except Exception:
     load_dotenv = None  # optional dependency
 
+# Streaming parser; without it the whole file is loaded with json.load
+try:
+    import ijson  # type: ignore
+except Exception:
+    ijson = None  # optional dependency
+
 # Resolve paths
 DB_SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.dirname(DB_SCRIPTS_DIR)
@@ -21,46 +58,398 @@ if load_dotenv:
     if os.path.exists(env_path):
         load_dotenv(env_path)
 
-JSON_PATH = os.path.join(DATA_DIR, "processed", "uiuc_courses_flatten.json")
-
-with open(JSON_PATH, "r", encoding="utf-8") as f:
-    courses = json.load(f)
-
-print(f"Loaded {len(courses)} courses.")
+PROCESSED_DIR = os.path.join(DATA_DIR, "processed")
 
 # Read Mongo configuration from environment
 MONGO_URI: str = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
 DB_NAME: str = os.getenv("MONGODB_DB_NAME", "semester_planner")
 TIMEOUT_MS: int = int(os.getenv("MONGODB_TIMEOUT_MS", "10000"))
 
-uri_lower = MONGO_URI.lower()
-use_tls = (
-    uri_lower.startswith("mongodb+srv://")
-    or ("tls=true" in uri_lower)
-    or ("ssl=true" in uri_lower)
+BATCH_SIZE = 1000
+WORKERS = 4
+
+# Must stay in sync with back-end/app/core/aliases.py
+ALIAS_COLLECTION = "collection_aliases"
+CATALOG_ALIAS_ID = "catalog"
+
+# API workers notice a switch within COLLECTION_ALIAS_CHECK_INTERVAL seconds,
+# and a request pinned to the old version runs for at most
+# REQUEST_DEADLINE_MS; read with the back-end's defaults
+RETIRE_AFTER = timedelta(
+    seconds=float(os.getenv("COLLECTION_ALIAS_CHECK_INTERVAL", "5"))
+    + float(os.getenv("REQUEST_DEADLINE_MS", "5000")) / 1000
 )
 
-if use_tls:
-    client = MongoClient(
-        MONGO_URI, tlsCAFile=certifi.where(), serverSelectionTimeoutMS=TIMEOUT_MS
+# collection -> (source file, key field). A key of "_id" means the file is
+# one JSON object keyed by _id. Otherwise it is a list of documents, matched
+# to stored ones on that field, so e.g. a career path keeps its ObjectId
+# across imports.
+COLLECTIONS = {
+    "courses": ("uiuc_courses_flatten.json", "_id"),
+    "course_grades": ("uiuc_course_grades.json", "_id"),
+    "tagged_courses": ("tagged_courses.json", "course_id"),
+    "career_paths": ("career_pathways.json", "name"),
+}
+# May be missing (synthetic catalogs have no grades); the live collection
+# then carries over into the new version unchanged
+OPTIONAL = {"course_grades"}
+# Built on each staging collection before it goes live
+INDEXES = {
+    "courses": [IndexModel("course_id", unique=True)],
+    "course_grades": [],
+    "tagged_courses": [IndexModel("course_id", unique=True)],
+    "career_paths": [IndexModel("name", unique=True)],
+}
+
+
+# ============================================================
+#  READING
+# ============================================================
+
+
+def iter_documents(path, key):
+    """Documents of a source file (see COLLECTIONS), parsed incrementally"""
+    if key == "_id":
+        for doc_id, doc in _iter_json(path, kvitems=True):
+            yield {"_id": doc_id, **doc}
+    else:
+        yield from _iter_json(path, kvitems=False)
+
+
+def _iter_json(path, kvitems):
+    if ijson is None:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        yield from data.items() if kvitems else data
+        return
+    with open(path, "rb") as f:
+        if kvitems:
+            yield from ijson.kvitems(f, "", use_float=True)
+        else:
+            yield from ijson.items(f, "item", use_float=True)
+
+
+def batched(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ============================================================
+#  WRITING
+# ============================================================
+
+
+def connect():
+    uri_lower = MONGO_URI.lower()
+    use_tls = (
+        uri_lower.startswith("mongodb+srv://")
+        or ("tls=true" in uri_lower)
+        or ("ssl=true" in uri_lower)
     )
-else:
-    client = MongoClient(MONGO_URI, serverSelectionTimeoutMS=TIMEOUT_MS)
+    if use_tls:
+        return MongoClient(
+            MONGO_URI, tlsCAFile=certifi.where(), serverSelectionTimeoutMS=TIMEOUT_MS
+        )
+    return MongoClient(MONGO_URI, serverSelectionTimeoutMS=TIMEOUT_MS)
+
+
+def import_batch(collection, batch, key):
+    """
+    Writes the documents of ``batch`` whose content hash differs from the
+    stored one. Returns (inserted, updated, unchanged) counts.
+    """
+    stored = {
+        doc.get(key): doc.get(HASH_FIELD)
+        for doc in collection.find(
+            {key: {"$in": [doc[key] for doc in batch]}}, {key: 1, HASH_FIELD: 1}
+        )
+    }
+    operations = []
+    for doc in batch:
+        digest = content_hash(doc)
+        if stored.get(doc[key]) == digest:
+            continue
+        # Replace rather than $set, so fields dropped from the source go too
+        doc = {**doc, HASH_FIELD: digest}
+        operations.append(ReplaceOne({key: doc[key]}, doc, upsert=True))
+
+    if not operations:
+        return 0, 0, len(batch)
+    result = collection.bulk_write(operations, ordered=False)
+    inserted = result.upserted_count
+    return inserted, len(operations) - inserted, len(batch) - len(operations)
+
+
+def import_file(collection, path, key, batch_size=BATCH_SIZE, workers=WORKERS):
+    """
+    Streams ``path`` into ``collection``, ``workers`` batches in flight at a
+    time. Returns ([total, inserted, updated, unchanged], keys seen).
+    """
+    counts = [0, 0, 0, 0]
+    seen = set()
+    pending = set()
+
+    def collect(done):
+        for future in done:
+            for i, count in enumerate(future.result(), start=1):
+                counts[i] += count
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for batch in batched(iter_documents(path, key), batch_size):
+            counts[0] += len(batch)
+            seen.update(doc[key] for doc in batch)
+            # Bound the batches held in memory
+            if len(pending) >= workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending.add(pool.submit(import_batch, collection, batch, key))
+        collect(wait(pending).done)
+
+    return counts, seen
+
+
+def stored_hashes(collection, key):
+    """key -> stored content hash of every document in ``collection``"""
+    return {
+        doc.get(key): doc.get(HASH_FIELD)
+        for doc in collection.find({}, {key: 1, HASH_FIELD: 1})
+    }
+
+
+def pending_changes(collection, path, key):
+    """
+    Read-only diff of ``path`` against ``collection``'s stored hashes.
+    Returns (total, changed, removed, digest): source documents, those that
+    are new or differ, stored ones no longer in the source, and the digest
+    of the source (what the collection holds once it is imported).
+    """
+    stored = stored_hashes(collection, key)
+    hashes = {}
+    total = changed = 0
+    for doc in iter_documents(path, key):
+        total += 1
+        hashes[doc[key]] = content_hash(doc)
+        # A duplicate key finds nothing left to pop, so it counts as a change
+        # and the collection is staged, where validation rejects it
+        if stored.pop(doc[key], None) != hashes[doc[key]]:
+            changed += 1
+    return total, changed, len(stored), digest(hashes)
+
+
+def remove_stale(collection, key, seen):
+    """Deletes documents whose key is not in ``seen``; returns how many"""
+    stale = [doc.get(key) for doc in collection.find({}, {key: 1})]
+    stale = [value for value in stale if value not in seen]
+    if not stale:
+        return 0
+    return collection.delete_many({key: {"$in": stale}}).deleted_count
+
+
+# ============================================================
+#  STAGING AND SWITCHING
+# ============================================================
+
+
+def stage(db, name, live, staging, path, key, batch_size, workers):
+    """
+    Builds ``staging`` from the ``live`` collection plus the source file.
+    Returns [total, inserted, updated, unchanged, removed] counts.
+    """
+    db.drop_collection(staging)
+    if live in db.list_collection_names():
+        db[live].aggregate([{"$match": {}}, {"$out": staging}])
+    collection = db[staging]
+    if INDEXES[name]:
+        collection.create_indexes(INDEXES[name])
+
+    counts, seen = import_file(collection, path, key, batch_size, workers)
+    counts.append(remove_stale(collection, key, seen))
+    return counts
+
+
+def validate(db, name, staging, key, expected):
+    """Problems that keep ``staging`` from going live (empty list if none)"""
+    collection = db[staging]
+    problems = []
+    if expected == 0:
+        problems.append("source file has no documents")
+    count = collection.count_documents({})
+    if count != expected:
+        # Duplicate keys in the source collapse into one document
+        problems.append(f"{count} documents, expected {expected}")
+    if collection.count_documents({key: None}):
+        problems.append(f"documents without {key}")
+    indexes = collection.index_information()
+    for model in INDEXES[name]:
+        if model.document["name"] not in indexes:
+            problems.append(f"missing index {model.document['name']}")
+    return problems
+
+
+def retire(current, collections, now):
+    """Physical collection -> when it stopped being live, for every
+    collection an earlier version used that is still within RETIRE_AFTER,
+    plus the ones ``collections`` replaces"""
+    if current is None:
+        return {}
+    retired = {
+        physical: when
+        for physical, when in current.get("retired", {}).items()
+        if now - _as_utc(when) < RETIRE_AFTER
+    }
+    for name, physical in current["collections"].items():
+        if collections.get(name) != physical:
+            retired[physical] = now
+    return retired
+
+
+def _as_utc(when):
+    # pymongo hands datetimes back naive (in UTC) unless the client is tz_aware
+    return when if when.tzinfo else when.replace(tzinfo=timezone.utc)
+
+
+def switch(db, current, version, collections, digests, retired, now):
+    """Points the catalog alias at ``collections`` in one write"""
+    doc = {
+        "_id": CATALOG_ALIAS_ID,
+        "version": version,
+        "collections": collections,
+        # Content digests (catalog_hash.digest) the API compares with the
+        # catalog snapshot's, so it never serves courses of another version
+        "digests": digests,
+        # Replaced collections some request may still read (see retire())
+        "retired": retired,
+        "switched_at": now,
+    }
+    aliases = db[ALIAS_COLLECTION]
+    if current is None:
+        # Fails with DuplicateKeyError if another import switched first
+        aliases.insert_one(doc)
+        return
+    result = aliases.replace_one(
+        {"_id": CATALOG_ALIAS_ID, "version": current["version"]}, doc
+    )
+    if result.matched_count == 0:
+        raise RuntimeError("Another import switched the catalog first; aborting")
+
+
+def record_digests(db, current, digests):
+    """Adds digests to an alias written before they were recorded"""
+    if current is None or current.get("digests") == digests:
+        return
+    db[ALIAS_COLLECTION].update_one(
+        {"_id": CATALOG_ALIAS_ID, "version": current["version"]},
+        {"$set": {"digests": digests}},
+    )
+    print(f"Recorded content digests for version {current['version']}.")
+
+
+def drop_old_versions(db, keep):
+    """Drops catalog collections (any version) not in ``keep``"""
+    dropped = []
+    for physical in db.list_collection_names():
+        if physical.split("__v")[0] in COLLECTIONS and physical not in keep:
+            db.drop_collection(physical)
+            dropped.append(physical)
+    return dropped
+
+
+def report(label, counts):
+    total, inserted, updated, unchanged, removed = counts
+    print(
+        f"{label}: {total} documents, {inserted} inserted, "
+        f"{updated} updated, {unchanged} unchanged, {removed} removed"
+    )
+
+
+# ============================================================
+#  MAIN
+# ============================================================
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import the catalog into MongoDB")
+    # Pass a directory (e.g. a data/synthetic/<n>/ catalog), or a file in it,
+    # to import something else
+    parser.add_argument("path", nargs="?", default=PROCESSED_DIR)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument(
+        "--workers", type=int, default=WORKERS, help="batches written concurrently"
+    )
+    args = parser.parse_args()
+    data_dir = args.path if os.path.isdir(args.path) else os.path.dirname(args.path)
+
+    if ijson is None:
+        print("ijson not installed; loading whole files with json.load.")
+
+    client = connect()
+    db = client[DB_NAME]
+    print(f"Connected to MongoDB. DB='{DB_NAME}'.")
+
+    current = db[ALIAS_COLLECTION].find_one({"_id": CATALOG_ALIAS_ID})
+    live = current["collections"] if current else {}
+    version = current["version"] + 1 if current else 1
+    print(f"Staging catalog version {version}.")
+
+    collections = {}
+    digests = {}
+    failed = False
+    for name, (filename, key) in COLLECTIONS.items():
+        path = os.path.join(data_dir, filename)
+        live_name = live.get(name, name)
+        if not os.path.exists(path):
+            if name not in OPTIONAL:
+                sys.exit(f"Missing {path}")
+            print(f"{name}: no {filename}; keeping '{live_name}'")
+            collections[name] = live_name
+            digests[name] = digest(stored_hashes(db[live_name], key))
+            continue
 
-db = client[DB_NAME]
-collection = db["courses"]
+        total, changed, removed, digests[name] = pending_changes(
+            db[live_name], path, key
+        )
+        if (
+            not changed
+            and not removed
+            and not validate(db, name, live_name, key, total)
+        ):
+            print(f"{name}: {total} documents, unchanged; keeping '{live_name}'")
+            collections[name] = live_name
+            continue
 
-print(f"Connected to MongoDB. DB='{DB_NAME}', collection='courses'.")
+        staging = f"{name}__v{version}"
+        counts = stage(
+            db, name, live_name, staging, path, key, args.batch_size, args.workers
+        )
+        report(name, counts)
+        problems = validate(db, name, staging, key, counts[0])
+        for problem in problems:
+            print(f"  {name}: {problem}")
+        failed = failed or bool(problems)
+        collections[name] = staging
 
-operations = []
+    if failed:
+        sys.exit("Validation failed; the live catalog was not changed.")
+    if all(collections[name] == live.get(name, name) for name in COLLECTIONS):
+        print(f"Catalog unchanged; staying on version {version - 1 or 'unversioned'}.")
+        record_digests(db, current, digests)
+        sys.exit(0)
 
-for course_id, course_data in courses.items():
-    course_data["_id"] = course_id
-    operations.append(UpdateOne({"_id": course_id}, {"$set": course_data}, upsert=True))
+    now = datetime.now(timezone.utc)
+    retired = retire(current, collections, now)
+    switch(db, current, version, collections, digests, retired, now)
+    print(f"Catalog switched to version {version}.")
 
-if operations:
-    result = collection.bulk_write(operations)
-    print("Inserted:", result.upserted_count)
-    print("Updated:", result.modified_count)
+    # Requests that started before a recent switch may still read what it
+    # replaced
+    keep = set(collections.values()) | set(retired)
+    for physical in drop_old_versions(db, keep):
+        print(f"Dropped {physical}")
 
-print("Import complete.")
+    print("Import complete.")
@@ -1,7 +1,37 @@
+"""
+Tags every course with skills and generates career pathways using OpenAI.
+
+Skill tagging runs concurrently through tagging_runner.py, with
+token-budgeted batches and an AIMD concurrency limit that backs off on 429s.
+tagged_courses.json is written once at the end.
+
+Every answer goes into an append-only, content-addressed cache
+(llm_cache.jsonl). Skills are cached per course, keyed by a hash of the
+model, the tagging prompt and the course's content. A rerun (or a resumed,
+interrupted run) only calls the API for new or changed courses, and the
+pathway prompt is only re-sent if its input changed. --offline runs from
+the cache alone: a changed course keeps the skills it was last tagged with,
+flagged "stale", so it isn't dropped from the catalog.
+
+Set OPENAI_BASE_URL to run against another endpoint, e.g. the local stub in
+stub_openai_server.py.
+"""
+
+import argparse
+import asyncio
+import hashlib
 import json
 import time
 import os
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI, RateLimitError
+from tagging_runner import (
+    AIMDLimiter,
+    Checkpoint,
+    RateLimited,
+    estimate_tokens,
+    plan_batches,
+    run_batches,
+)
 
 # ============================================================
 #  PATHS
@@ -11,19 +41,50 @@ from openai import OpenAI
 DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 PROCESSED_DIR = os.path.join(DATA_DIR, "processed")
 
+COURSES_PATH = os.path.join(PROCESSED_DIR, "uiuc_courses_final.json")
+TAGGED_FILE = "tagged_courses.json"
+CACHE_FILE = "llm_cache.jsonl"
+CAREER_PATHS_FILE = "career_pathways.json"
+
 # ============================================================
 #  OPENAI API CONFIGURATION
 # ============================================================
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-client = OpenAI(api_key=OPENAI_API_KEY)
+MODEL = "gpt-4o-mini"
+SYSTEM_PROMPT = "You are an expert academic analyst. Always return valid JSON only."
+
+# Clients are created in main, so importing this module needs no API key
+client = None
+async_client = None
+# Response cache (a Checkpoint keyed by content hash) and offline mode, set in main
+cache = None
+offline = False
+
+# Skill tagging batches: prompt plus expected answer must fit TOKEN_BUDGET
+TOKEN_BUDGET = 6000
+MAX_BATCH_COURSES = 40
+# Rough answer size per course: {"course_id": ..., "skills": [3-8 short skills]}
+COMPLETION_TOKENS_PER_COURSE = 40
+# Fields the model needs to infer skills; instructors, terms etc. only cost tokens
+PROMPT_FIELDS = ("course_id", "title", "description")
+
+INITIAL_CONCURRENCY = 4
+MAX_CONCURRENCY = 32
 
 # ============================================================
 #  OPENAI API CALL
 # ============================================================
 
 
-def call_openai(prompt, model="gpt-4o-mini", retries=3, backoff=2.0):
+def chat_messages(prompt):
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def call_openai(prompt, model=MODEL, retries=3, backoff=2.0):
     """
     Calls OpenAI API with robust error handling.
     gpt-4o-mini is cheap and fast (~$0.15 per 1M input tokens)
@@ -34,13 +95,7 @@ def call_openai(prompt, model="gpt-4o-mini", retries=3, backoff=2.0):
         try:
             response = client.chat.completions.create(
                 model=model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert academic analyst. Always return valid JSON only.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
+                messages=chat_messages(prompt),
                 temperature=0.3,
                 response_format={"type": "json_object"},  # Force JSON output
             )
@@ -74,6 +129,34 @@ def call_openai(prompt, model="gpt-4o-mini", retries=3, backoff=2.0):
     raise RuntimeError(f"OpenAI call failed after {retries} attempts: {last_err}")
 
 
+def retry_after_seconds(error):
+    value = error.response.headers.get("retry-after") if error.response else None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+async def call_openai_async(prompt, model=MODEL):
+    """
+    One chat completion without retries: tagging_runner retries, and needs
+    to see 429s (raised as RateLimited) to adjust its concurrency
+    """
+    try:
+        response = await async_client.chat.completions.create(
+            model=model,
+            messages=chat_messages(prompt),
+            temperature=0.3,
+            response_format={"type": "json_object"},
+        )
+    except RateLimitError as e:
+        raise RateLimited(retry_after_seconds(e))
+
+    if not response.choices or not response.choices[0].message.content:
+        raise RuntimeError("Empty response")
+    return response.choices[0].message.content.strip()
+
+
 def extract_json(response):
     """Safely extract and parse JSON"""
     response = response.strip()
@@ -100,14 +183,50 @@ def extract_json(response):
         )
 
 
+# ============================================================
+#  RESPONSE CACHE
+# ============================================================
+
+
+class CacheMiss(Exception):
+    """Offline, and the answer isn't in the cache"""
+
+
+def cache_key(*parts):
+    """sha256 over ``parts``: any change to model, prompt or content misses"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def call_openai_cached(prompt, model=MODEL):
+    """Parsed JSON answer to ``prompt``, from the cache when possible"""
+    key = cache_key(model, SYSTEM_PROMPT, prompt)
+    entry = cache.load().get(key)
+    if entry is not None:
+        return entry["data"]
+    if offline:
+        raise CacheMiss("Offline and not in the cache")
+
+    # Cached only once it parses, so a bad answer is asked for again next time
+    data = extract_json(call_openai(prompt, model))
+    cache.append([{"key": key, "data": data}])
+    return data
+
+
 # ============================================================
 #  1. TAG COURSES with SKILLS
 # ============================================================
 
 
-def infer_skills(courses):
-    """Infer skills from course descriptions"""
-    prompt = f"""Analyze these courses and infer skills students learn.
+def prompt_course(course):
+    return {field: course.get(field) for field in PROMPT_FIELDS}
+
+
+def skills_prompt(courses):
+    return f"""Analyze these courses and infer skills students learn.
 
 Return a JSON object with a "courses" array:
 
@@ -124,11 +243,96 @@ Rules:
 - Return ONLY the JSON object
 
 Courses:
-{json.dumps(courses, indent=2)}"""
+{json.dumps([prompt_course(c) for c in courses], ensure_ascii=False)}"""
 
-    response = call_openai(prompt)
+
+def course_key(course, model=MODEL):
+    """Cache key of a course's skills: model, tagging prompt, course content"""
+    content = json.dumps(prompt_course(course), sort_keys=True, ensure_ascii=False)
+    return cache_key(model, SYSTEM_PROMPT, skills_prompt([]), content)
+
+
+def course_tokens(course):
+    """Estimated tokens a course adds to a tagging request, answer included"""
+    text = json.dumps(prompt_course(course), ensure_ascii=False)
+    return estimate_tokens(text) + COMPLETION_TOKENS_PER_COURSE
+
+
+async def infer_skills(courses):
+    """Infer skills from course descriptions; records carry each course's cache key"""
+    keys = {course["course_id"]: course["key"] for course in courses}
+    response = await call_openai_async(skills_prompt(courses))
     data = extract_json(response)
-    return data.get("courses", [])
+    return [
+        {
+            "key": keys[course["course_id"]],
+            "course_id": course["course_id"],
+            "skills": course.get("skills", []),
+        }
+        for course in data.get("courses", [])
+        if isinstance(course, dict) and course.get("course_id") in keys
+    ]
+
+
+def tag_courses(all_courses, tagged_path, token_budget, concurrency, max_concurrency):
+    """
+    Tags the courses whose current content isn't cached yet (none when
+    offline); returns the tagged courses in catalog order
+    """
+    keys = {c["course_id"]: course_key(c) for c in all_courses}
+
+    previous = []
+    if os.path.exists(tagged_path):
+        with open(tagged_path, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+
+    # Results from before the cache existed are taken to match today's content
+    if not cache.exists() and previous:
+        cache.append(
+            {"key": keys[t["course_id"]], **t}
+            for t in previous
+            if t.get("course_id") in keys
+        )
+
+    entries = cache.load()
+    todo = [
+        {**c, "key": keys[c["course_id"]]}
+        for c in all_courses
+        if keys[c["course_id"]] not in entries
+    ]
+
+    print(f"\nProcessing {len(all_courses)} courses")
+    print(f"   {len(all_courses) - len(todo)} cached, {len(todo)} new or changed")
+    if todo and offline:
+        print("   Offline: keeping their last known skills, flagged stale")
+    elif todo:
+        budget = token_budget - estimate_tokens(skills_prompt([]))
+        batches = plan_batches(todo, course_tokens, budget, MAX_BATCH_COURSES)
+        print(
+            f"   {len(batches)} batches to OpenAI {MODEL}, "
+            f"{concurrency}-{max_concurrency} requests at once\n"
+        )
+        limiter = AIMDLimiter(concurrency, max_concurrency)
+        stats = asyncio.run(run_batches(batches, infer_skills, cache, limiter))
+        print(f"\n✅ {stats.summary(limiter)}")
+
+    entries = cache.load()
+    # Last skills each course was tagged with, whatever its content was then
+    # (tagged_courses.json, then the cache, later entries winning)
+    last_known = {t["course_id"]: t["skills"] for t in previous if "skills" in t}
+    for entry in entries.values():
+        if "course_id" in entry:
+            last_known[entry["course_id"]] = entry["skills"]
+
+    tagged = []
+    for course_id, key in keys.items():
+        if key in entries:
+            tagged.append({"course_id": course_id, "skills": entries[key]["skills"]})
+        elif offline and course_id in last_known:
+            tagged.append(
+                {"course_id": course_id, "skills": last_known[course_id], "stale": True}
+            )
+    return tagged
 
 
 # ============================================================
@@ -170,8 +374,7 @@ Rules:
 Courses:
 {json.dumps(sample, indent=2)}"""
 
-    response = call_openai(prompt)
-    data = extract_json(response)
+    data = call_openai_cached(prompt)
     return data.get("pathways", [])
 
 
@@ -179,126 +382,113 @@ Courses:
 #  3. LOAD COURSES
 # ============================================================
 
-print("📂 Loading courses...")
 
-COURSES_PATH = os.path.join(PROCESSED_DIR, "uiuc_courses_final.json")
-with open(COURSES_PATH, "r", encoding="utf-8") as f:
-    all_courses = json.load(f)
-
-# Normalize to list
-if isinstance(all_courses, dict):
-    flattened = []
-    if all(
-        isinstance(v, dict) and all(isinstance(c, dict) for c in v.values())
-        for v in all_courses.values()
-    ):
-        for dept_courses in all_courses.values():
-            for course in dept_courses.values():
-                flattened.append(course)
-    elif all(isinstance(v, dict) and v.get("course_id") for v in all_courses.values()):
-        flattened = list(all_courses.values())
-    else:
-        flattened = [all_courses]
-    all_courses = flattened
+def load_courses(path):
+    with open(path, "r", encoding="utf-8") as f:
+        all_courses = json.load(f)
+
+    # Normalize to list
+    if isinstance(all_courses, dict):
+        flattened = []
+        if all(
+            isinstance(v, dict) and all(isinstance(c, dict) for c in v.values())
+            for v in all_courses.values()
+        ):
+            for dept_courses in all_courses.values():
+                for course in dept_courses.values():
+                    flattened.append(course)
+        elif all(
+            isinstance(v, dict) and v.get("course_id") for v in all_courses.values()
+        ):
+            flattened = list(all_courses.values())
+        else:
+            flattened = [all_courses]
+        all_courses = flattened
+    return all_courses
 
 
 # ============================================================
-#  4. BATCH PROCESS
+#  4. RUN
 # ============================================================
 
-BATCH_SIZE = 20
-chunks = [
-    all_courses[i : i + BATCH_SIZE] for i in range(0, len(all_courses), BATCH_SIZE)
-]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tag courses and generate pathways")
+    parser.add_argument("--input", default=COURSES_PATH)
+    parser.add_argument("--output-dir", default=PROCESSED_DIR)
+    parser.add_argument("--token-budget", type=int, default=TOKEN_BUDGET)
+    parser.add_argument("--concurrency", type=int, default=INITIAL_CONCURRENCY)
+    parser.add_argument("--max-concurrency", type=int, default=MAX_CONCURRENCY)
+    parser.add_argument(
+        "--cache", help=f"response cache (default: <output-dir>/{CACHE_FILE})"
+    )
+    parser.add_argument(
+        "--offline", action="store_true", help="use cached answers only, no API calls"
+    )
+    parser.add_argument(
+        "--fresh", action="store_true", help="clear the cache and retag everything"
+    )
+    args = parser.parse_args()
+    if args.fresh and args.offline:
+        parser.error("--fresh and --offline exclude each other")
+
+    offline = args.offline
+    if not offline:
+        client = OpenAI(api_key=OPENAI_API_KEY)
+        async_client = AsyncOpenAI(api_key=OPENAI_API_KEY, max_retries=0)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    tagged_path = os.path.join(args.output_dir, TAGGED_FILE)
+    career_paths_path = os.path.join(args.output_dir, CAREER_PATHS_FILE)
+    cache = Checkpoint(args.cache or os.path.join(args.output_dir, CACHE_FILE), "key")
+    if args.fresh:
+        cache.reset()
+        if os.path.exists(tagged_path):
+            os.remove(tagged_path)
+
+    print("📂 Loading courses...")
+    all_courses = load_courses(args.input)
+
+    tagged_courses = tag_courses(
+        all_courses,
+        tagged_path,
+        args.token_budget,
+        args.concurrency,
+        args.max_concurrency,
+    )
+
+    # Save final results
+    with open(tagged_path, "w", encoding="utf-8") as f:
+        json.dump(tagged_courses, f, indent=2)
+    stale = sum(1 for t in tagged_courses if t.get("stale"))
+    print(
+        f"   Tagged {len(tagged_courses)}/{len(all_courses)} courses"
+        + (f" ({stale} stale)" if stale else "")
+        + "\n"
+    )
+
+    print(" Generating career pathways...\n")
 
-TAGGED_PATH = os.path.join(PROCESSED_DIR, "tagged_courses.json")
-CAREER_PATHS_PATH = os.path.join(PROCESSED_DIR, "career_pathways.json")
-
-tagged_courses = []
-
-# Try to load existing progress
-if os.path.exists(TAGGED_PATH):
     try:
-        with open(TAGGED_PATH, "r", encoding="utf-8") as f:
-            tagged_courses = json.load(f)
-        print(f"📂 Loaded {len(tagged_courses)} previously tagged courses")
-        start_batch = len(tagged_courses) // BATCH_SIZE
-    except:
-        start_batch = 0
-else:
-    start_batch = 0
-
-print(f"\nProcessing {len(all_courses)} courses ({len(chunks)} batches)")
-print(f"   Starting from batch {start_batch + 1}")
-print(f"   Using OpenAI gpt-4o-mini (estimated cost: $0.70)\n")
-
-successful_batches = 0
-failed_batches = 0
-start_time = time.time()
-
-for idx, chunk in enumerate(chunks, start=1):
-    if idx <= start_batch:
-        continue
+        career_paths = generate_career_pathways(tagged_courses)
+        print(f" Generated {len(career_paths)} pathways\n")
 
-    try:
-        print(
-            f"  Batch {idx}/{len(chunks)} ({len(chunk)} courses)...",
-            end=" ",
-            flush=True,
-        )
-        result = infer_skills(chunk)
-        tagged_courses.extend(result)
-        successful_batches += 1
-        print(f" ({len(result)} tagged)")
+        with open(career_paths_path, "w", encoding="utf-8") as f:
+            json.dump(career_paths, f, indent=2)
 
-        # Save progress
-        with open(TAGGED_PATH, "w", encoding="utf-8") as f:
-            json.dump(tagged_courses, f, indent=2)
+        print("Career Pathways Created:")
+        for i, path in enumerate(career_paths, 1):
+            print(f"  {i}. {path['name']}")
+            print(f"     - {len(path.get('core_courses', []))} core courses")
+            print(f"     - {len(path.get('recommended_courses', []))} recommended")
+            print(f"     - {len(path.get('optional_courses', []))} optional\n")
 
-        # Show progress every 10 batches
-        if idx % 10 == 0:
-            elapsed = time.time() - start_time
-            avg_time = elapsed / (idx - start_batch)
-            remaining = (len(chunks) - idx) * avg_time
-            print(f" Progress: {idx}/{len(chunks)} | ETA: {remaining/60:.1f} min")
+        print(f"💾 Saved to '{career_paths_path}'\n")
 
-        time.sleep(0.5)  # Light rate limiting
+    except CacheMiss as e:
+        print(f" {e}; keeping the existing '{career_paths_path}'\n")
 
     except Exception as e:
-        failed_batches += 1
-        print(f"✗ Error: {str(e)[:200]}")
-        print(f"    Skipping batch {idx}...")
-        time.sleep(2)
-        continue
-
-total_time = time.time() - start_time
-print(f"\n✅ Tagged {len(tagged_courses)} courses in {total_time/60:.1f} minutes")
-print(f"   Success: {successful_batches} batches | Failed: {failed_batches} batches\n")
-
-# Save final results
-with open(TAGGED_PATH, "w", encoding="utf-8") as f:
-    json.dump(tagged_courses, f, indent=2)
-
-print(" Generating career pathways...\n")
-
-try:
-    career_paths = generate_career_pathways(tagged_courses)
-    print(f" Generated {len(career_paths)} pathways\n")
-
-    with open(CAREER_PATHS_PATH, "w", encoding="utf-8") as f:
-        json.dump(career_paths, f, indent=2)
-
-    print("Career Pathways Created:")
-    for i, path in enumerate(career_paths, 1):
-        print(f"  {i}. {path['name']}")
-        print(f"     - {len(path.get('core_courses', []))} core courses")
-        print(f"     - {len(path.get('recommended_courses', []))} recommended")
-        print(f"     - {len(path.get('optional_courses', []))} optional\n")
-
-    print(f"💾 Saved to '{CAREER_PATHS_PATH}'\n")
-
-except Exception as e:
-    print(f" Error generating pathways: {str(e)[:500]}")
-    raise
+        print(f" Error generating pathways: {str(e)[:500]}")
+        raise
 
-print(" Done! Check the processed folder for results.")
+    print(" Done! Check the processed folder for results.")
@@ -0,0 +1,320 @@
+import argparse
+import json
+import os
+import random
+import string
+import time
+
+# Resolve paths
+DB_SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.dirname(DB_SCRIPTS_DIR)
+SYNTHETIC_DIR = os.path.join(DATA_DIR, "synthetic")
+
+# Today's catalog size (data/processed/uiuc_courses_flatten.json)
+BASE_COURSE_COUNT = 963
+
+# Output names mirror data/processed so importers and benchmarks can point
+# at a synthetic directory unchanged
+COURSES_FILE = "uiuc_courses_flatten.json"
+TAGGED_FILE = "tagged_courses.json"
+CAREER_PATHS_FILE = "career_pathways.json"
+
+# ============================================================
+#  VOCABULARY
+# ============================================================
+
+REAL_DEPARTMENTS = [
+    "CS", "IS", "STAT", "ECE", "MATH", "BADM", "RHET", "CMN", "HIST", "PHIL",
+    "ACCY", "AE", "ANTH", "ARCH", "ART", "ASTR", "BIOE", "CEE", "CHEM", "CLCV",
+    "ECON", "EDUC", "ENG", "ENGL", "FIN", "GEOG", "GEOL", "IE", "LING", "MCB",
+    "ME", "MSE", "MUS", "NPRE", "PHYS", "PSYC", "SOC", "SPAN", "TAM", "TE",
+]  # fmt: skip
+
+TITLE_SUBJECTS = [
+    "Algorithms", "Systems", "Analysis", "Design", "Theory", "Methods", "Data",
+    "Networks", "Computation", "Modeling", "Optimization", "Statistics", "Ethics",
+    "Communication", "History", "Structures", "Mechanics", "Dynamics", "Security",
+    "Learning", "Markets", "Policy", "Culture", "Language", "Signals", "Materials",
+]  # fmt: skip
+TITLE_QUALIFIERS = [
+    "Introduction to", "Advanced", "Applied", "Principles of", "Topics in",
+    "Foundations of", "Seminar in", "Computational", "Quantitative", "Modern",
+]  # fmt: skip
+
+SKILLS = [
+    "programming", "algorithms", "data structures", "python", "java", "c++",
+    "statistics", "probability", "linear algebra", "calculus", "machine learning",
+    "deep learning", "databases", "sql", "networking", "operating systems",
+    "security", "cryptography", "web development", "distributed systems",
+    "cloud computing", "data analysis", "visualization", "optimization",
+    "signal processing", "circuits", "embedded systems", "writing", "research",
+    "critical thinking", "public speaking", "economics", "finance", "accounting",
+    "project management", "leadership", "ethics", "modeling", "simulation",
+    "numerical methods", "discrete math", "compilers", "graphics", "hci",
+]  # fmt: skip
+
+CAREERS = [
+    "Software Engineer", "Data Scientist", "Machine Learning Engineer",
+    "Systems Engineer", "Security Analyst", "Web Developer", "Quant Analyst",
+    "Product Manager", "Research Scientist", "Hardware Engineer",
+    "Business Analyst", "Technical Writer", "Cloud Architect", "Data Engineer",
+]  # fmt: skip
+
+SEMESTERS = ["spring", "summer", "fall"]
+
+
+# ============================================================
+#  GENERATORS
+# ============================================================
+
+
+def make_departments(count, rng):
+    """Real department codes first, then unique synthetic 2-4 letter codes"""
+    departments = list(REAL_DEPARTMENTS[:count])
+    seen = set(departments)
+    while len(departments) < count:
+        code = "".join(rng.choices(string.ascii_uppercase, k=rng.randint(2, 4)))
+        if code not in seen:
+            seen.add(code)
+            departments.append(code)
+    return departments
+
+
+def make_instructors(count, rng):
+    """Instructor names in the course data's 'Last, F' format"""
+    names = set()
+    while len(names) < count:
+        last = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+        first = rng.choice(string.ascii_uppercase)
+        if rng.random() < 0.1:
+            # Hyphenated surnames exist in the real data and trip exact matching
+            last += "-" + "".join(rng.choices(string.ascii_lowercase, k=4))
+        names.add(f"{last.capitalize()}, {first}")
+    return sorted(names)
+
+
+def make_prerequisites(candidates, rng):
+    """Build a prerequisite in the shape scrapers/prereq_parser.py emits"""
+    roll = rng.random()
+    if roll < 0.05:
+        text = "Consent of instructor"
+        return {"type": "CONDITION", "text": text}, text
+    if roll < 0.45 or len(candidates) < 2:
+        course = rng.choice(candidates)
+        return {"type": "SINGLE", "course": course}, course
+    picked = rng.sample(candidates, k=min(len(candidates), rng.randint(2, 4)))
+    if roll < 0.8:
+        return {"type": "OR", "courses": picked}, "One of " + ", ".join(picked)
+    return {"type": "AND", "courses": picked}, " and ".join(picked)
+
+
+def make_instructor_block(names, rng):
+    block = {}
+    for name in names:
+        has_rmp = rng.random() < 0.6
+        has_gpa = rng.random() < 0.7
+        block[name] = {
+            "rating": round(rng.uniform(1.5, 5.0), 1) if has_rmp else None,
+            "difficulty": round(rng.uniform(1.0, 5.0), 1) if has_rmp else None,
+            "avg_gpa": round(rng.uniform(2.3, 3.95), 2) if has_gpa else None,
+        }
+    return block
+
+
+def _mean(values):
+    values = [v for v in values if v is not None]
+    return round(sum(values) / len(values), 2) if values else None
+
+
+def generate_courses(
+    n_courses, n_departments, n_instructors, max_prereq_depth, prereq_rate, rng
+):
+    """
+    Generate a {course_id: course} mapping with the flatten.json schema
+
+    Courses are created in ascending number order per department, and
+    prerequisites are drawn only from already-created courses whose chain
+    depth is below ``max_prereq_depth``, so the result is a DAG with chains
+    up to that depth.
+    """
+    departments = make_departments(n_departments, rng)
+    instructors = make_instructors(n_instructors, rng)
+
+    # Each department draws staff from its own slice of the instructor pool
+    per_dept = max(4, n_instructors // n_departments * 2)
+    dept_staff = {
+        dept: rng.sample(instructors, k=min(per_dept, len(instructors)))
+        for dept in departments
+    }
+
+    # Spread courses over departments with a skew, like a real campus
+    weights = [1 / (i + 1) ** 0.5 for i in range(len(departments))]
+    dept_counts = dict.fromkeys(departments, 0)
+    for dept in rng.choices(departments, weights=weights, k=n_courses):
+        dept_counts[dept] += 1
+
+    courses = {}
+    depth = {}
+    eligible = []  # course_ids that can still be a prerequisite
+
+    for dept in departments:
+        count = dept_counts[dept]
+        if not count:
+            continue
+        numbers = sorted(rng.sample(range(100, 600), k=min(count, 500)))
+        # Departments larger than the 100-599 range get 4-digit course numbers
+        numbers += list(range(1000, 1000 + count - len(numbers)))
+
+        for number in numbers:
+            course_id = f"{dept} {number}"
+            prerequisites = None
+            prereq_text = ""
+            chain = 0
+
+            if eligible and number >= 200 and rng.random() < prereq_rate:
+                # Mostly same-department prerequisites, some cross-listed
+                local = [c for c in eligible[-40:] if c.startswith(dept + " ")]
+                pool = local if local and rng.random() < 0.8 else eligible[-400:]
+                prerequisites, prereq_text = make_prerequisites(pool, rng)
+                referenced = prerequisites.get("courses") or [
+                    prerequisites.get("course")
+                ]
+                chain = 1 + max((depth.get(c, 0) for c in referenced if c), default=0)
+
+            depth[course_id] = chain
+            if chain < max_prereq_depth:
+                eligible.append(course_id)
+
+            staff = dept_staff[dept]
+            block = make_instructor_block(
+                rng.sample(staff, k=min(len(staff), rng.randint(1, 8))), rng
+            )
+
+            if rng.random() < 0.3:
+                lo = rng.randint(1, 3)
+                credit_hours = [lo, lo + rng.randint(1, 3)]
+            else:
+                credit_hours = rng.choice([1, 2, 3, 3, 3, 4, 4])
+
+            title = f"{rng.choice(TITLE_QUALIFIERS)} {rng.choice(TITLE_SUBJECTS)}"
+            description = (
+                f"{title} for students in {dept}. "
+                f"Covers {', '.join(rng.sample(SKILLS, 3))}."
+            )
+            if prereq_text:
+                description += f" Prerequisite: {prereq_text}."
+
+            courses[course_id] = {
+                "course_id": course_id,
+                "department": dept,
+                "title": title,
+                "description": description,
+                "credit_hours": credit_hours,
+                "prerequisites": prerequisites,
+                "instructors": block,
+                "course_avg_rating": _mean(v["rating"] for v in block.values()),
+                "course_avg_difficulty": _mean(v["difficulty"] for v in block.values()),
+                "course_avg_gpa": _mean(v["avg_gpa"] for v in block.values()),
+                "semesters": sorted(
+                    rng.sample(SEMESTERS, k=rng.randint(1, 3)), key=SEMESTERS.index
+                ),
+                "gen_ed": rng.random() < 0.15,
+            }
+
+    return courses, max(depth.values(), default=0)
+
+
+def generate_tagged_courses(courses, rng):
+    return [
+        {"course_id": course_id, "skills": rng.sample(SKILLS, k=rng.randint(3, 8))}
+        for course_id in courses
+    ]
+
+
+def generate_career_paths(courses, n_paths, rng):
+    course_ids = list(courses)
+    paths = []
+    for i in range(n_paths):
+        base = CAREERS[i % len(CAREERS)]
+        name = base if i < len(CAREERS) else f"{base} {i // len(CAREERS) + 1}"
+        picked = rng.sample(course_ids, k=min(len(course_ids), 28))
+        paths.append(
+            {
+                "name": name,
+                "description": f"Synthetic pathway for {base.lower()} roles",
+                "required_skills": rng.sample(SKILLS, k=4),
+                "core_courses": picked[:15],
+                "recommended_courses": picked[15:25],
+                "optional_courses": picked[25:28],
+            }
+        )
+    return paths
+
+
+def write_json(path, payload):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+# ============================================================
+#  MAIN
+# ============================================================
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic university-scale course catalog"
+    )
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument("--courses", type=int, help="Number of courses")
+    size.add_argument(
+        "--scale",
+        type=float,
+        default=10,
+        help=f"Multiple of today's catalog ({BASE_COURSE_COUNT} courses)",
+    )
+    parser.add_argument("--departments", type=int, default=None)
+    parser.add_argument("--instructors", type=int, default=None)
+    parser.add_argument("--max-prereq-depth", type=int, default=8)
+    parser.add_argument("--prereq-rate", type=float, default=0.6)
+    parser.add_argument("--career-paths", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output-dir", default=None)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    n_courses = args.courses or int(BASE_COURSE_COUNT * args.scale)
+    n_departments = args.departments or max(10, min(200, n_courses // 250))
+    n_instructors = args.instructors or max(50, n_courses // 3)
+    n_paths = args.career_paths or max(8, min(200, n_courses // 1000))
+    output_dir = args.output_dir or os.path.join(SYNTHETIC_DIR, f"{n_courses}")
+
+    rng = random.Random(args.seed)
+    start = time.time()
+
+    courses, deepest = generate_courses(
+        n_courses,
+        n_departments,
+        n_instructors,
+        args.max_prereq_depth,
+        args.prereq_rate,
+        rng,
+    )
+    tagged = generate_tagged_courses(courses, rng)
+    paths = generate_career_paths(courses, n_paths, rng)
+
+    os.makedirs(output_dir, exist_ok=True)
+    write_json(os.path.join(output_dir, COURSES_FILE), courses)
+    write_json(os.path.join(output_dir, TAGGED_FILE), tagged)
+    write_json(os.path.join(output_dir, CAREER_PATHS_FILE), paths)
+
+    print(
+        f"Generated {len(courses)} courses across {n_departments} departments, "
+        f"{n_instructors} instructors, {len(paths)} career paths "
+        f"(deepest prerequisite chain: {deepest}) in {time.time() - start:.1f}s"
+    )
+    print(f"Saved synthetic catalog → {output_dir}")
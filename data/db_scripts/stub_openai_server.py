@@ -0,0 +1,178 @@
+"""
+Local stand-in for the OpenAI chat-completions endpoint, for running
+generate_pathways.py end to end without an API key or cost:
+
+    python data/db_scripts/stub_openai_server.py --port 8199 --capacity 6
+    OPENAI_BASE_URL=http://127.0.0.1:8199/v1 OPENAI_API_KEY=stub \\
+        python data/db_scripts/generate_pathways.py --output-dir /tmp/tagging
+
+Skill-tagging prompts get deterministic skills taken from each course's
+title; the career-pathway prompt gets fixed pathways over the courses it
+lists. Beyond --capacity concurrent requests the stub answers 429 with a
+Retry-After, like a rate-limited account, and --error-rate of the other
+requests fail with a 500.
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STOPWORDS = {"and", "for", "the", "with", "into", "from", "topics", "introduction"}
+PATHWAY_NAMES = [
+    "Software Engineer",
+    "Data Scientist",
+    "Machine Learning Engineer",
+    "Systems Engineer",
+    "Security Engineer",
+    "Web Developer",
+    "Quantitative Analyst",
+    "Research Scientist",
+]
+
+
+def tag(course):
+    words = re.findall(r"[a-z]+", (course.get("title") or "").lower())
+    skills = [w for w in words if len(w) > 3 and w not in STOPWORDS][:5]
+    return {"course_id": course["course_id"], "skills": skills or ["general studies"]}
+
+
+def pathways(courses):
+    result = []
+    for i, name in enumerate(PATHWAY_NAMES):
+        members = courses[i :: len(PATHWAY_NAMES)]
+        picks = [c["course_id"] for c in members]
+        skills = sorted({s for c in members for s in c.get("skills", [])})
+        result.append(
+            {
+                "name": name,
+                "description": f"Stub pathway for {name.lower()}s",
+                "required_skills": skills[:3],
+                "core_courses": picks[:8],
+                "recommended_courses": picks[8:13],
+                "optional_courses": picks[13:16],
+            }
+        )
+    return {"pathways": result}
+
+
+def answer(prompt):
+    _, _, listed = prompt.rpartition("Courses:\n")
+    courses = json.loads(listed)
+    if "career pathways" in prompt:
+        return pathways(courses)
+    return {"courses": [tag(c) for c in courses]}
+
+
+class StubState:
+    def __init__(self, capacity, latency, error_rate, seed):
+        self.capacity = capacity
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.counts = {"ok": 0, "throttled": 0, "errors": 0}
+
+    def count(self, outcome):
+        with self.lock:
+            self.counts[outcome] += 1
+            return self.counts[outcome]
+
+
+class Handler(BaseHTTPRequestHandler):
+    state: StubState = None
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, status, body, headers=()):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client gave up (timeout, or the run was interrupted)
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if not self.path.endswith("/chat/completions"):
+            self.send_json(404, {"error": {"message": "not found"}})
+            return
+
+        state = self.state
+        with state.lock:
+            throttled = state.in_flight >= state.capacity
+            failed = not throttled and state.random.random() < state.error_rate
+            if throttled:
+                state.counts["throttled"] += 1
+            else:
+                state.in_flight += 1
+        if throttled:
+            error = {"message": "Rate limit reached", "code": "rate_limit_exceeded"}
+            self.send_json(429, {"error": error}, [("Retry-After", "1")])
+            return
+
+        try:
+            time.sleep(state.latency)
+            if failed:
+                state.count("errors")
+                self.send_json(500, {"error": {"message": "stub server error"}})
+                return
+            content = json.dumps(answer(request["messages"][-1]["content"]))
+            self.send_json(
+                200,
+                {
+                    "id": f"chatcmpl-stub-{state.count('ok')}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": request.get("model"),
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": content},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": {
+                        "prompt_tokens": 0,
+                        "completion_tokens": 0,
+                        "total_tokens": 0,
+                    },
+                },
+            )
+        finally:
+            with state.lock:
+                state.in_flight -= 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stub OpenAI chat-completions server")
+    parser.add_argument("--port", type=int, default=8199)
+    parser.add_argument(
+        "--capacity", type=int, default=6, help="concurrent requests before 429s"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.3, help="seconds per request"
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    Handler.state = StubState(args.capacity, args.latency, args.error_rate, args.seed)
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), Handler)
+    print(f"Stub OpenAI server on http://127.0.0.1:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Served: {Handler.state.counts}")
@@ -0,0 +1,255 @@
+"""
+Runs batched LLM calls concurrently for generate_pathways.py.
+
+Items are packed into batches by estimated token count instead of a fixed
+size, so a batch of short course descriptions is as full as one of long
+ones and no request overflows the budget. Batches run as asyncio tasks
+behind an AIMD limiter: the number of requests in flight grows by about
+one per round of successful calls and halves on a 429 (at most once per
+round), and a Retry-After pauses every new request. Finished records are
+appended to a JSONL checkpoint as each batch completes, so a crashed or
+interrupted run resumes from the records already on disk.
+"""
+
+import asyncio
+import json
+import os
+import random
+import time
+
+# Exact token counts if tiktoken is installed, a characters/4 estimate if not
+try:
+    import tiktoken  # type: ignore
+except Exception:
+    tiktoken = None  # optional dependency
+
+CHARS_PER_TOKEN = 4
+
+_encoding = None
+
+
+def estimate_tokens(text):
+    global _encoding
+    if tiktoken is None:
+        return len(text) // CHARS_PER_TOKEN + 1
+    if _encoding is None:
+        _encoding = tiktoken.get_encoding("o200k_base")
+    return len(_encoding.encode(text))
+
+
+def plan_batches(items, cost, budget, max_items):
+    """
+    Splits ``items`` (in order) into batches whose summed ``cost(item)``
+    stays within ``budget`` and that hold at most ``max_items``. An item
+    costing more than the budget gets a batch of its own.
+    """
+    batches, batch, used = [], [], 0
+    for item in items:
+        item_cost = cost(item)
+        if batch and (used + item_cost > budget or len(batch) >= max_items):
+            batches.append(batch)
+            batch, used = [], 0
+        batch.append(item)
+        used += item_cost
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+# ============================================================
+#  CHECKPOINT
+# ============================================================
+
+
+class Checkpoint:
+    """Append-only JSONL file holding one finished record per line"""
+
+    def __init__(self, path, key):
+        self.path = path
+        self.key = key
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def load(self):
+        """key -> record; later lines win. A torn last line is cut off."""
+        records = {}
+        if not self.exists():
+            return records
+        with open(self.path, "rb") as f:
+            data = f.read()
+        complete = data.rfind(b"\n") + 1
+        if complete < len(data):
+            # Left by a crash mid-write; appending after it would corrupt
+            # the next record too
+            with open(self.path, "r+b") as f:
+                f.truncate(complete)
+        for line in data[:complete].splitlines():
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            records[record[self.key]] = record
+        return records
+
+    def append(self, records):
+        with open(self.path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def reset(self):
+        if self.exists():
+            os.remove(self.path)
+
+
+# ============================================================
+#  CONCURRENCY
+# ============================================================
+
+
+class RateLimited(Exception):
+    """Raised by a call that got a 429; retry_after in seconds, if sent"""
+
+    def __init__(self, retry_after=None):
+        super().__init__(f"rate limited (retry after {retry_after}s)")
+        self.retry_after = retry_after
+
+
+class AIMDLimiter:
+    """Concurrency limit with additive increase and multiplicative decrease"""
+
+    def __init__(self, initial, maximum, minimum=1):
+        self.limit = float(initial)
+        self.maximum = maximum
+        self.minimum = minimum
+        self.in_flight = 0
+        self.peak = 0
+        self.decreases = 0
+        self._last_decrease = 0.0
+        self._resume_at = 0.0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self):
+        """Waits for a slot (and any Retry-After pause); returns a start ticket"""
+        async with self._condition:
+            while self.in_flight >= int(self.limit):
+                await self._condition.wait()
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        while time.monotonic() < self._resume_at:
+            await asyncio.sleep(self._resume_at - time.monotonic())
+        return time.monotonic()
+
+    async def release(self, ticket, throttled=False, retry_after=None):
+        async with self._condition:
+            self.in_flight -= 1
+            if throttled:
+                # Requests started before the last decrease saw the old limit;
+                # their 429s are the same congestion signal, so count it once
+                if ticket >= self._last_decrease:
+                    self.limit = max(self.minimum, self.limit / 2)
+                    self._last_decrease = time.monotonic()
+                    self.decreases += 1
+                if retry_after:
+                    self._resume_at = max(
+                        self._resume_at, time.monotonic() + retry_after
+                    )
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+# ============================================================
+#  RUNNER
+# ============================================================
+
+
+class RunStats:
+    def __init__(self, batches):
+        self.batches = batches
+        self.done = 0
+        self.failed = 0
+        self.records = 0
+        self.calls = 0
+        self.throttled = 0
+        self.errors = 0
+        self.start = time.monotonic()
+
+    def summary(self, limiter):
+        return (
+            f"{self.done}/{self.batches} batches ({self.failed} failed), "
+            f"{self.records} records, {self.calls} calls, "
+            f"{self.throttled} throttled, {self.errors} errors, "
+            f"concurrency {limiter.limit:.1f} (peak {limiter.peak}) "
+            f"in {time.monotonic() - self.start:.1f}s"
+        )
+
+
+async def run_batches(
+    batches,
+    call,
+    checkpoint,
+    limiter,
+    retries=3,
+    throttle_retries=10,
+    backoff=2.0,
+    progress_every=10,
+):
+    """
+    Runs ``await call(batch)`` for every batch. ``call`` returns a list of
+    records (dicts carrying ``checkpoint.key``), or raises RateLimited on a
+    429 and anything else on failure. Records are checkpointed as they come
+    in; items of a batch missing from its response are retried along with
+    failed calls. Returns the RunStats.
+    """
+    key = checkpoint.key
+    stats = RunStats(len(batches))
+
+    async def run(batch):
+        pending = {item[key]: item for item in batch}
+        errors = throttles = 0
+        while pending:
+            ticket = await limiter.acquire()
+            stats.calls += 1
+            try:
+                records = await call(list(pending.values()))
+            except RateLimited as e:
+                await limiter.release(ticket, throttled=True, retry_after=e.retry_after)
+                stats.throttled += 1
+                throttles += 1
+                if throttles > throttle_retries:
+                    break
+                continue
+            except Exception as e:
+                await limiter.release(ticket)
+                stats.errors += 1
+                errors += 1
+                print(f"  ✗ batch of {len(pending)}: {str(e)[:200]}")
+                if errors > retries:
+                    break
+                await asyncio.sleep(
+                    backoff * 2 ** (errors - 1) * random.uniform(0.5, 1.5)
+                )
+                continue
+            await limiter.release(ticket)
+
+            records = [r for r in records if r.get(key) in pending]
+            checkpoint.append(records)
+            for record in records:
+                pending.pop(record[key], None)
+            stats.records += len(records)
+            if pending:
+                # The model skipped some items; ask again for just those
+                errors += 1
+                if errors > retries:
+                    break
+
+        if pending:
+            stats.failed += 1
+        else:
+            stats.done += 1
+        if (stats.done + stats.failed) % progress_every == 0:
+            print(f"  Progress: {stats.summary(limiter)}")
+
+    await asyncio.gather(*(run(batch) for batch in batches))
+    return stats
@@ -0,0 +1,499 @@
+"""
+Incremental runner for the data pipeline.
+
+Every script that turns raw data into processed data is declared below as a
+Stage with the files it reads and writes. Dependencies between stages follow
+from those paths (a stage depends on whichever stage writes one of its
+inputs), so the declarations form a DAG.
+
+A stage's fingerprint is the SHA-256 of its input files, its own source files
+and its command line. The fingerprint and the hashes of the outputs are kept
+in data/.pipeline/state.json after each successful run; a stage whose
+fingerprint is unchanged and whose outputs are still the files it wrote is
+skipped. Because inputs are compared by content rather than mtime, a stage
+that re-runs but produces byte-identical output does not wake up anything
+downstream. Stages whose dependencies are satisfied run in parallel
+subprocesses, each logging to data/.pipeline/logs/<stage>.log.
+
+Scraper stages hit the network, so they only run when their output is
+missing or when named with --refresh. A refreshed stage whose output exists
+also gets its refresh_args: the course scrapers start over with --fresh
+instead of re-compacting their finished checkpoint, and the RMP scraper
+re-fetches professors whose rating count changed (its own --refresh).
+
+    python data/pipeline.py                      # bring everything up to date
+    python data/pipeline.py --dry-run            # show what would run and why
+    python data/pipeline.py merge_v2 snapshot    # only these and their inputs
+    python data/pipeline.py --refresh scrape_rmp # re-fetch changed RMP ratings, rebuild
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_DIR = os.path.join(DATA_DIR, ".pipeline")
+STATE_FILE = os.path.join(STATE_DIR, "state.json")
+LOG_DIR = os.path.join(STATE_DIR, "logs")
+HASH_CHUNK_SIZE = 1 << 20
+
+
+class Stage:
+    """
+    name: identifier used on the command line and in the state file
+    script: path relative to data/, run with the current interpreter
+    inputs / outputs: paths (or input globs) relative to data/
+    code: extra modules the script imports, hashed along with the script
+    external: fetches from the network; only runs when outputs are missing
+        or when refreshed explicitly
+    refresh_args: extra arguments when named in --refresh and the outputs
+        exist; not part of the fingerprint
+    """
+
+    __slots__ = (
+        "name",
+        "script",
+        "inputs",
+        "outputs",
+        "code",
+        "args",
+        "external",
+        "refresh_args",
+    )
+
+    def __init__(
+        self,
+        name,
+        script,
+        inputs=(),
+        outputs=(),
+        code=(),
+        args=(),
+        external=False,
+        refresh_args=(),
+    ):
+        self.name = name
+        self.script = script
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.code = [script, *code]
+        self.args = list(args)
+        self.external = external
+        self.refresh_args = list(refresh_args)
+
+
+SCRAPER_CODE = ["scrapers/fetch_engine.py", "scrapers/http_cache.py"]
+COURSE_SCRAPER_CODE = [
+    *SCRAPER_CODE,
+    "scrapers/UIUC_Course_Scraper.py",
+    "scrapers/scrape_checkpoint.py",
+]
+
+# Raw grade CSVs, one per term (see GPA_FILES in scrapers/gpa_store.py)
+GPA_CSV_PATTERN = "raw/[a-z][a-z]20[0-9][0-9].csv"
+
+STAGES = [
+    Stage(
+        "scrape_courses",
+        "scrapers/UIUC_Course_Scraper.py",
+        outputs=["raw/uiuc_courses.json"],
+        code=COURSE_SCRAPER_CODE,
+        external=True,
+        refresh_args=["--fresh"],
+    ),
+    Stage(
+        "scrape_gened",
+        "scrapers/UIUC_Gened_Course_Scraper.py",
+        outputs=["raw/uiuc_gened_courses.json"],
+        code=COURSE_SCRAPER_CODE,
+        external=True,
+        refresh_args=["--fresh"],
+    ),
+    Stage(
+        "scrape_rmp",
+        "scrapers/Rating_Scraper.py",
+        outputs=["raw/uiuc_professor_ratings.json"],
+        code=SCRAPER_CODE,
+        external=True,
+        refresh_args=["--refresh"],
+    ),
+    Stage(
+        "gpa",
+        "scrapers/Courser_Gpa_Scraper.py",
+        inputs=[
+            "raw/uiuc_courses.json",
+            "raw/uiuc_gened_courses.json",
+            GPA_CSV_PATTERN,
+        ],
+        outputs=["raw/gpa_cleaned.csv", "raw/gpa_distributions.json"],
+        code=["scrapers/gpa_store.py"],
+    ),
+    Stage(
+        "merge_v1",
+        "scrapers/merge_allv1.py",
+        inputs=[
+            "raw/uiuc_courses.json",
+            "raw/uiuc_gened_courses.json",
+            "raw/uiuc_professor_ratings.json",
+            "raw/gpa_cleaned.csv",
+        ],
+        outputs=["processed/uiuc_courses_final.json"],
+        code=["scrapers/instructor_matching.py", "scrapers/merge_pool.py"],
+    ),
+    Stage(
+        "merge_v2",
+        "scrapers/merge_allv2.py",
+        inputs=[
+            "raw/uiuc_courses.json",
+            "raw/uiuc_gened_courses.json",
+            "raw/uiuc_professor_ratings.json",
+            "raw/gpa_distributions.json",
+        ],
+        outputs=[
+            "processed/uiuc_courses_flatten.json",
+            "processed/uiuc_course_grades.json",
+        ],
+        code=[
+            "scrapers/instructor_matching.py",
+            "scrapers/merge_pool.py",
+            "scrapers/prereq_parser.py",
+        ],
+    ),
+    Stage(
+        "pathways",
+        "db_scripts/generate_pathways.py",
+        inputs=["processed/uiuc_courses_final.json"],
+        outputs=["processed/tagged_courses.json", "processed/career_pathways.json"],
+        code=["db_scripts/tagging_runner.py"],
+    ),
+    Stage(
+        "snapshot",
+        "db_scripts/build_catalog_snapshot.py",
+        inputs=["processed/uiuc_courses_flatten.json"],
+        outputs=["processed/catalog.snap"],
+        code=["db_scripts/catalog_hash.py"],
+    ),
+    # Writes only to MongoDB; its fingerprint alone decides whether to re-import
+    Stage(
+        "db_import",
+        "db_scripts/db_import.py",
+        inputs=[
+            "processed/uiuc_courses_flatten.json",
+            "processed/uiuc_course_grades.json",
+            "processed/tagged_courses.json",
+            "processed/career_pathways.json",
+        ],
+        code=["db_scripts/catalog_hash.py"],
+    ),
+]
+STAGE_ORDER = [stage.name for stage in STAGES]
+
+
+# ============================================================
+#  FINGERPRINTS
+# ============================================================
+
+
+class FileHasher:
+    """
+    Content hashes of files under data/, memoized on (size, mtime_ns) across
+    runs so unchanged multi-megabyte inputs are not re-read every time.
+    """
+
+    def __init__(self, known=None):
+        self.known = dict(known or {})
+
+    def __call__(self, rel_path):
+        """Hex digest of data/<rel_path>, or None if the file does not exist"""
+        path = os.path.join(DATA_DIR, rel_path)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        cached = self.known.get(rel_path)
+        if (
+            cached
+            and cached["size"] == stat.st_size
+            and cached["mtime_ns"] == stat.st_mtime_ns
+        ):
+            return cached["sha256"]
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        self.known[rel_path] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": digest.hexdigest(),
+        }
+        return digest.hexdigest()
+
+
+def expand(patterns):
+    """Input paths with globs expanded, sorted, relative to data/"""
+    paths = set()
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = glob.glob(os.path.join(DATA_DIR, pattern))
+            paths.update(os.path.relpath(p, DATA_DIR) for p in matches)
+        else:
+            paths.add(pattern)
+    return sorted(paths)
+
+
+def fingerprint(stage, hasher):
+    """(fingerprint, missing input paths) of a stage's inputs, code and command"""
+    digest = hashlib.sha256(json.dumps(stage.args).encode())
+    missing = []
+    for path in expand(stage.inputs + stage.code):
+        file_hash = hasher(path)
+        if file_hash is None:
+            missing.append(path)
+        digest.update(f"{path}\0{file_hash}\0".encode())
+    return digest.hexdigest(), missing
+
+
+# ============================================================
+#  PLANNING
+# ============================================================
+
+
+def build_graph(stages):
+    """Stage name -> names of the stages producing its inputs"""
+    producers = {}
+    for stage in stages:
+        for path in stage.outputs:
+            if path in producers:
+                raise ValueError(
+                    f"{path} is written by {producers[path]} and {stage.name}"
+                )
+            producers[path] = stage.name
+    graph = {}
+    for stage in stages:
+        deps = {producers[p] for p in expand(stage.inputs) if p in producers}
+        graph[stage.name] = deps - {stage.name}
+
+    # Kahn's algorithm; anything left over sits on a cycle
+    indegree = {name: len(deps) for name, deps in graph.items()}
+    ready = [name for name, count in indegree.items() if count == 0]
+    seen = 0
+    while ready:
+        name = ready.pop()
+        seen += 1
+        for other, deps in graph.items():
+            if name in deps:
+                indegree[other] -= 1
+                if indegree[other] == 0:
+                    ready.append(other)
+    if seen != len(graph):
+        cyclic = sorted(name for name, count in indegree.items() if count)
+        raise ValueError(f"Dependency cycle between stages: {', '.join(cyclic)}")
+    return graph
+
+
+def upstream(graph, targets):
+    """Targets plus every stage they transitively depend on"""
+    selected = set()
+    pending = list(targets)
+    while pending:
+        name = pending.pop()
+        if name not in selected:
+            selected.add(name)
+            pending.extend(graph[name])
+    return selected
+
+
+def staleness(stage, record, hasher, refresh):
+    """
+    Why ``stage`` has to run, or None if it is up to date. Called only once
+    everything upstream has finished, so the input hashes are final.
+    """
+    if stage.name in refresh:
+        return "refresh requested"
+    outputs = {path: hasher(path) for path in stage.outputs}
+    missing_outputs = [path for path, file_hash in outputs.items() if file_hash is None]
+    if missing_outputs:
+        return f"missing {', '.join(missing_outputs)}"
+    if stage.external:
+        return None
+    if record is None:
+        return "never run"
+    key, _ = fingerprint(stage, hasher)
+    if key != record["fingerprint"]:
+        return "inputs changed"
+    if outputs != record["outputs"]:
+        return "outputs modified"
+    return None
+
+
+# ============================================================
+#  EXECUTION
+# ============================================================
+
+
+def run_stage(stage, refresh=False):
+    """
+    Runs one stage's script in its own directory, with its refresh_args if
+    ``refresh``; returns (exit code, seconds)
+    """
+    script = os.path.join(DATA_DIR, stage.script)
+    args = stage.args + (stage.refresh_args if refresh else [])
+    os.makedirs(LOG_DIR, exist_ok=True)
+    start = time.perf_counter()
+    with open(os.path.join(LOG_DIR, f"{stage.name}.log"), "w") as log:
+        result = subprocess.run(
+            [sys.executable, script, *args],
+            cwd=os.path.dirname(script),
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            env={**os.environ, "PYTHONUNBUFFERED": "1"},
+        )
+    return result.returncode, time.perf_counter() - start
+
+
+def load_state():
+    if not os.path.exists(STATE_FILE):
+        return {"files": {}, "stages": {}}
+    with open(STATE_FILE, "r") as f:
+        return json.load(f)
+
+
+def save_state(state):
+    os.makedirs(STATE_DIR, exist_ok=True)
+    tmp_path = f"{STATE_FILE}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, STATE_FILE)
+
+
+def run_pipeline(targets=None, refresh=(), jobs=4, dry_run=False):
+    """
+    Brings ``targets`` (default: every stage) up to date. Stages are decided
+    on as soon as their dependencies settle: up-to-date ones are skipped,
+    stale ones are submitted to a pool of ``jobs`` workers. A failed stage
+    blocks everything downstream of it. Returns True if nothing failed.
+    """
+    stages = {stage.name: stage for stage in STAGES}
+    graph = build_graph(STAGES)
+    unknown = sorted((set(targets or ()) | set(refresh)) - stages.keys())
+    if unknown:
+        raise SystemExit(f"Unknown stage(s): {', '.join(unknown)}")
+    selected = upstream(graph, targets or stages)
+    selected |= upstream(graph, refresh)
+
+    state = load_state()
+    hasher = FileHasher(state["files"])
+    done, failed, blocked, would_run = set(), set(), set(), set()
+    running = {}
+    summary = []
+
+    def settle(name, status, seconds=0.0):
+        summary.append((name, status, seconds))
+        (failed if status == "failed" else done).add(name)
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while True:
+            for name in [n for n in STAGE_ORDER if n in selected]:
+                if name in done or name in failed or name in blocked or name in running:
+                    continue
+                deps = graph[name] & selected
+                if deps & (failed | blocked):
+                    blocked.add(name)
+                    summary.append((name, "blocked", 0.0))
+                    continue
+                if not deps <= done:
+                    continue
+                stage = stages[name]
+                if dry_run and deps & would_run:
+                    reason = "upstream would run"
+                else:
+                    reason = staleness(
+                        stage, state["stages"].get(name), hasher, refresh
+                    )
+                if reason is None:
+                    print(f"[skip] {name}")
+                    settle(name, "up to date")
+                    continue
+                _, missing = fingerprint(stage, hasher)
+                if missing:
+                    print(f"[fail] {name}: missing input {', '.join(missing)}")
+                    settle(name, "failed")
+                    continue
+                print(f"[run ] {name} ({reason})")
+                if dry_run:
+                    # Assume it would succeed so the walk reaches downstream stages
+                    would_run.add(name)
+                    settle(name, "would run")
+                    continue
+                # Without outputs there is nothing to refresh from; a plain
+                # run builds them (RMP's --refresh needs its last output)
+                refreshing = name in refresh and all(
+                    hasher(path) is not None for path in stage.outputs
+                )
+                running[name] = pool.submit(run_stage, stage, refreshing)
+
+            if not running:
+                break
+            finished, _ = wait(running.values(), return_when=FIRST_COMPLETED)
+            for name in [n for n, future in running.items() if future in finished]:
+                code, seconds = running.pop(name).result()
+                stage = stages[name]
+                if code != 0:
+                    log_path = os.path.join(LOG_DIR, f"{name}.log")
+                    print(f"[fail] {name} exited with {code}; see {log_path}")
+                    settle(name, "failed", seconds)
+                    continue
+                print(f"[done] {name} in {seconds:.1f}s")
+                key, _ = fingerprint(stage, hasher)
+                state["stages"][name] = {
+                    "fingerprint": key,
+                    "outputs": {path: hasher(path) for path in stage.outputs},
+                    "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                }
+                settle(name, "ran", seconds)
+                # Persist after every stage so an interrupted run keeps its progress
+                state["files"] = hasher.known
+                save_state(state)
+
+    if not dry_run:
+        state["files"] = hasher.known
+        save_state(state)
+
+    print("\nSummary:")
+    for name, status, seconds in summary:
+        timing = f" ({seconds:.1f}s)" if seconds else ""
+        print(f"  {name:<16} {status}{timing}")
+    return not failed and not blocked
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run the data pipeline, skipping stages whose inputs are unchanged"
+    )
+    parser.add_argument(
+        "targets",
+        nargs="*",
+        help=f"Stages to bring up to date (default: all of {', '.join(STAGE_ORDER)})",
+    )
+    parser.add_argument(
+        "--refresh",
+        nargs="+",
+        default=[],
+        metavar="STAGE",
+        help="Run these stages even if up to date (e.g. re-scrape)",
+    )
+    parser.add_argument("--jobs", type=int, default=4, help="Stages run at once")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print what would run without running it",
+    )
+    args = parser.parse_args()
+    ok = run_pipeline(args.targets, args.refresh, args.jobs, args.dry_run)
+    sys.exit(0 if ok else 1)
@@ -2,18 +2,32 @@ import json
 import pandas as pd
 import os
 
+from gpa_store import (
+    GPA_FILES,
+    GRADE_COLUMNS,
+    PERCENTILES,
+    ensure_parquet,
+    read_term,
+    summarize_histograms,
+)
+
 # Point to the repo's data directory
 DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 RAW_DATA_DIR = os.path.join(DATA_DIR, "raw")
 COURSE_FILE = os.path.join(RAW_DATA_DIR, "uiuc_courses.json")
 GENED_FILE = os.path.join(RAW_DATA_DIR, "uiuc_gened_courses.json")
 OUTPUT_FILE = os.path.join(RAW_DATA_DIR, "gpa_cleaned.csv")
-
-GPA_FILES = {
-    "fall_2024": os.path.join(RAW_DATA_DIR, "fa2024.csv"),
-    "spring_2025": os.path.join(RAW_DATA_DIR, "sp2025.csv"),
-    "summer_2024": os.path.join(RAW_DATA_DIR, "su2024.csv"),
-}
+DISTRIBUTIONS_FILE = os.path.join(RAW_DATA_DIR, "gpa_distributions.json")
+GROUP_COLUMNS = ["course_id", "course_title", "primary_instructor"]
+READ_COLUMNS = [
+    "course_subject",
+    "course_number",
+    "course_title",
+    "primary_instructor",
+    "average_grade",
+    "term",
+    *GRADE_COLUMNS,
+]
 
 
 def load_json(path):
@@ -22,12 +36,6 @@ def load_json(path):
         return json.load(f)
 
 
-def normalize_columns(df):
-    """Normalize column names for consistency."""
-    df.columns = [col.lower().strip().replace(" ", "_") for col in df.columns]
-    return df
-
-
 def build_course_set(all_courses, gened_courses):
     """Combine course IDs from both JSONs."""
     valid_ids = set()
@@ -41,52 +49,156 @@ def build_course_set(all_courses, gened_courses):
     return valid_ids
 
 
-def filter_gpa(df, valid_ids):
-    """Filter GPA rows based on valid course IDs."""
-    df = normalize_columns(df)
-    df["course_subject"] = df["course_subject"].astype(str).str.upper().str.strip()
-    df["course_number"] = df["course_number"].astype(str).str.strip()
-    df["course_id"] = df["course_subject"] + " " + df["course_number"]
-    required_cols = [
-        "course_subject",
-        "course_number",
-        "course_title",
-        "primary_instructor",
-        "average_grade",
-        "course_id",
-    ]
-    df_filtered = df[df["course_id"].isin(valid_ids)][required_cols]
-    return df_filtered
-
-
-def merge_duplicate_instructors(df):
-    """Merge rows that have the same course and instructor."""
-    grouped = df.groupby(
-        ["course_id", "course_title", "primary_instructor"], as_index=False
-    ).agg({"average_grade": "mean"})
-    grouped["average_grade"] = grouped["average_grade"].round(2)
+def split_course_ids(valid_ids):
+    """{"CS 124", ...} -> MultiIndex of (subject, number) pairs"""
+    pairs = [cid.split(" ", 1) for cid in valid_ids if " " in cid]
+    return pd.MultiIndex.from_tuples(pairs, names=["course_subject", "course_number"])
+
+
+def filter_gpa(df, valid_pairs):
+    """Keep rows whose (subject, number) pair is a known course ID."""
+    keys = pd.MultiIndex.from_arrays([df["course_subject"], df["course_number"]])
+    df = df[keys.isin(valid_pairs)]
+    course_id = df["course_subject"].astype(str) + " " + df["course_number"].astype(str)
+    return df.assign(course_id=course_id)
+
+
+def summarize_term(df):
+    """Per (course, title, instructor): sum and count of section average grades"""
+    df = df.assign(
+        course_title=df["course_title"].astype(str),
+        primary_instructor=df["primary_instructor"]
+        .astype(str)
+        .where(df["primary_instructor"].notna()),
+    )
+    return df.groupby(GROUP_COLUMNS, as_index=False).agg(
+        grade_sum=("average_grade", "sum"), grade_count=("average_grade", "count")
+    )
+
+
+def merge_duplicate_instructors(partials):
+    """Merge per-term partial sums into one mean per course and instructor."""
+    grouped = (
+        pd.concat(partials, ignore_index=True)
+        .groupby(GROUP_COLUMNS, as_index=False)[["grade_sum", "grade_count"]]
+        .sum()
+    )
+    grouped["average_grade"] = (grouped["grade_sum"] / grouped["grade_count"]).round(2)
+    return grouped.drop(columns=["grade_sum", "grade_count"])
+
+
+def term_histograms(df, term):
+    """Per (course, instructor): summed grade counts and section count for one term"""
+    counts = df[GRADE_COLUMNS].fillna(0).astype("int64")
+    grouped = (
+        counts.assign(
+            course_id=df["course_id"],
+            primary_instructor=df["primary_instructor"].astype("string").fillna(""),
+            sections=1,
+        )
+        .groupby(["course_id", "primary_instructor"], as_index=False, sort=False)
+        .sum()
+    )
+    grouped["term"] = term
+    grouped["term_code"] = df["term"].min()
     return grouped
 
 
+def summary_records(frame):
+    """Row label -> compact histogram plus enrollment-weighted GPA and percentiles"""
+    histograms = frame[GRADE_COLUMNS].to_numpy()
+    students, withdrawals, gpa, percentiles = summarize_histograms(histograms)
+    records = {}
+    for i, key in enumerate(frame.index):
+        graded = students[i] > 0
+        records[key] = {
+            "histogram": histograms[i].tolist(),
+            "sections": int(frame["sections"].iat[i]),
+            "students": int(students[i]),
+            "withdrawals": int(withdrawals[i]),
+            "weighted_gpa": round(float(gpa[i]), 2) if graded else None,
+            "percentiles": percentiles[i].tolist() if graded else None,
+            "terms": {},
+        }
+    return records
+
+
+def build_distributions(histograms):
+    """
+    Rolls the per-term (course, instructor) histograms up to per-course and
+    per-instructor distributions, each with a chronological per-term series.
+    """
+    table = pd.concat(histograms, ignore_index=True).sort_values(
+        "term_code", kind="stable"
+    )
+    columns = GRADE_COLUMNS + ["sections"]
+    courses = summary_records(table.groupby("course_id")[columns].sum())
+    instructors = summary_records(
+        table[table["primary_instructor"] != ""]
+        .groupby(["course_id", "primary_instructor"])[columns]
+        .sum()
+    )
+
+    for (course_id, term), row in (
+        table.groupby(["course_id", "term"], sort=False)[GRADE_COLUMNS].sum().iterrows()
+    ):
+        courses[course_id]["terms"][term] = row.tolist()
+    for (course_id, name, term), row in (
+        table[table["primary_instructor"] != ""]
+        .groupby(["course_id", "primary_instructor", "term"], sort=False)[GRADE_COLUMNS]
+        .sum()
+        .iterrows()
+    ):
+        instructors[(course_id, name)]["terms"][term] = row.tolist()
+
+    for course in courses.values():
+        course["instructors"] = {}
+    for (course_id, name), record in instructors.items():
+        courses[course_id]["instructors"][name] = record
+    return courses
+
+
 if __name__ == "__main__":
 
     all_courses = load_json(COURSE_FILE)
     gened_courses = load_json(GENED_FILE)
     valid_course_ids = build_course_set(all_courses, gened_courses)
-    combined_list = []
-    for term, file_path in GPA_FILES.items():
-        df = pd.read_csv(file_path)
-        df_filtered = filter_gpa(df, valid_course_ids)
-        df_filtered["term"] = term
-        combined_list.append(df_filtered)
-
-    combined_df = pd.concat(combined_list, ignore_index=True)
-    print(f"\nRows BEFORE merging duplicates: {len(combined_df)}")
-    print(f"Unique course IDs found: {combined_df['course_id'].nunique()}")
-
-    merged_df = merge_duplicate_instructors(combined_df)
+    valid_pairs = split_course_ids(valid_course_ids)
+    subjects = set(valid_pairs.get_level_values("course_subject"))
+
+    # Only the needed columns of row groups holding a known subject are read,
+    # and each term is reduced to partial sums before the next one is loaded
+    ensure_parquet()
+    partials = []
+    histograms = []
+    rows_before = 0
+    found_ids = set()
+    for term in GPA_FILES:
+        df = read_term(term, columns=READ_COLUMNS, subjects=subjects)
+        df_filtered = filter_gpa(df, valid_pairs)
+        rows_before += len(df_filtered)
+        found_ids.update(df_filtered["course_id"].unique())
+        partials.append(summarize_term(df_filtered))
+        histograms.append(term_histograms(df_filtered, term))
+
+    print(f"\nRows BEFORE merging duplicates: {rows_before}")
+    print(f"Unique course IDs found: {len(found_ids)}")
+
+    merged_df = merge_duplicate_instructors(partials)
     print(f"\nRows AFTER merging duplicates: {len(merged_df)}")
     print(f"Unique course IDs after merge: {merged_df['course_id'].nunique()}")
 
     merged_df.to_csv(OUTPUT_FILE, index=False)
     print(f"\nSaved cleaned GPA data → {OUTPUT_FILE}")
+
+    distributions = build_distributions(histograms)
+    with open(DISTRIBUTIONS_FILE, "w") as f:
+        json.dump(
+            {
+                "grade_labels": [col.upper() for col in GRADE_COLUMNS],
+                "percentiles": list(PERCENTILES),
+                "courses": distributions,
+            },
+            f,
+        )
+    print(f"Saved {len(distributions)} grade distributions → {DISTRIBUTIONS_FILE}")
@@ -1,11 +1,19 @@
-import requests
-import math
+import argparse
+import asyncio
 import json
+import math
 import os
+import sys
+import time
+
+from fetch_engine import Fetcher
+from http_cache import HttpCache
 
 DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 OUTPUT_PATH = os.path.join(DATA_DIR, "raw", "uiuc_professor_ratings.json")
-API_URL = "https://www.ratemyprofessors.com/graphql"
+# Every page is appended here as it arrives; an interrupted ingest resumes from it
+PAGES_PATH = os.path.join(DATA_DIR, "raw", "rmp_ingest", "pages.jsonl")
+API_URL = os.getenv("RMP_API_URL", "https://www.ratemyprofessors.com/graphql")
 UIUC_ID = "U2Nob29sLTExMTI="
 HEADERS = {
     "Content-Type": "application/json",
@@ -16,6 +24,10 @@ HEADERS = {
     "Origin": "https://www.ratemyprofessors.com",
     "Referer": "https://www.ratemyprofessors.com/",
 }
+# On-disk response cache (http_cache.py); --offline replays from it only
+CACHE = None
+# Professors per node() batch when refreshing changed ratings
+REFRESH_BATCH_SIZE = 25
 
 
 TOTAL_COUNT_QUERY = """
@@ -29,21 +41,42 @@ query ProfessorCountQuery($schoolID: ID!) {
 """
 
 
+TEACHER_FIELDS = """
+          id
+          firstName
+          lastName
+          department
+          avgDifficulty
+          avgRating
+          numRatings
+          wouldTakeAgainPercent
+"""
+
+
 GET_PROFESSORS_QUERY = """
 query ProfessorRatingsQuery($schoolID: ID!, $first: Int!, $cursor: String) {
+  newSearch {
+    teachers(query: { schoolID: $schoolID }, first: $first, after: $cursor) {
+      edges {
+        cursor
+        node {%s}
+      }
+    }
+  }
+}
+""" % TEACHER_FIELDS
+
+
+# Refresh mode walks this lighter index and re-fetches only changed professors
+GET_RATING_COUNTS_QUERY = """
+query ProfessorRatingCountsQuery($schoolID: ID!, $first: Int!, $cursor: String) {
   newSearch {
     teachers(query: { schoolID: $schoolID }, first: $first, after: $cursor) {
       edges {
         cursor
         node {
           id
-          firstName
-          lastName
-          department
-          avgDifficulty
-          avgRating
           numRatings
-          wouldTakeAgainPercent
         }
       }
     }
@@ -52,55 +85,255 @@ query ProfessorRatingsQuery($schoolID: ID!, $first: Int!, $cursor: String) {
 """
 
 
-def get_total_professor_count():
+def build_nodes_query(professor_ids):
+    """One query fetching several professors by ID via aliased node() lookups"""
+    lookups = [
+        f"  p{i}: node(id: {json.dumps(pid)}) {{\n    ... on Teacher {{{TEACHER_FIELDS}    }}\n  }}"
+        for i, pid in enumerate(professor_ids)
+    ]
+    return "query ProfessorRefreshQuery {\n" + "\n".join(lookups) + "\n}"
+
+
+async def post_graphql(fetcher, query, variables=None):
+    """
+    POSTs a GraphQL query and returns its "data", or None on failure.
+    The JSON body is serialized with sorted keys so identical queries share a cache entry.
+    """
+    payload = {"query": query, "variables": variables or {}}
+    body = json.dumps(payload, sort_keys=True)
+    text = await fetcher.fetch_text("POST", API_URL, content=body, headers=HEADERS)
+    if text is None:
+        print("ERROR: GraphQL request failed")
+        return None
+    return json.loads(text).get("data")
+
+
+async def get_total_professor_count(fetcher):
     """
     This function will count the total number of professor ratings available for UIUC
     :return:
     """
-    payload = {"query": TOTAL_COUNT_QUERY, "variables": {"schoolID": UIUC_ID}}
-    res = requests.post(API_URL, json=payload, headers=HEADERS)
+    data = await post_graphql(fetcher, TOTAL_COUNT_QUERY, {"schoolID": UIUC_ID})
+    if data is None:
+        return None
+    return data["newSearch"]["teachers"]["resultCount"]
+
 
-    if res.status_code != 200:
-        print("ERROR:", res.status_code)
-        print(res.text)
+async def fetch_page(fetcher, query, batch_size, cursor):
+    variables = {"schoolID": UIUC_ID, "first": batch_size, "cursor": cursor}
+    data = await post_graphql(fetcher, query, variables)
+    if data is None:
         return None
+    return data["newSearch"]["teachers"]["edges"]
+
+
+async def stream_pages(fetcher, query, batch_size, cursor, on_page):
+    """
+    Walks the cursor-paginated teacher search starting after ``cursor``.
+    Each page's cursor is known as soon as it arrives, so the next request is
+    already in flight while on_page(edges) parses and persists the current one
+    (in a thread, so the event loop keeps the next request moving).
+    Returns True if the last page was reached, False if a request failed.
+    """
+    next_page = asyncio.create_task(fetch_page(fetcher, query, batch_size, cursor))
+    while True:
+        edges = await next_page
+        if edges is None:
+            return False
+        if not edges:
+            return True
+        more = len(edges) == batch_size
+        if more:
+            next_page = asyncio.create_task(
+                fetch_page(fetcher, query, batch_size, edges[-1]["cursor"])
+            )
+        await asyncio.to_thread(on_page, edges)
+        if not more:
+            return True
+
+
+# ============================================================
+#  FULL INGEST (resumable)
+# ============================================================
+
+
+def read_page_log(path=PAGES_PATH):
+    """Pages persisted so far; a torn last line from a crash is ignored"""
+    pages = []
+    if not os.path.exists(path):
+        return pages
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                pages.append(json.loads(line))
+            except ValueError:
+                break
+    return pages
 
-    return res.json()["data"]["newSearch"]["teachers"]["resultCount"]
 
+def append_page(f, edges):
+    record = {"cursor": edges[-1]["cursor"], "professors": [e["node"] for e in edges]}
+    f.write(json.dumps(record) + "\n")
+    f.flush()
+    os.fsync(f.fileno())
 
-def get_all_professors(batch_size=50):
+
+async def ingest_all(fetcher, batch_size=50, fresh=False):
     """
-    Extracts all professor ratings available for UIUC.
+    Streams every professor page into PAGES_PATH, resuming after the last
+    persisted page unless ``fresh``. Returns True once the last page is stored.
     """
-    total = get_total_professor_count()
-    if total is None:
+    os.makedirs(os.path.dirname(PAGES_PATH), exist_ok=True)
+    pages = [] if fresh else read_page_log()
+    if pages and pages[-1].get("complete"):
+        print(f"Ingest already complete ({len(pages) - 1} pages)")
+        return True
+    cursor = pages[-1]["cursor"] if pages else None
+    if pages:
+        print(f"Resuming after {len(pages)} stored pages")
+
+    total = await get_total_professor_count(fetcher)
+    if total is not None:
+        print(f"Found {total} professors ({math.ceil(total / batch_size)} pages)")
+
+    # Rewrite the valid pages so a torn trailing line from a crash is dropped
+    tmp_path = f"{PAGES_PATH}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for page in pages:
+            f.write(json.dumps(page) + "\n")
+    os.replace(tmp_path, PAGES_PATH)
+
+    with open(PAGES_PATH, "a", encoding="utf-8") as f:
+        stored = len(pages)
+
+        def on_page(edges):
+            nonlocal stored
+            append_page(f, edges)
+            stored += 1
+            print(f"Stored page {stored}")
+
+        complete = await stream_pages(
+            fetcher, GET_PROFESSORS_QUERY, batch_size, cursor, on_page
+        )
+        if complete:
+            f.write(json.dumps({"complete": True}) + "\n")
+    return complete
+
+
+def compact_pages(path=PAGES_PATH):
+    """All professors from the page log, de-duplicated by ID in first-seen order"""
+    professors = {}
+    for page in read_page_log(path):
+        for professor in page.get("professors", []):
+            professors.setdefault(professor["id"], professor)
+    return list(professors.values())
+
+
+# ============================================================
+#  REFRESH (only professors whose numRatings changed)
+# ============================================================
+
+
+async def refresh(fetcher, existing, batch_size=50):
+    """
+    Re-fetches only professors that are new or whose numRatings changed since
+    ``existing`` (the last saved list). Returns the updated list, or None if
+    the index walk or any batch failed.
+    """
+    known = {p["id"]: p.get("numRatings") for p in existing}
+    changed = []
+
+    def on_page(edges):
+        for edge in edges:
+            node = edge["node"]
+            if known.get(node["id"], -1) != node["numRatings"]:
+                changed.append(node["id"])
+
+    complete = await stream_pages(
+        fetcher, GET_RATING_COUNTS_QUERY, batch_size, None, on_page
+    )
+    if not complete:
+        print("Index walk failed; keeping the existing data")
         return None
-    print(f"Found {total} professors")
-    pages = math.ceil(total / batch_size)
-    professors = []
-    cursor = None
-    for i in range(pages):
-        print(f"Fetching page {i + 1}/{pages}…")
-        variables = {"schoolID": UIUC_ID, "first": batch_size, "cursor": cursor}
-        payload = {"query": GET_PROFESSORS_QUERY, "variables": variables}
-        res = requests.post(API_URL, json=payload, headers=HEADERS)
-        if res.status_code != 200:
-            print("ERROR:", res.status_code)
-            print(res.text)
-            break
-        data = res.json()["data"]["newSearch"]["teachers"]["edges"]
-        if not data:
-            break
-        for entry in data:
-            professors.append(entry["node"])
-        cursor = data[-1]["cursor"]
-
-    return professors
+    print(f"{len(changed)} professors new or changed")
 
+    batches = [
+        changed[i : i + REFRESH_BATCH_SIZE]
+        for i in range(0, len(changed), REFRESH_BATCH_SIZE)
+    ]
+    results = await asyncio.gather(
+        *(post_graphql(fetcher, build_nodes_query(batch)) for batch in batches)
+    )
+    failed = sum(data is None for data in results)
+    if failed:
+        print(f"{failed} of {len(batches)} batches failed; keeping the existing data")
+        return None
+    updates = {}
+    for data in results:
+        for node in data.values():
+            if node and node.get("id"):
+                updates[node["id"]] = node
 
-if __name__ == "__main__":
-    all_professors = get_all_professors()
-    print(f"\nExtracted {len(all_professors)} professors.")
-    with open(OUTPUT_PATH, "w") as f:
-        json.dump(all_professors, f, indent=4)
+    print(f"Re-fetched {len(updates)} professors")
+    merged = [updates.pop(p["id"], p) for p in existing]
+    merged.extend(updates.values())
+    return merged
+
+
+def write_output(professors):
+    tmp_path = f"{OUTPUT_PATH}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(professors, f, indent=4)
+    os.replace(tmp_path, OUTPUT_PATH)
     print(f"Saved to {OUTPUT_PATH}")
+
+
+async def main(args):
+    start = time.time()
+    async with Fetcher(rate=args.rate, burst=args.rate, cache=CACHE) as fetcher:
+        if args.refresh:
+            with open(OUTPUT_PATH, "r") as f:
+                existing = json.load(f)
+            professors = await refresh(fetcher, existing, args.batch_size)
+        else:
+            complete = await ingest_all(fetcher, args.batch_size, args.fresh)
+            professors = compact_pages() if complete else None
+        print(f"Done in {time.time() - start:.1f}s {fetcher.stats}")
+    if CACHE is not None:
+        print(f"Response cache: {CACHE.summary()}")
+
+    if professors is None:
+        print("Incomplete run; re-run to resume")
+        return False
+    print(f"\nExtracted {len(professors)} professors.")
+    write_output(professors)
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape UIUC RateMyProfessors data")
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Only re-fetch professors whose numRatings changed since the last run",
+    )
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Discard the stored pages and ingest from the first page",
+    )
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--rate", type=float, default=4.0, help="Requests/second")
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Rebuild output purely from the response cache",
+    )
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--cache-dir", default=None)
+    args = parser.parse_args()
+    if args.offline or not args.no_cache:
+        CACHE = HttpCache(args.cache_dir, offline=args.offline)
+
+    if not asyncio.run(main(args)):
+        sys.exit(1)
@@ -1,17 +1,27 @@
-import requests
 import xml.etree.ElementTree as ET
 import re
 import time
-from random import uniform
-import json
+import argparse
+import asyncio
 import os
+import sys
 
+from fetch_engine import DEFAULT_CONCURRENCY, DEFAULT_RATE, Fetcher
+from http_cache import HttpCache
+from scrape_checkpoint import ScrapeCheckpoint
 
 YEARS = range(2024, 2026)
 SEMESTERS = ["spring", "summer", "fall"]
 DEPARTMENTS = ["CS", "IS", "STAT", "ECE", "MATH", "BADM"]
-BASE_URL = "https://courses.illinois.edu/cisapp/explorer/schedule"
+DEFAULT_API_ROOT = "https://courses.illinois.edu"
+# Point at fixture_server.py (e.g. http://127.0.0.1:8765) to scrape recorded XML
+API_ROOT = os.getenv("UIUC_API_ROOT", DEFAULT_API_ROOT).rstrip("/")
+BASE_URL = f"{API_ROOT}/cisapp/explorer/schedule"
 DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# When set, every fetched XML document is also saved here as a fixture
+RECORD_DIR = os.getenv("UIUC_RECORD_DIR")
+# On-disk response cache (http_cache.py), set up by configure_cache()
+CACHE = None
 
 
 def safe_text(element):
@@ -34,110 +44,222 @@ def extract_prerequisites(description):
 def fix_url(url):
     """Sometimes UIUC API can return broken urls. This function fixes the broken urls."""
     if "cis.local" in url:
-        url = url.replace(
-            "http://cis.local/cisapi/", "https://courses.illinois.edu/cisapp/explorer/"
-        )
+        url = url.replace("http://cis.local/cisapi/", f"{API_ROOT}/cisapp/explorer/")
         if not url.endswith(".xml"):
             url += ".xml"
+    elif API_ROOT != DEFAULT_API_ROOT and url.startswith(DEFAULT_API_ROOT):
+        # Links inside recorded fixtures still point at the real host
+        url = API_ROOT + url[len(DEFAULT_API_ROOT) :]
     return url
 
 
-def get_response(url, retries=3):
-    """This function fetches the response from url if any errors it will fix the url and retries upto 3 times(due to API rate limit)"""
+def configure_cache(enabled=True, offline=False, cache_dir=None):
+    """
+    Enables the on-disk response cache used by the Fetcher in scrape_to_checkpoint.
+    offline=True replays only from the cache and never touches the network.
+    """
+    global CACHE
+    CACHE = HttpCache(cache_dir, offline=offline) if enabled or offline else None
+    return CACHE
+
+
+def new_course_record(full_id, detail_root):
+    """
+    Builds the course entry from a course detail XML document.
+    instructors and semesters start empty and are filled in per term.
+    """
+    description = safe_text(detail_root.find("description"))
+    return {
+        "course_id": full_id,
+        "title": safe_text(detail_root.find("label")),
+        "description": description,
+        "credit_hours": safe_text(detail_root.find("creditHours")),
+        "prerequisites": extract_prerequisites(description),
+        "instructors": set(),
+        "semesters": set(),
+        "gen_ed": detail_root.find(".//genEdCategories") is not None,
+    }
+
+
+# ============================================================
+#  CONCURRENT SCRAPING (fetch_engine)
+# ============================================================
+
+
+def record_fixture(url, text):
+    """Save a fetched document under RECORD_DIR at its URL path, for fixture_server.py"""
+    path = os.path.join(RECORD_DIR, url.split("://", 1)[-1].split("/", 1)[-1])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+async def fetch_xml(fetcher, url):
+    """Fetch a URL and parse it as XML; None if it could not be fetched or parsed"""
     url = fix_url(url)
-    for attempt in range(1, retries + 1):
-        try:
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                return ET.fromstring(response.text)
-            else:
-                print(f"Status {response.status_code}: {url}")
-        except Exception as e:
-            print(f"Error fetching {url}: {e}")
-        time.sleep(1.5 * attempt)
-    print(f"Failed after retries for {url}")
-    return None
-
-
-def get_course_details(dept, year, semester, departments: dict):
-    """
-    Extracts the course details for all the courses in given department, semester and year and stores in department dictionary.
-    course details: course ID, title, credit hours, prerequisites, general education flag, instructors, semesters the course is available
-    """
-    print(f"\n{dept} • {semester} {year}")
-    subject_url = f"{BASE_URL}/{year}/{semester}/{dept}.xml"
-    root = get_response(subject_url)
+    text = await fetcher.get_text(url)
+    if text is None:
+        return None
+    if RECORD_DIR:
+        record_fixture(url, text)
+    try:
+        return ET.fromstring(text)
+    except ET.ParseError as e:
+        print(f"Invalid XML from {url}: {e}")
+        return None
+
+
+async def fetch_course(fetcher, dept, course):
+    """
+    Fetches one course's detail page and all of its sections concurrently.
+    Returns None if the detail page or any section could not be fetched.
+    """
+    full_id = f"{dept} {course.attrib['id']}"
+    detail_root = await fetch_xml(fetcher, course.attrib["href"])
+    if detail_root is None:
+        return None
+    section_roots = await asyncio.gather(
+        *(
+            fetch_xml(fetcher, section.attrib["href"])
+            for section in detail_root.findall(".//section")
+        )
+    )
+    if any(sec_root is None for sec_root in section_roots):
+        # Missing sections would silently drop instructors
+        return None
+    instructors = set()
+    for sec_root in section_roots:
+        for instr in sec_root.findall(".//instructor"):
+            if instr.text:
+                instructors.add(instr.text.strip())
+    return full_id, new_course_record(full_id, detail_root), instructors
+
+
+async def fetch_term(fetcher, dept, year, semester):
+    """
+    Fetches every course offered by a department in one term.
+    Returns a list of (course ID, course record, instructors) tuples, empty
+    if the term lists no courses, or None if any document failed to fetch
+    (retries exhausted, or a miss in offline mode).
+    """
+    root = await fetch_xml(fetcher, f"{BASE_URL}/{year}/{semester}/{dept}.xml")
     if root is None:
-        print(f"No data for {dept} {semester} {year}")
-        return
+        print(f"Could not fetch {dept} {semester} {year}")
+        return None
     courses_found = root.findall(".//course")
-    print(f"Found {len(courses_found)} courses.")
-    for course in courses_found:
-        course_num = course.attrib["id"]
-        full_id = f"{dept} {course_num}"
-        detail_url = course.attrib["href"]
-        print(f"Course: {full_id}")
-        detail_root = get_response(detail_url)
-        if detail_root is None:
-            continue
-        title = safe_text(detail_root.find("label"))
-        description = safe_text(detail_root.find("description"))
-        credit_hours = safe_text(detail_root.find("creditHours"))
-        prereq = extract_prerequisites(description)
-        gened = detail_root.find(".//genEdCategories") is not None
-        instructors = set()
-        for section in detail_root.findall(".//section"):
-            sec_url = section.attrib["href"]
-            sec_root = get_response(sec_url)
-            if sec_root is None:
-                continue
-            for instr in sec_root.findall(".//instructor"):
-                if instr.text:
-                    instructors.add(instr.text.strip())
-            time.sleep(uniform(0.15, 0.35))
-        if full_id not in departments[dept]:
-            departments[dept][full_id] = {
-                "course_id": full_id,
-                "title": title,
-                "description": description,
-                "credit_hours": credit_hours,
-                "prerequisites": prereq,
-                "instructors": set(),
-                "semesters": set(),
-                "gen_ed": gened,
-            }
-        departments[dept][full_id]["instructors"].update(instructors)
-        departments[dept][full_id]["semesters"].add(f"{semester}")
-    print(f"Pausing after {dept} to avoid API throttling")
-    time.sleep(3)
-
-
-def convert_set_to_list(departments):
-    """
-    This function converts instructors, semesters in departments to a list
-    """
-    for dept in departments:
-        for cid in departments[dept]:
-            departments[dept][cid]["instructors"] = list(
-                departments[dept][cid]["instructors"]
-            )
-            departments[dept][cid]["semesters"] = list(
-                departments[dept][cid]["semesters"]
-            )
-    return departments
+    results = await asyncio.gather(
+        *(fetch_course(fetcher, dept, course) for course in courses_found)
+    )
+    failed = sum(result is None for result in results)
+    if failed:
+        print(f"{dept} • {semester} {year}: {failed} of {len(results)} courses failed")
+        return None
+    print(f"{dept} • {semester} {year}: {len(courses_found)} courses")
+    return results
+
+
+async def scrape_to_checkpoint(checkpoint, units_in_flight=4, **fetcher_options):
+    """
+    Scrapes every pending (department, year, semester) unit of a ScrapeCheckpoint.
+    Each unit is committed to its JSONL shard as soon as it finishes, so at most
+    units_in_flight terms are held in memory and an interrupted run resumes
+    from the first unfinished unit. Units with a failed fetch are not
+    committed, so the next run tries them again; they are returned in run order.
+    """
+    pending = checkpoint.pending()
+    done = len(checkpoint.units) - len(pending)
+    print(f"{done}/{len(checkpoint.units)} terms already scraped, {len(pending)} to go")
+    gate = asyncio.Semaphore(units_in_flight)
+    failed = set()
+    start = time.time()
+
+    async with Fetcher(cache=CACHE, **fetcher_options) as fetcher:
+
+        async def run_unit(dept, year, semester):
+            async with gate:
+                results = await fetch_term(fetcher, dept, year, semester)
+                if results is None:
+                    failed.add((dept, year, semester))
+                else:
+                    checkpoint.commit(dept, year, semester, results)
+
+        await asyncio.gather(*(run_unit(*unit) for unit in pending))
+        print(
+            f"\nFetched {len(pending)} terms in {time.time() - start:.1f}s {fetcher.stats}"
+        )
+    if CACHE is not None:
+        print(f"Response cache: {CACHE.summary()}")
+    return [unit for unit in pending if unit in failed]
+
+
+def run_scrape(departments, output_name, args):
+    """
+    Scrapes departments × YEARS × SEMESTERS with checkpoints, then compacts the
+    shards into raw/<output_name>. Returns the number of courses written.
+    If any unit failed, the output is left as it was and the run exits non-zero.
+    """
+    units = [
+        (dept, year, sem) for dept in departments for year in YEARS for sem in SEMESTERS
+    ]
+    run_dir = os.path.join(DATA_DIR, "raw", "scrape_runs", output_name[: -len(".json")])
+    checkpoint = ScrapeCheckpoint(run_dir, units, fresh=args.fresh)
+    failed = asyncio.run(
+        scrape_to_checkpoint(
+            checkpoint,
+            units_in_flight=args.units_in_flight,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            burst=args.rate,
+        )
+    )
+    if failed:
+        print(f"\n{len(failed)} terms failed and will be retried on the next run:")
+        for dept, year, semester in failed:
+            print(f"  {dept} {semester} {year}")
+        sys.exit(f"Incomplete scrape; raw/{output_name} was not updated.")
+    output_path = os.path.join(DATA_DIR, "raw", output_name)
+    total = checkpoint.compact(output_path, departments)
+    print(f"\nSaved course data to file {output_path}")
+    return total
+
+
+def parse_args(description):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Requests in flight",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=DEFAULT_RATE,
+        help="Requests/second per host",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Rebuild output purely from the response cache",
+    )
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--cache-dir", default=None)
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Ignore the checkpoint and scrape everything again",
+    )
+    parser.add_argument(
+        "--units-in-flight",
+        type=int,
+        default=4,
+        help="(department, year, semester) units scraped at once",
+    )
+    args = parser.parse_args()
+    configure_cache(not args.no_cache, args.offline, args.cache_dir)
+    return args
 
 
 if __name__ == "__main__":
-    departments = {dept: {} for dept in DEPARTMENTS}
-    for dept in DEPARTMENTS:
-        for year in YEARS:
-            for semester in SEMESTERS:
-                get_course_details(dept, year, semester, departments)
-
-    departments = convert_set_to_list(departments)
-
-    OUTPUT_PATH = os.path.join(DATA_DIR, "raw", "uiuc_courses.json")
-    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
-        json.dump(departments, f, indent=4, ensure_ascii=False)
-    print(f"\nSaved course data to file {OUTPUT_PATH}")
-    print(sum(len(departments[dept]) for dept in departments))
+    args = parse_args("Scrape UIUC course data")
+    print(run_scrape(DEPARTMENTS, "uiuc_courses.json", args))
@@ -0,0 +1,170 @@
+import asyncio
+import random
+import time
+from urllib.parse import urlsplit
+
+import httpx
+
+from http_cache import request_key
+
+# Defaults tuned for courses.illinois.edu, which starts returning 429/503s
+# somewhere above ~10 requests/second from one client
+DEFAULT_RATE = 8.0
+DEFAULT_BURST = 8
+DEFAULT_CONCURRENCY = 16
+DEFAULT_RETRIES = 4
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Async token bucket: ``rate`` requests/second with bursts up to ``capacity``"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class Fetcher:
+    """
+    Shared async HTTP fetcher for the scrapers.
+
+    One keep-alive connection pool, a token bucket per host, a cap on
+    requests in flight, and retries with exponential backoff plus full
+    jitter (honouring Retry-After) on transport errors and 429/5xx.
+
+    Use as ``async with Fetcher() as fetcher: text = await fetcher.get_text(url)``.
+    """
+
+    def __init__(
+        self,
+        rate=DEFAULT_RATE,
+        burst=DEFAULT_BURST,
+        concurrency=DEFAULT_CONCURRENCY,
+        retries=DEFAULT_RETRIES,
+        timeout=10.0,
+        backoff=0.5,
+        max_backoff=20.0,
+        cache=None,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        # Optional http_cache.HttpCache for conditional GETs / offline replay
+        self.cache = cache
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.buckets = {}
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=concurrency, max_keepalive_connections=concurrency
+            ),
+            headers={"User-Agent": "uiuc-semester-planner-scraper"},
+        )
+        self.stats = {"requests": 0, "retries": 0, "failures": 0}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.client.aclose()
+
+    def bucket_for(self, url):
+        host = urlsplit(url).netloc
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.rate, self.burst)
+        return self.buckets[host]
+
+    def retry_delay(self, attempt, response=None):
+        """Full-jitter exponential backoff, or the server's Retry-After if given"""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+    async def request(self, method, url, **kwargs):
+        """
+        Send a request with rate limiting and retries.
+        Returns the final httpx.Response, or None if every attempt failed.
+        """
+        bucket = self.bucket_for(url)
+        for attempt in range(self.retries + 1):
+            response = None
+            async with self.semaphore:
+                await bucket.acquire()
+                self.stats["requests"] += 1
+                try:
+                    response = await self.client.request(method, url, **kwargs)
+                    if response.status_code not in RETRY_STATUSES:
+                        return response
+                    print(f"Status {response.status_code}: {url}")
+                except httpx.HTTPError as e:
+                    print(f"Error fetching {url}: {e!r}")
+            if attempt < self.retries:
+                self.stats["retries"] += 1
+                await asyncio.sleep(self.retry_delay(attempt, response))
+        self.stats["failures"] += 1
+        print(f"Failed after retries for {url}")
+        return response
+
+    async def get_text(self, url, **kwargs):
+        """Body of a successful GET (possibly answered from the cache), or None"""
+        return await self.fetch_text("GET", url, **kwargs)
+
+    async def fetch_text(self, method, url, content=None, headers=None, **kwargs):
+        """
+        Body of a successful request, or None. With a cache, requests are
+        conditional and 304s (or, offline, every request) are served from disk.
+        """
+        if self.cache is None:
+            response = await self.request(
+                method, url, content=content, headers=headers, **kwargs
+            )
+            if response is None or response.status_code != 200:
+                return None
+            return response.text
+
+        key = request_key(method, url, content)
+        if self.cache.offline:
+            return self.cache.replay(key).text
+        entry = self.cache.lookup(key)
+        conditional = {**(headers or {}), **self.cache.conditional_headers(entry)}
+        response = await self.request(
+            method, url, content=content, headers=conditional, **kwargs
+        )
+        if response is None:
+            return None
+        result = self.cache.resolve(
+            key, url, entry, response.status_code, response.text, response.headers
+        )
+        if result.status_code == 304:
+            # Validators matched but the cached body is gone; fetch it whole
+            print(f"Cached body missing, refetching {url}")
+            response = await self.request(
+                method, url, content=content, headers=headers, **kwargs
+            )
+            if response is None:
+                return None
+            result = self.cache.resolve(
+                key, url, None, response.status_code, response.text, response.headers
+            )
+        return result.text if result.status_code == 200 else None
@@ -0,0 +1,83 @@
+"""
+Local stand-in for courses.illinois.edu that serves recorded XML fixtures.
+
+Record fixtures once against the real API:
+    UIUC_RECORD_DIR=fixtures/uiuc python UIUC_Course_Scraper.py
+Then scrape them offline, optionally with injected latency and failures:
+    python fixture_server.py --fixtures-dir fixtures/uiuc --latency-ms 50 --fail-rate 0.05
+    UIUC_API_ROOT=http://127.0.0.1:8765 python UIUC_Course_Scraper.py
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    fixtures_dir = "."
+    latency = 0.0
+    fail_rate = 0.0
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        if self.fail_rate and random.random() < self.fail_rate:
+            # Mimic the API's throttling so retries get exercised
+            self.send_response(503)
+            self.send_header("Retry-After", "1")
+            self.end_headers()
+            return
+
+        relative = self.path.split("?", 1)[0].lstrip("/")
+        root = os.path.realpath(self.fixtures_dir)
+        path = os.path.realpath(os.path.join(root, relative))
+        if not path.startswith(root + os.sep) or not os.path.isfile(path):
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        with open(path, "rb") as f:
+            body = f.read()
+        # Validators like the real API's, so conditional requests can be tested
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        last_modified = formatdate(os.path.getmtime(path), usegmt=True)
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/xml")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(fixtures_dir, host="127.0.0.1", port=8765, latency_ms=0, fail_rate=0.0):
+    FixtureHandler.fixtures_dir = fixtures_dir
+    FixtureHandler.latency = latency_ms / 1000
+    FixtureHandler.fail_rate = fail_rate
+    server = ThreadingHTTPServer((host, port), FixtureHandler)
+    print(f"Serving fixtures from {fixtures_dir} on http://{host}:{port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve recorded UIUC API fixtures")
+    parser.add_argument("--fixtures-dir", required=True)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    serve(args.fixtures_dir, args.host, args.port, args.latency_ms, args.fail_rate)
@@ -0,0 +1,168 @@
+"""
+Columnar store for the raw grade-distribution CSVs.
+
+Each term's CSV (fa2024.csv, sp2025.csv, ...) is converted once to
+data/raw/gpa_parquet/<term>.parquet with explicit types: repeated strings
+(subject, title, instructor, ...) are dictionary-encoded categoricals, grade
+counts are small nullable integers and "N/A" becomes a real null. Rows are
+sorted by subject and written in small row groups, so a read filtered on
+subject only decodes the row groups whose min/max statistics can match, and
+only the requested columns.
+
+    python gpa_store.py          # convert any CSV newer than its Parquet file
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RAW_DATA_DIR = os.path.join(DATA_DIR, "raw")
+PARQUET_DIR = os.path.join(RAW_DATA_DIR, "gpa_parquet")
+
+# term name -> raw CSV; add a line here for every new term file
+GPA_FILES = {
+    "fall_2024": os.path.join(RAW_DATA_DIR, "fa2024.csv"),
+    "spring_2025": os.path.join(RAW_DATA_DIR, "sp2025.csv"),
+    "summer_2024": os.path.join(RAW_DATA_DIR, "su2024.csv"),
+}
+
+GRADE_COLUMNS = [
+    "a+",
+    "a",
+    "a-",
+    "b+",
+    "b",
+    "b-",
+    "c+",
+    "c",
+    "c-",
+    "d+",
+    "d",
+    "d-",
+    "f",
+    "w",
+]
+# Grade points of every column but "w"; withdrawals earn no grade
+GRADE_POINTS = np.array(
+    [4.0, 4.0, 3.67, 3.33, 3.0, 2.67, 2.33, 2.0, 1.67, 1.33, 1.0, 0.67, 0.0]
+)
+PERCENTILES = (10, 25, 50, 75, 90)
+CATEGORY_COLUMNS = [
+    "course_subject",
+    "course_number",
+    "course_title",
+    "sched_type",
+    "primary_instructor",
+]
+# Older exports carry empty "A Range".."D Range" columns; they are dropped
+CSV_DTYPES = {
+    "crn": "int32",
+    "course_section": "string",
+    "term": "int32",
+    "average_grade": "float64",
+    **{col: "category" for col in CATEGORY_COLUMNS},
+    **{col: "Int16" for col in GRADE_COLUMNS},
+}
+ROW_GROUP_SIZE = 1024
+
+
+def normalize_column(name):
+    return name.lower().strip().replace(" ", "_")
+
+
+def parquet_path(term):
+    return os.path.join(PARQUET_DIR, f"{term}.parquet")
+
+
+def convert_csv(csv_path, out_path):
+    """Converts one grade CSV to a typed, subject-sorted Parquet file"""
+    header = pd.read_csv(csv_path, nrows=0).columns
+    names = {col: normalize_column(col) for col in header}
+    usecols = [col for col in header if names[col] in CSV_DTYPES]
+    df = pd.read_csv(
+        csv_path,
+        usecols=usecols,
+        dtype={col: CSV_DTYPES[names[col]] for col in usecols},
+        na_values=["N/A"],
+    ).rename(columns=names)
+    df["course_subject"] = df["course_subject"].cat.rename_categories(
+        lambda s: s.upper().strip()
+    )
+    df = df.sort_values(["course_subject", "course_number"], kind="stable")
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    tmp_path = f"{out_path}.tmp"
+    pq.write_table(table, tmp_path, row_group_size=ROW_GROUP_SIZE, compression="zstd")
+    os.replace(tmp_path, out_path)
+    return len(df)
+
+
+def ensure_parquet(files=GPA_FILES):
+    """Converts each term whose Parquet file is missing or older than its CSV"""
+    for term, csv_path in files.items():
+        out_path = parquet_path(term)
+        if os.path.exists(out_path) and os.path.getmtime(out_path) >= os.path.getmtime(
+            csv_path
+        ):
+            continue
+        rows = convert_csv(csv_path, out_path)
+        print(f"Converted {os.path.basename(csv_path)} → {out_path} ({rows} rows)")
+
+
+def read_term(term, columns=None, subjects=None):
+    """
+    One term's rows as a DataFrame with categorical string columns.
+    columns: only decode these; subjects: only row groups that can hold them.
+    """
+    filters = [("course_subject", "in", sorted(subjects))] if subjects else None
+    return pd.read_parquet(
+        parquet_path(term), columns=columns, filters=filters, engine="pyarrow"
+    )
+
+
+def summarize_histograms(histograms):
+    """
+    Vectorized stats for an (n, len(GRADE_COLUMNS)) array of grade counts.
+    Returns per-row graded students (W excluded), withdrawals, the
+    enrollment-weighted GPA and the grade points at PERCENTILES; the GPA and
+    percentiles are NaN for rows without graded students.
+    """
+    counts = histograms[:, :-1]
+    students = counts.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        gpa = counts @ GRADE_POINTS / students
+
+    # Walk the counts from F upwards; a percentile is the first grade whose
+    # cumulative count reaches that share of the class
+    cumulative = counts[:, ::-1].cumsum(axis=1)
+    ascending_points = GRADE_POINTS[::-1]
+    percentiles = np.stack(
+        [
+            ascending_points[(cumulative >= students[:, None] * p / 100).argmax(axis=1)]
+            for p in PERCENTILES
+        ],
+        axis=1,
+    )
+    percentiles[students == 0] = np.nan
+    return students, histograms[:, -1], gpa, percentiles
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Convert the raw grade CSVs to Parquet"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Re-convert even if up to date"
+    )
+    args = parser.parse_args()
+    if args.force:
+        for term in GPA_FILES:
+            if os.path.exists(parquet_path(term)):
+                os.remove(parquet_path(term))
+    ensure_parquet()
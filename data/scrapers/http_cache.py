@@ -0,0 +1,138 @@
+"""
+On-disk HTTP response cache shared by the scrapers.
+
+Responses are stored content-addressed: each body is written once under
+blobs/<sha256 of body>, and an index entry per request (keyed by a hash of
+method + URL + request body) points at it along with the ETag and
+Last-Modified validators. Re-scrapes send If-None-Match / If-Modified-Since
+and a 304 is answered from disk, so only changed documents are transferred.
+
+In offline mode nothing touches the network: hits are replayed from disk and
+misses return None, which lets the raw JSON be rebuilt purely from cache.
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections import namedtuple
+
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_DIR = os.path.join(DATA_DIR, "raw", "http_cache")
+
+CachedResponse = namedtuple("CachedResponse", ["status_code", "text", "from_cache"])
+
+
+def request_key(method, url, body=None):
+    """Stable cache key for a request; POST bodies are part of the key"""
+    payload = body if isinstance(body, (bytes, type(None))) else body.encode("utf-8")
+    digest = hashlib.sha256(f"{method.upper()} {url}\n".encode("utf-8"))
+    if payload:
+        digest.update(payload)
+    return digest.hexdigest()
+
+
+class HttpCache:
+    def __init__(self, cache_dir=None, offline=False):
+        self.cache_dir = cache_dir or os.getenv("SCRAPER_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.offline = offline
+        self.stats = {"hits": 0, "revalidated": 0, "stored": 0, "misses": 0}
+        os.makedirs(os.path.join(self.cache_dir, "index"), exist_ok=True)
+        os.makedirs(os.path.join(self.cache_dir, "blobs"), exist_ok=True)
+
+    # ----------------------------------------------------------- storage
+
+    def _index_path(self, key):
+        return os.path.join(self.cache_dir, "index", key[:2], f"{key}.json")
+
+    def _blob_path(self, digest):
+        return os.path.join(self.cache_dir, "blobs", digest[:2], digest)
+
+    @staticmethod
+    def _write_atomic(path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def lookup(self, key):
+        """Index entry for a request key, or None"""
+        try:
+            with open(self._index_path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def read_body(self, entry):
+        try:
+            with open(self._blob_path(entry["sha256"]), "rb") as f:
+                return f.read().decode("utf-8")
+        except OSError:
+            return None
+
+    def forget(self, key):
+        """Drop a request's index entry (e.g. its blob went missing)"""
+        try:
+            os.remove(self._index_path(key))
+        except OSError:
+            pass
+
+    def store(self, key, url, body, headers):
+        """Save a 200 response body and its validators"""
+        data = body.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not os.path.exists(blob_path):
+            self._write_atomic(blob_path, data)
+        entry = {
+            "url": url,
+            "sha256": digest,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+        }
+        self._write_atomic(self._index_path(key), json.dumps(entry).encode("utf-8"))
+        self.stats["stored"] += 1
+
+    # ----------------------------------------------------------- protocol
+
+    @staticmethod
+    def conditional_headers(entry):
+        """If-None-Match / If-Modified-Since for a cached entry"""
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def replay(self, key):
+        """Offline answer for a request: the cached body, or a miss"""
+        entry = self.lookup(key)
+        body = self.read_body(entry) if entry else None
+        if body is None:
+            self.stats["misses"] += 1
+            return CachedResponse(504, None, False)
+        self.stats["hits"] += 1
+        return CachedResponse(200, body, True)
+
+    def resolve(self, key, url, entry, status_code, text, headers):
+        """
+        Turn a live (possibly 304) response into a CachedResponse, storing 200s.
+        A 304 whose body is gone drops the entry, so its validators aren't sent
+        again; the caller should re-request unconditionally.
+        """
+        if status_code == 304 and entry:
+            body = self.read_body(entry)
+            if body is not None:
+                self.stats["revalidated"] += 1
+                return CachedResponse(200, body, True)
+            self.forget(key)
+        if status_code == 200:
+            self.store(key, url, text, headers)
+        return CachedResponse(status_code, text, False)
+
+    def summary(self):
+        return ", ".join(f"{name}={count}" for name, count in self.stats.items())
@@ -0,0 +1,387 @@
+"""
+Fuzzy instructor entity resolution between the course catalog, RMP and the
+grade data.
+
+Names are normalized (accents, punctuation and hyphens stripped) and blocked
+on (scope, Soundex of each last-name token, first initial), so a query is only
+scored against the handful of candidates sharing a block instead of every
+professor. A query also meets the candidates whose first name is unknown,
+and a query without a first name meets every initial of its Soundex codes.
+Within a block each candidate is scored on last-name similarity
+(a shared whole token counts, so "Kamath Pailodi" finds "Pailodi"), first-name
+compatibility (initials vs full names, "Geoff" vs "Geoffrey") and department
+agreement. Candidates below MATCH_THRESHOLD are rejected, and two different
+candidates scoring within AMBIGUITY_MARGIN of each other leave the query
+unmatched rather than guessing.
+
+Every index keeps a MatchReport with match rates, score distribution and
+throughput so each pipeline run can print and save how matching went.
+"""
+
+import re
+import time
+import unicodedata
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+MATCH_THRESHOLD = 0.8
+AMBIGUITY_MARGIN = 0.02
+WEIGHTS = {"last": 0.5, "first": 0.2, "dept": 0.3}
+MIN_FUZZY_LENGTH = 6
+# "amp" comes from labels scraped with an HTML-escaped "&amp;"
+DEPT_STOPWORDS = {"and", "amp", "of", "the", "for", "in"}
+
+SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6",
+}
+
+
+# ============================================================
+#  NORMALIZATION
+# ============================================================
+
+
+def normalize(text):
+    """'Núñez-Smith, J.' -> 'nunez smith j'"""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(re.sub(r"[^a-z]+", " ", text.lower()).split())
+
+
+def soundex(token):
+    """American Soundex code of one lowercase token ('' for empty)"""
+    if not token:
+        return ""
+    code = token[0].upper()
+    previous = SOUNDEX_CODES.get(token[0], "")
+    for ch in token[1:]:
+        digit = SOUNDEX_CODES.get(ch, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        # h and w don't separate letters with the same code; vowels do
+        if ch not in "hw":
+            previous = digit
+    return code.ljust(4, "0")
+
+
+def split_name(name):
+    """'Last, First M' -> (last-name tokens, normalized first name)"""
+    last, _, first = (name or "").partition(",")
+    return tuple(normalize(last).split()), normalize(first)
+
+
+def dept_tokens(label):
+    return {t for t in normalize(label.replace("&", " ")).split()} - DEPT_STOPWORDS
+
+
+# ============================================================
+#  SCORING
+# ============================================================
+
+
+def last_name_similarity(query, candidate):
+    joined_query, joined_candidate = " ".join(query), " ".join(candidate)
+    if joined_query == joined_candidate:
+        return 1.0
+    # Hyphenated / compound names often appear with only one part elsewhere
+    if set(query) & set(candidate):
+        return 0.9
+    # Spelling variants ("Torrellas"/"Torellas") only for longer names: short
+    # surnames one letter apart (Wang/Wong, Li/Liu) are different people
+    if (
+        min(len(joined_query), len(joined_candidate)) < MIN_FUZZY_LENGTH
+        or abs(len(joined_query) - len(joined_candidate)) > 1
+    ):
+        return 0.0
+    return SequenceMatcher(None, joined_query, joined_candidate).ratio()
+
+
+def first_name_similarity(query, candidate):
+    """0 when the initials disagree; initials alone are fully compatible"""
+    query, candidate = query.split()[:1], candidate.split()[:1]
+    if not query or not candidate:
+        return 0.5
+    query, candidate = query[0], candidate[0]
+    if query[0] != candidate[0]:
+        return 0.0
+    if len(query) == 1 or len(candidate) == 1 or query == candidate:
+        return 1.0
+    if query.startswith(candidate) or candidate.startswith(query):
+        return 0.9
+    return SequenceMatcher(None, query, candidate).ratio()
+
+
+def dept_similarity(query_labels, candidate_label):
+    """
+    1 for the same department, 0.8 when one name contains the other
+    ("Engineering" / "Electrical & Computer Engineering"), 0.5 if unknown and
+    0.2 otherwise; sharing only a generic word ("... Science") is a mismatch
+    """
+    if not query_labels or not candidate_label:
+        return 0.5
+    candidate = dept_tokens(candidate_label)
+    best = 0.2
+    for label in query_labels:
+        tokens = dept_tokens(label)
+        if tokens == candidate:
+            return 1.0
+        if tokens and candidate and (tokens <= candidate or candidate <= tokens):
+            best = 0.8
+    return best
+
+
+def score(query, candidate):
+    """Weighted similarity of two Person tuples, or 0 if the first names conflict"""
+    first = first_name_similarity(query.first, candidate.first)
+    if first == 0.0:
+        return 0.0
+    last = last_name_similarity(query.last, candidate.last)
+    if query.depts is None:
+        dept = 1.0  # scoped lookups (same course) share the department by definition
+    else:
+        dept = dept_similarity(query.depts, candidate.dept)
+    return WEIGHTS["last"] * last + WEIGHTS["first"] * first + WEIGHTS["dept"] * dept
+
+
+class Person:
+    __slots__ = ("key", "last", "first", "dept", "depts")
+
+    def __init__(self, key, name=None, last=None, first=None, dept=None, depts=()):
+        """
+        key: what a match returns (e.g. an RMP row or a GPA instructor name)
+        name: 'Last, First' string, or pass last/first separately
+        dept: candidate's department label; depts: query's acceptable labels,
+            or None when the scope already implies the department
+        """
+        if name is not None:
+            self.last, self.first = split_name(name)
+        else:
+            self.last, self.first = tuple(normalize(last).split()), normalize(first)
+        self.key = key
+        self.dept = dept
+        self.depts = depts
+
+    def blocking_keys(self, scope=None):
+        initial = self.first[:1]
+        return {(scope, soundex(token), initial) for token in self.last}
+
+
+# ============================================================
+#  REPORTING
+# ============================================================
+
+
+COUNTER_FIELDS = (
+    "queries",
+    "matched",
+    "ambiguous",
+    "unmatched",
+    "exact",
+    "comparisons",
+    "seconds",
+)
+
+
+class MatchReport:
+    """Match quality and throughput for one index over one run"""
+
+    SCORE_BUCKETS = (0.8, 0.85, 0.9, 0.95, 1.0)
+
+    def __init__(self, name, candidates):
+        self.name = name
+        self.candidates = candidates
+        self.blocks = 0
+        self.queries = 0
+        self.matched = 0
+        self.ambiguous = 0
+        self.unmatched = 0
+        self.exact = 0
+        self.comparisons = 0
+        self.seconds = 0.0
+        self.score_histogram = {f">={b}": 0 for b in self.SCORE_BUCKETS}
+
+    def record(self, best_score, outcome, comparisons, seconds, exact_name=False):
+        self.queries += 1
+        self.comparisons += comparisons
+        self.seconds += seconds
+        if outcome == "matched":
+            self.matched += 1
+            if exact_name:
+                self.exact += 1
+            for bucket in reversed(self.SCORE_BUCKETS):
+                if best_score >= bucket - 1e-9:
+                    self.score_histogram[f">={bucket}"] += 1
+                    break
+        elif outcome == "ambiguous":
+            self.ambiguous += 1
+        else:
+            self.unmatched += 1
+
+    def as_dict(self):
+        naive = self.queries * self.candidates
+        return {
+            "index": self.name,
+            "candidates": self.candidates,
+            "blocks": self.blocks,
+            "queries": self.queries,
+            "matched": self.matched,
+            "match_rate": (
+                round(self.matched / self.queries, 4) if self.queries else None
+            ),
+            "exact_name_matches": self.exact,
+            "fuzzy_name_matches": self.matched - self.exact,
+            "ambiguous": self.ambiguous,
+            "unmatched": self.unmatched,
+            "score_histogram": self.score_histogram,
+            "comparisons": self.comparisons,
+            "naive_comparisons": naive,
+            "seconds": round(self.seconds, 4),
+            "queries_per_second": (
+                round(self.queries / self.seconds) if self.seconds else None
+            ),
+        }
+
+    @classmethod
+    def combine(cls, reports):
+        """One report adding up partial reports of the same index"""
+        reports = list(reports)
+        total = cls(reports[0].name, reports[0].candidates)
+        total.blocks = reports[0].blocks
+        for report in reports:
+            for field in COUNTER_FIELDS:
+                setattr(total, field, getattr(total, field) + getattr(report, field))
+            for bucket, count in report.score_histogram.items():
+                total.score_histogram[bucket] += count
+        return total
+
+    def summary(self):
+        d = self.as_dict()
+        return (
+            f"{self.name}: matched {d['matched']}/{d['queries']} "
+            f"({(d['match_rate'] or 0):.1%}; {d['fuzzy_name_matches']} fuzzy, "
+            f"{d['ambiguous']} ambiguous), {d['comparisons']} comparisons "
+            f"vs {d['naive_comparisons']} unblocked, "
+            f"{d['queries_per_second']} queries/s"
+        )
+
+
+# ============================================================
+#  INDEX
+# ============================================================
+
+
+class InstructorIndex:
+    """Blocked lookup of query Persons against a fixed set of candidate Persons"""
+
+    def __init__(self, name, candidates, scope_of=None):
+        """
+        candidates: Person objects
+        scope_of: optional Person -> scope (e.g. course ID); queries only see
+            candidates in their own scope
+        """
+        self.blocks = defaultdict(list)
+        # (scope, soundex) -> first initials with a block, for queries without one
+        self.initials = defaultdict(set)
+        seen = set()
+        for person in candidates:
+            scope = scope_of(person) if scope_of else None
+            # Duplicate profiles (same name and department) would otherwise
+            # always tie; the first one listed wins
+            identity = (scope, person.last, person.first, person.dept)
+            if identity in seen:
+                continue
+            seen.add(identity)
+            for key in person.blocking_keys(scope):
+                self.blocks[key].append(person)
+                self.initials[key[:2]].add(key[2])
+        self.report = MatchReport(name, len(seen))
+        self.report.blocks = len(self.blocks)
+
+    def take_report(self):
+        """Returns the report so far and starts a new, empty one"""
+        report = self.report
+        self.report = MatchReport(report.name, report.candidates)
+        self.report.blocks = report.blocks
+        return report
+
+    def _lookup_keys(self, query, scope):
+        """
+        The query's own blocks, plus those of candidates with no first name
+        (which score 0.5 on it). Without a first name, every initial's block.
+        """
+        keys = set()
+        for key in query.blocking_keys(scope):
+            name_key, initial = key[:2], key[2]
+            if initial:
+                keys.update((key, (*name_key, "")))
+            else:
+                keys.update((*name_key, i) for i in self.initials.get(name_key, ()))
+        return keys
+
+    def _scored(self, query, scope):
+        seen = {}
+        for key in self._lookup_keys(query, scope):
+            for person in self.blocks.get(key, ()):
+                if id(person) not in seen:
+                    seen[id(person)] = (score(query, person), person)
+        return sorted(seen.values(), key=lambda pair: -pair[0])
+
+    @staticmethod
+    def _exact_name(query, scored):
+        """
+        Same last name and fully compatible first name (equal, or an initial
+        of it); catalog names only carry initials, so full names rarely agree
+        """
+        if not scored:
+            return False
+        best = scored[0][1]
+        return (
+            best.last == query.last
+            and first_name_similarity(query.first, best.first) == 1.0
+        )
+
+    def match(self, query, scope=None):
+        """The single best candidate's key, or None if nothing (or too much) fits"""
+        start = time.perf_counter()
+        scored = self._scored(query, scope)
+        best_score = scored[0][0] if scored else 0.0
+        if best_score < MATCH_THRESHOLD:
+            outcome, result = "unmatched", None
+        elif (
+            len(scored) > 1
+            and best_score - scored[1][0] < AMBIGUITY_MARGIN
+            and scored[1][1].key != scored[0][1].key
+        ):
+            outcome, result = "ambiguous", None
+        else:
+            outcome, result = "matched", scored[0][1].key
+        self.report.record(
+            best_score,
+            outcome,
+            len(scored),
+            time.perf_counter() - start,
+            exact_name=self._exact_name(query, scored),
+        )
+        return result
+
+    def match_all(self, query, scope=None):
+        """Keys of every candidate above the threshold (name variants of one person)"""
+        start = time.perf_counter()
+        scored = self._scored(query, scope)
+        keys = [person.key for s, person in scored if s >= MATCH_THRESHOLD]
+        best_score = scored[0][0] if scored else 0.0
+        self.report.record(
+            best_score,
+            "matched" if keys else "unmatched",
+            len(scored),
+            time.perf_counter() - start,
+            exact_name=self._exact_name(query, scored),
+        )
+        return keys
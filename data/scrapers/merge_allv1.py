@@ -1,8 +1,11 @@
+import argparse
 import json
 import csv
 from collections import defaultdict
 import os
 
+from instructor_matching import InstructorIndex, MatchReport, Person
+from merge_pool import default_workers, map_departments
 
 DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 RAW_DIR = os.path.join(DATA_DIR, "raw")
@@ -76,16 +79,18 @@ def clean_prereq(text):
 
 
 def build_rmp_lookup(ratings):
-    lookup = defaultdict(list)
-    for prof in ratings:
-        last = prof["lastName"].lower().strip()
-        first_init = prof["firstName"][0].lower().strip()
-        dept = prof["department"]
-        lookup[(last, first_init, dept)].append(prof)
-    return lookup
+    """Fuzzy index over the RMP professors; matches are positions in ``ratings``"""
+    people = [
+        Person(
+            i, last=prof["lastName"], first=prof["firstName"], dept=prof["department"]
+        )
+        for i, prof in enumerate(ratings)
+    ]
+    return InstructorIndex("RMP", people)
 
 
 def build_gpa_lookup(gpa_file):
+    """(course_id, instructor as written in the GPA file) -> list of GPAs"""
     lookup = defaultdict(list)
     with open(gpa_file, "r") as f:
         reader = csv.reader(f)
@@ -105,71 +110,108 @@ def build_gpa_lookup(gpa_file):
             if "," not in instructor:
                 continue
 
-            last, first = instructor.split(",")
-            last = last.strip().lower()
-            first_init = first.strip()[0].lower()
-
-            lookup[(course_id.strip(), last, first_init)].append(gpa_val)
+            lookup[(course_id.strip(), instructor)].append(gpa_val)
 
     return lookup
 
 
-def merge_data(courses, rmp_lookup, gpa_lookup):
+def build_gpa_index(gpa_lookup):
+    """Fuzzy index over the GPA instructor names, scoped to each course"""
+    people = [Person(key, name=key[1]) for key in gpa_lookup]
+    return InstructorIndex("GPA", people, scope_of=lambda person: person.key[0])
+
+
+def merge_department(dept, dept_courses, shared):
+    """Enriches one department's courses; returns them, the match count and reports"""
+    ratings = shared["ratings"]
+    rmp_lookup = shared["rmp_lookup"]
+    gpa_lookup = shared["gpa_lookup"]
+    gpa_index = shared["gpa_index"]
     enriched = {}
     total_matches = 0
-
-    for dept, dept_courses in courses.items():
-        enriched.setdefault(dept, {})
-        long_name = DEPT_MAP.get(dept, dept)
-
-        for course_id, info in dept_courses.items():
-
-            prereq_clean = clean_prereq(info.get("prerequisites"))
-            instructor_block = {}
-
-            for inst in info["instructors"]:
-                last, first = inst.split(",")
-                last = last.strip().lower()
-                first_init = first.strip()[0].lower()
-
-                # RMP
-                rmp_data = rmp_lookup.get((last, first_init, long_name))
-                if rmp_data:
-                    rmp = rmp_data[0]
-                    rating = rmp["avgRating"]
-                    difficulty = rmp["avgDifficulty"]
-                else:
-                    rating = None
-                    difficulty = None
-
-                # GPA
-                gpa_vals = gpa_lookup.get((course_id, last, first_init))
-                avg_gpa = round(sum(gpa_vals) / len(gpa_vals), 2) if gpa_vals else None
-
-                if rating or avg_gpa:
-                    total_matches += 1
-
-                instructor_block[inst] = {
-                    "rating": rating,
-                    "difficulty": difficulty,
-                    "avg_gpa": avg_gpa,
-                }
-
-            enriched[dept][course_id] = {
-                "course_id": course_id,
-                "title": info["title"],
-                "description": info["description"],
-                "credit_hours": info["credit_hours"],
-                "prerequisites": prereq_clean,
-                "instructors": instructor_block,
-                "semesters": info["semesters"],
-                "gen_ed": info["gen_ed"],
+    long_name = DEPT_MAP.get(dept, dept)
+
+    for course_id, info in dept_courses.items():
+
+        prereq_clean = clean_prereq(info.get("prerequisites"))
+        instructor_block = {}
+
+        for inst in info["instructors"]:
+            # RMP
+            depts = [long_name] if dept in DEPT_MAP else []
+            match = rmp_lookup.match(Person(None, name=inst, depts=depts))
+            if match is not None:
+                rmp = ratings[match]
+                rating = rmp["avgRating"]
+                difficulty = rmp["avgDifficulty"]
+            else:
+                rating = None
+                difficulty = None
+
+            # GPA
+            gpa_vals = [
+                val
+                for key in gpa_index.match_all(
+                    Person(None, name=inst, depts=None), course_id
+                )
+                for val in gpa_lookup[key]
+            ]
+            avg_gpa = round(sum(gpa_vals) / len(gpa_vals), 2) if gpa_vals else None
+
+            if rating or avg_gpa:
+                total_matches += 1
+
+            instructor_block[inst] = {
+                "rating": rating,
+                "difficulty": difficulty,
+                "avg_gpa": avg_gpa,
             }
 
-    return enriched, total_matches
+        enriched[course_id] = {
+            "course_id": course_id,
+            "title": info["title"],
+            "description": info["description"],
+            "credit_hours": info["credit_hours"],
+            "prerequisites": prereq_clean,
+            "instructors": instructor_block,
+            "semesters": info["semesters"],
+            "gen_ed": info["gen_ed"],
+        }
+
+    reports = [rmp_lookup.take_report(), gpa_index.take_report()]
+    return enriched, total_matches, reports
+
+
+def merge_data(courses, ratings, rmp_lookup, gpa_lookup, gpa_index, workers=None):
+    """
+    Merges each department in a process pool (see merge_pool.py). Returns the
+    enriched courses in catalog order, the match count and the match reports.
+    """
+    shared = {
+        "ratings": ratings,
+        "rmp_lookup": rmp_lookup,
+        "gpa_lookup": gpa_lookup,
+        "gpa_index": gpa_index,
+    }
+    enriched, total_matches, partial_reports = {}, 0, []
+    results = map_departments(merge_department, courses, shared, workers)
+    for dept, (part, matches, reports) in zip(courses, results):
+        enriched[dept] = part
+        total_matches += matches
+        partial_reports.append(reports)
+    reports = [MatchReport.combine(column) for column in zip(*partial_reports)]
+    return enriched, total_matches, reports
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge course, RMP and GPA data")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=default_workers(),
+        help="Departments merged in parallel (1 = no process pool)",
+    )
+    args = parser.parse_args()
 
     main_courses = load_json(COURSE_FILE)
     gened_courses = load_json(GENED_FILE)
@@ -177,8 +219,13 @@ if __name__ == "__main__":
     merged_courses = merge_course_jsons(main_courses, gened_courses)
     rmp_lookup = build_rmp_lookup(rmp_ratings)
     gpa_lookup = build_gpa_lookup(GPA_FILE)
-    enriched, matches = merge_data(merged_courses, rmp_lookup, gpa_lookup)
+    gpa_index = build_gpa_index(gpa_lookup)
+    enriched, matches, reports = merge_data(
+        merged_courses, rmp_ratings, rmp_lookup, gpa_lookup, gpa_index, args.workers
+    )
     print(f"Total instructors matched with RMP or GPA: {matches}")
+    for report in reports:
+        print(report.summary())
     os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
     with open(OUTPUT_FILE, "w") as f:
         json.dump(enriched, f, indent=4)
@@ -1,9 +1,14 @@
+import argparse
 import json
-import csv
-from collections import defaultdict
 import os
 import re
 
+import pandas as pd
+
+from gpa_store import GRADE_COLUMNS, summarize_histograms
+from instructor_matching import InstructorIndex, MatchReport, Person
+from merge_pool import default_workers, map_departments
+from prereq_parser import ParseReport, parse_prerequisites
 
 DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 RAW_DIR = os.path.join(DATA_DIR, "raw")
@@ -12,8 +17,11 @@ PROCESSED_DIR = os.path.join(DATA_DIR, "processed")
 COURSE_FILE = os.path.join(RAW_DIR, "uiuc_courses.json")
 GENED_FILE = os.path.join(RAW_DIR, "uiuc_gened_courses.json")
 RMP_FILE = os.path.join(RAW_DIR, "uiuc_professor_ratings.json")
-GPA_FILE = os.path.join(RAW_DIR, "gpa_cleaned.csv")
+GRADES_FILE = os.path.join(RAW_DIR, "gpa_distributions.json")
 OUTPUT_FILE = os.path.join(PROCESSED_DIR, "uiuc_courses_flatten.json")
+GRADES_OUTPUT_FILE = os.path.join(PROCESSED_DIR, "uiuc_course_grades.json")
+MATCH_REPORT_FILE = os.path.join(PROCESSED_DIR, "instructor_match_report.json")
+PREREQ_REPORT_FILE = os.path.join(PROCESSED_DIR, "prereq_parse_report.json")
 
 DEPT_MAP = {
     "CS": "Computer Science",
@@ -67,93 +75,55 @@ def clean_credit_hours(text):
 
 
 # ---------------------------
-# PREREQUISITES
+# RMP FRAME
 # ---------------------------
 
 
-def extract_course_codes(text):
-    raw = re.findall(r"\b([A-Za-z]{2,5}\s*\d{2,3})\b", text)
-
-    cleaned = []
-    for c in raw:
-        c = c.upper().replace(" ", "")
-        cleaned.append(c[:-3] + " " + c[-3:])
-    return cleaned
-
-
-def clean_prereq(text):
-    if not text or not text.strip():
-        return None
-
-    txt = text.strip()
-
-    if txt.lower().startswith("one of"):
-        codes = extract_course_codes(txt)
-        return {"type": "OR", "courses": codes}
-
-    if " or " in txt.lower():
-        codes = extract_course_codes(txt)
-        return {"type": "OR", "courses": codes}
+def build_rmp_frame(ratings):
+    # object dtype keeps RMP's ints as ints in the output JSON
+    df = pd.DataFrame(
+        ratings,
+        columns=["lastName", "firstName", "department", "avgRating", "avgDifficulty"],
+        dtype=object,
+    )
+    return df.rename(columns={"avgRating": "rating", "avgDifficulty": "difficulty"})
 
-    if " and " in txt.lower():
-        codes = extract_course_codes(txt)
-        return {"type": "AND", "courses": codes}
 
-    codes = extract_course_codes(txt)
-    if len(codes) == 1:
-        return {"type": "SINGLE", "course": codes[0]}
-
-    return {"type": "RAW", "text": text}
+def build_rmp_index(rmp_frame):
+    people = [
+        Person(row, last=last, first=first, dept=dept)
+        for row, last, first, dept in zip(
+            rmp_frame.index,
+            rmp_frame["lastName"],
+            rmp_frame["firstName"],
+            rmp_frame["department"],
+        )
+    ]
+    return InstructorIndex("RMP", people)
 
 
 # ---------------------------
-# RMP LOOKUP
+# GPA FRAME
 # ---------------------------
 
 
-def build_rmp_lookup(ratings):
-    lookup = defaultdict(list)
-    for prof in ratings:
-        last = prof["lastName"].lower().strip()
-        first_init = prof["firstName"][0].lower().strip()
-        dept = prof["department"]
-        lookup[(last, first_init, dept)].append(prof)
-    return lookup
-
-
-# ---------------------------
-# GPA LOOKUP
-# ---------------------------
-
-
-def build_gpa_lookup(gpa_file):
-    lookup = defaultdict(list)
-    with open(gpa_file, "r") as f:
-        reader = csv.reader(f)
-        for row in reader:
-            if len(row) < 4:
-                continue
-
-            course_id, _, instructor, gpa = row
-
-            if not gpa.strip() or gpa.lower() in ["na", "null", "--"]:
-                continue
-
-            try:
-                gpa_val = float(gpa)
-            except:
-                continue
-
-            if "," not in instructor:
-                continue
+def build_grade_frame(distributions):
+    """One row of grade counts per (course_id, instructor name in the grade data)"""
+    rows = [
+        (course_id, name, *stats["histogram"])
+        for course_id, course in distributions.items()
+        for name, stats in course["instructors"].items()
+    ]
+    return pd.DataFrame(rows, columns=["course_id", "gpa_name", *GRADE_COLUMNS])
 
-            last, first = instructor.split(",")
-            last = last.strip().lower()
-            first_init = first.strip()[0].lower()
 
-            lookup[(course_id.strip(), last, first_init)].append(gpa_val)
-
-    return lookup
+def build_grade_index(grade_frame):
+    """Grade-data names, blocked per course so a query only sees its own course"""
+    people = [
+        Person((course_id, name), name=name)
+        for course_id, name in zip(grade_frame["course_id"], grade_frame["gpa_name"])
+    ]
+    return InstructorIndex("GPA", people, scope_of=lambda person: person.key[0])
 
 
 # ---------------------------
@@ -161,71 +131,136 @@ def build_gpa_lookup(gpa_file):
 # ---------------------------
 
 
-def merge_data(courses, rmp_lookup, gpa_lookup):
-    enriched = {}
-    total_matches = 0
+def build_instructor_frame(courses):
+    """One row per (department, course, listed instructor), in catalog order"""
+    rows = [
+        (dept, course_id, name)
+        for dept, dept_courses in courses.items()
+        for course_id, info in dept_courses.items()
+        for name in info["instructors"]
+    ]
+    return pd.DataFrame(rows, columns=["dept", "course_id", "instructor"])
+
+
+def resolve_rmp(instructors, rmp_index):
+    """(instructor, dept) -> matched RMP row, resolved once per distinct pair"""
+    pairs = instructors[["instructor", "dept"]].drop_duplicates()
+    # Nullable ints, so a department with no matches still joins on the row index
+    pairs["rmp_row"] = pd.array(
+        [
+            rmp_index.match(
+                Person(
+                    None, name=name, depts=[DEPT_MAP[dept]] if dept in DEPT_MAP else []
+                )
+            )
+            for name, dept in zip(pairs["instructor"], pairs["dept"])
+        ],
+        dtype="Int64",
+    )
+    return pairs
+
+
+def resolve_grades(instructors, grade_frame, grade_index):
+    """(course_id, instructor) -> weighted GPA over every matching grade-data name"""
+    pairs = instructors[["course_id", "instructor"]].drop_duplicates()
+    matches = [
+        (course_id, name, key[1])
+        for course_id, name in zip(pairs["course_id"], pairs["instructor"])
+        for key in grade_index.match_all(Person(None, name=name, depts=None), course_id)
+    ]
+    matched = pd.DataFrame(matches, columns=["course_id", "instructor", "gpa_name"])
+    summed = (
+        matched.merge(grade_frame, on=["course_id", "gpa_name"])
+        .groupby(["course_id", "instructor"], as_index=False)[GRADE_COLUMNS]
+        .sum()
+    )
+    _, _, gpa, _ = summarize_histograms(summed[GRADE_COLUMNS].to_numpy())
+    summed["avg_gpa"] = gpa
+    return summed[["course_id", "instructor", "avg_gpa"]]
+
+
+def _nullable(column):
+    """Column values as a Python list with missing values as None"""
+    return column.astype(object).where(column.notna(), None).tolist()
+
+
+def _rounded(value):
+    return None if value is None else round(float(value), 2)
+
+
+def merge_courses(
+    courses, rmp_frame, rmp_index, grade_frame, grade_index, distributions
+):
+    """
+    Resolves every distinct listed instructor against RMP (by name and
+    department) and the grade data (by name within the course), joins the
+    results back in two left joins, then aggregates the course-level averages
+    with one groupby. Returns the enriched courses and the match count.
+    """
+    instructors = build_instructor_frame(courses)
+
+    joined = (
+        instructors.merge(
+            resolve_rmp(instructors, rmp_index), on=["instructor", "dept"], how="left"
+        )
+        .merge(
+            rmp_frame[["rating", "difficulty"]],
+            left_on="rmp_row",
+            right_index=True,
+            how="left",
+        )
+        .merge(
+            resolve_grades(instructors, grade_frame, grade_index),
+            on=["course_id", "instructor"],
+            how="left",
+        )
+    )
+    total_matches = int(
+        (
+            joined["rating"].notna()
+            | joined["difficulty"].notna()
+            | joined["avg_gpa"].notna()
+        ).sum()
+    )
+
+    course_stats = (
+        joined.assign(
+            rating=joined["rating"].astype(float),
+            difficulty=joined["difficulty"].astype(float),
+        )
+        .groupby(["dept", "course_id"], sort=False)[["rating", "difficulty"]]
+        .mean()
+    )
+    course_stats = dict(
+        zip(
+            course_stats.index,
+            zip(
+                _nullable(course_stats["rating"]), _nullable(course_stats["difficulty"])
+            ),
+        )
+    )
+
+    # Rows become nested dicts in one zip over plain lists, not per-row lookups
+    instructor_blocks = {}
+    for dept, course_id, name, rating, difficulty, avg_gpa in zip(
+        joined["dept"].tolist(),
+        joined["course_id"].tolist(),
+        joined["instructor"].tolist(),
+        _nullable(joined["rating"]),
+        _nullable(joined["difficulty"]),
+        _nullable(joined["avg_gpa"]),
+    ):
+        instructor_blocks.setdefault((dept, course_id), {})[name] = {
+            "rating": rating,
+            "difficulty": difficulty,
+            "avg_gpa": _rounded(avg_gpa),
+        }
 
+    enriched = {}
     for dept, dept_courses in courses.items():
-        long_name = DEPT_MAP.get(dept, dept)
-
         for course_id, info in dept_courses.items():
-
-            prereq_clean = clean_prereq(info.get("prerequisites"))
-            instructors_list = info["instructors"]
-
-            instructor_block = {}
-            rating_values = []
-            difficulty_values = []
-            gpa_values = []
-
-            for inst in instructors_list:
-                last, first = inst.split(",")
-                last = last.strip().lower()
-                first_init = first.strip()[0].lower()
-
-                inst_rating = None
-                inst_difficulty = None
-                inst_avg_gpa = None
-
-                # --- RMP ---
-                rmp_data = rmp_lookup.get((last, first_init, long_name))
-                if rmp_data:
-                    inst_rating = rmp_data[0].get("avgRating")
-                    inst_difficulty = rmp_data[0].get("avgDifficulty")
-
-                    if inst_rating is not None:
-                        rating_values.append(inst_rating)
-                    if inst_difficulty is not None:
-                        difficulty_values.append(inst_difficulty)
-
-                # --- GPA ---
-                gpa_vals = gpa_lookup.get((course_id, last, first_init))
-                if gpa_vals:
-                    inst_avg_gpa = sum(gpa_vals) / len(gpa_vals)
-                    gpa_values.append(inst_avg_gpa)
-
-                instructor_block[inst] = {
-                    "rating": inst_rating,
-                    "difficulty": inst_difficulty,
-                    "avg_gpa": (
-                        round(inst_avg_gpa, 2) if inst_avg_gpa is not None else None
-                    ),
-                }
-
-            # --- COURSE LEVEL ---
-            course_avg_rating = (
-                round(sum(rating_values) / len(rating_values), 2)
-                if rating_values
-                else None
-            )
-            course_avg_difficulty = (
-                round(sum(difficulty_values) / len(difficulty_values), 2)
-                if difficulty_values
-                else None
-            )
-            course_avg_gpa = (
-                round(sum(gpa_values) / len(gpa_values), 2) if gpa_values else None
-            )
+            key = (dept, course_id)
+            avg_rating, avg_difficulty = course_stats.get(key, (None, None))
 
             enriched[course_id] = {
                 "course_id": course_id,
@@ -233,11 +268,12 @@ def merge_data(courses, rmp_lookup, gpa_lookup):
                 "title": info["title"],
                 "description": info["description"],
                 "credit_hours": clean_credit_hours(info["credit_hours"]),
-                "prerequisites": prereq_clean,
-                "instructors": instructor_block,  # <-- FULL INSTRUCTOR DATA
-                "course_avg_rating": course_avg_rating,
-                "course_avg_difficulty": course_avg_difficulty,
-                "course_avg_gpa": course_avg_gpa,
+                "prerequisites": parse_prerequisites(info.get("prerequisites")),
+                # <-- FULL INSTRUCTOR DATA
+                "instructors": instructor_blocks.get(key, {}),
+                "course_avg_rating": _rounded(avg_rating),
+                "course_avg_difficulty": _rounded(avg_difficulty),
+                "course_avg_gpa": distributions.get(course_id, {}).get("weighted_gpa"),
                 "semesters": info["semesters"],
                 "gen_ed": info["gen_ed"],
             }
@@ -245,11 +281,50 @@ def merge_data(courses, rmp_lookup, gpa_lookup):
     return enriched, total_matches
 
 
+def merge_department(dept, dept_courses, shared):
+    """merge_courses for one department, plus the match reports of its queries"""
+    enriched, total_matches = merge_courses({dept: dept_courses}, **shared)
+    reports = [shared["rmp_index"].take_report(), shared["grade_index"].take_report()]
+    return enriched, total_matches, reports
+
+
+def merge_data(courses, rmp_frame, grade_frame, distributions, workers=None):
+    """
+    Merges each department in a process pool (see merge_pool.py) and stitches
+    the partial results back together in catalog order. Returns the enriched
+    courses, the match count and the per-index match reports.
+    """
+    shared = {
+        "rmp_frame": rmp_frame,
+        "rmp_index": build_rmp_index(rmp_frame),
+        "grade_frame": grade_frame,
+        "grade_index": build_grade_index(grade_frame),
+        "distributions": distributions,
+    }
+    enriched, total_matches, partial_reports = {}, 0, []
+    for part, matches, reports in map_departments(
+        merge_department, courses, shared, workers
+    ):
+        enriched.update(part)
+        total_matches += matches
+        partial_reports.append(reports)
+    reports = [MatchReport.combine(column) for column in zip(*partial_reports)]
+    return enriched, total_matches, reports
+
+
 # ---------------------------
 # MAIN
 # ---------------------------
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge course, RMP and grade data")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=default_workers(),
+        help="Departments merged in parallel (1 = no process pool)",
+    )
+    args = parser.parse_args()
 
     main_courses = load_json(COURSE_FILE)
     gened_courses = load_json(GENED_FILE)
@@ -257,15 +332,47 @@ if __name__ == "__main__":
 
     merged_courses = merge_course_jsons(main_courses, gened_courses)
 
-    rmp_lookup = build_rmp_lookup(rmp_ratings)
-    gpa_lookup = build_gpa_lookup(GPA_FILE)
+    distributions = load_json(GRADES_FILE)["courses"]
+    rmp_frame = build_rmp_frame(rmp_ratings)
+    grade_frame = build_grade_frame(distributions)
 
-    enriched, matches = merge_data(merged_courses, rmp_lookup, gpa_lookup)
+    enriched, matches, reports = merge_data(
+        merged_courses, rmp_frame, grade_frame, distributions, args.workers
+    )
 
     print(f"Total matched instructor records (RMP or GPA): {matches}")
+    for report in reports:
+        print(report.summary())
+
+    prereq_report = ParseReport()
+    for dept_courses in merged_courses.values():
+        for course_id, info in dept_courses.items():
+            prereq_report.record(
+                course_id,
+                info.get("prerequisites"),
+                enriched[course_id]["prerequisites"],
+            )
+    print(prereq_report.summary())
 
     os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
     with open(OUTPUT_FILE, "w") as f:
         json.dump(enriched, f, indent=4)
 
     print(f"Saved final dataset → {OUTPUT_FILE}")
+
+    # Grade distributions go to their own collection, keyed like the courses
+    grades = {
+        course_id: {"course_id": course_id, **distributions[course_id]}
+        for course_id in enriched
+        if course_id in distributions
+    }
+    with open(GRADES_OUTPUT_FILE, "w") as f:
+        json.dump(grades, f)
+
+    print(f"Saved {len(grades)} grade distributions → {GRADES_OUTPUT_FILE}")
+
+    with open(MATCH_REPORT_FILE, "w") as f:
+        json.dump([report.as_dict() for report in reports], f, indent=4)
+
+    with open(PREREQ_REPORT_FILE, "w") as f:
+        json.dump(prereq_report.as_dict(), f, indent=4)
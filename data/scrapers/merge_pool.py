@@ -0,0 +1,49 @@
+"""
+Runs a per-department merge step across a process pool.
+
+Departments are independent, so merge_allv1/merge_allv2 hand each one to a
+worker process. The read-only lookup tables (RMP frame, instructor indexes,
+grade data, ...) are passed to every worker once through the pool
+initializer, not pickled along with each task; a task only carries its
+department's courses. Tasks are submitted largest department first so one
+big department does not finish last on its own, and results come back in
+catalog order, so the merged output is identical for any worker count.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Lookup tables of the current worker process, set once by _init_worker
+_shared = {}
+
+
+def _init_worker(shared):
+    _shared.update(shared)
+
+
+def _run(func, dept, dept_courses):
+    return func(dept, dept_courses, _shared)
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def map_departments(func, courses, shared, workers=None):
+    """
+    [func(dept, dept_courses, shared) for each department of ``courses``],
+    in the order of ``courses``. ``func`` must be a module-level function.
+    With one worker (or one department) everything runs in this process.
+    """
+    workers = min(workers or default_workers(), len(courses))
+    if workers <= 1:
+        return [
+            func(dept, dept_courses, shared) for dept, dept_courses in courses.items()
+        ]
+
+    depts = sorted(courses, key=lambda dept: -len(courses[dept]))
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(shared,)
+    ) as pool:
+        futures = {dept: pool.submit(_run, func, dept, courses[dept]) for dept in depts}
+        return [futures[dept].result() for dept in courses]
@@ -0,0 +1,404 @@
+"""
+Compiles catalog prerequisite text into nested AND/OR trees.
+
+    "CS 225 and one of MATH 225 or MATH 415"
+        -> {"type": "AND", "courses": ["CS 225", {"type": "OR", "courses": [...]}]}
+
+Tree nodes (the "courses" key is kept from the flat format the API already
+served, so existing AND/OR/SINGLE consumers keep working):
+
+    "CS 225"                                          a course to have passed
+    {"type": "SINGLE", "course": "CS 225"}            same, at the root
+    {"type": "SINGLE", "course": "CS 225", "concurrent": True}
+                                                      passed or taken alongside
+    {"type": "CONDITION", "text": "consent of instructor"}
+                                                      not machine-checkable
+    {"type": "AND" | "OR", "courses": [node, ...]}
+
+The catalog's conventions, in binding order from loosest to tightest:
+
+- ";" separates required clauses; a clause starting with "or" ("...; or
+  consent of instructor") is an alternative to everything before it
+- "," separates list items; the list is joined by the conjunction in front
+  of its last item ("A, B, or C"), "A, B or C" is an OR and a plain "A, B"
+  an AND; "one of" / "either" turns the rest of the clause into an OR
+- within an item, "or" (and "/") binds tighter than "and", as in
+  "ECE 515 and MATH 444 or MATH 447", except that a trailing
+  "or <condition>" waives the whole item
+- "credit or concurrent registration in" marks the following courses of
+  the clause as takeable in the same term; "recommended" / "preferred"
+  items are advisory and left out
+
+Every pattern is compiled once at import and each clause is scanned with a
+single alternation regex. ParseReport tracks how much of the catalog ends
+up structured.
+"""
+
+import re
+from collections import Counter
+
+# ============================================================
+#  TOKENIZER
+# ============================================================
+
+CONCURRENT_PHRASE = (
+    r"(?:(?:credit|completion|previous)\s+(?:for\s+|of\s+)?or\s+)?"
+    r"concurrent(?:ly)?\s+(?:registration|enrollment|enrolled)(?:\s+in)?"
+    r"|must\s+be\s+concurrently\s+enrolled\s+in"
+)
+TOKEN_PATTERN = re.compile(
+    rf"(?P<concurrent>\b(?:{CONCURRENT_PHRASE})\b)"
+    r"|(?P<one_of>\b(?:one\s+of(?:\s+the\s+following(?:\s+courses)?)?|either)\b:?)"
+    r"|(?P<course>\b(?P<subject>(?-i:[A-Z]{2,5}|[A-Z][a-z]{1,4}))\s?(?P<number>\d{3})\b)"
+    r"|(?P<number_only>\b\d{3}\b)"
+    r"|(?P<and>\b(?:and|together\s+with)\b)"
+    r"|(?P<or>\bor\b)"
+    r"|(?P<comma>,)"
+    r"|(?P<slash>/)"
+    r"|(?P<concurrent_prev>\x00)"
+    r"|(?P<word>[^\s,/\x00]+)",
+    re.IGNORECASE,
+)
+# Parenthetical asides ("(formerly IS 501)", "(or equivalent ...)") are
+# dropped, except the ones allowing concurrent enrollment, which become \x00
+PARENTHETICAL = re.compile(r"\([^()]*\)|\([^()]*$")
+CONCURRENT_ASIDE = re.compile(r"concurrent", re.IGNORECASE)
+ADVISORY = re.compile(
+    r"recommend|preferred|preferably|would\s+be\s+useful|not\s+required",
+    re.IGNORECASE,
+)
+# Filler around condition text: "Junior standing required" -> "Junior standing"
+CONDITION_FILLER = re.compile(
+    r"^(?:by|is|are|with|the|required:?)\s+|\s+(?:is|are)?\s*required$|[\s:.-]+$",
+    re.IGNORECASE,
+)
+# Capitalized words that look like a subject before a 3-digit number
+NOT_SUBJECTS = {"OF", "IN", "ON", "OR", "FOR", "THE", "AND", "ALL", "TO"}
+
+
+def tokenize(clause):
+    """[(kind, value), ...] for one ';'-separated clause"""
+    tokens = []
+    for match in TOKEN_PATTERN.finditer(clause):
+        kind = match.lastgroup
+        if kind in ("subject", "number"):
+            kind = "course"
+        if kind == "course":
+            subject = match.group("subject").upper()
+            if subject in NOT_SUBJECTS:
+                tokens.append(("word", match.group(0)))
+                continue
+            tokens.append(("course", f"{subject} {match.group('number')}"))
+        else:
+            tokens.append((kind, match.group(0)))
+    return tokens
+
+
+# ============================================================
+#  TREE HELPERS
+# ============================================================
+
+
+def _course(course_id, concurrent):
+    if concurrent:
+        return {"type": "SINGLE", "course": course_id, "concurrent": True}
+    return course_id
+
+
+def _condition(tokens):
+    """CONDITION node from the text of ``tokens``, or None if it is only filler"""
+    text = _text(tokens)
+    previous = None
+    while text != previous:
+        previous, text = text, CONDITION_FILLER.sub("", text).strip()
+    if not text or text.lower() in ("required", "or", "and"):
+        return None
+    return {"type": "CONDITION", "text": text}
+
+
+def _node(kind, children):
+    """AND/OR node with nested same-kind nodes flattened and duplicates dropped"""
+    flat = []
+    for child in children:
+        if child is None:
+            continue
+        if isinstance(child, dict) and child.get("type") == kind:
+            candidates = child["courses"]
+        else:
+            candidates = [child]
+        for candidate in candidates:
+            if candidate not in flat:
+                flat.append(candidate)
+    if not flat:
+        return None
+    if len(flat) == 1:
+        return flat[0]
+    return {"type": kind, "courses": flat}
+
+
+def _is_condition(node):
+    return isinstance(node, dict) and node.get("type") == "CONDITION"
+
+
+# ============================================================
+#  PARSER
+# ============================================================
+
+
+class _ClauseParser:
+    """Parses the tokens of one clause; concurrency carries across its items"""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.concurrent = False
+        self.subject = None  # "MATH 347 or 348" reuses the last subject
+
+    def alternative(self, tokens):
+        """One item: its courses (subject carried to bare numbers) or a condition"""
+        courses = []
+        for kind, value in tokens:
+            if kind == "concurrent":
+                self.concurrent = True
+            elif kind == "course":
+                self.subject = value.split()[0]
+                courses.append(_course(value, self.concurrent))
+            elif kind == "number_only" and self.subject:
+                courses.append(_course(f"{self.subject} {value}", self.concurrent))
+        if courses:
+            return _node("AND", courses)
+        return _condition(tokens)
+
+    def item(self, tokens):
+        """Comma-free tokens: AND of OR-groups, with a trailing OR-condition lifted"""
+        if not _has_courses(tokens):
+            # "Junior or senior standing and consent of instructor" stays one text
+            return _condition(tokens)
+        # A "(may be taken concurrently)" aside applies to the whole item
+        aside = any(kind == "concurrent_prev" for kind, _ in tokens)
+        tokens = [token for token in tokens if token[0] != "concurrent_prev"]
+        and_parts, current = [], []
+        for token in tokens + [("and", None)]:
+            if token[0] == "and":
+                if current:
+                    and_parts.append(current)
+                current = []
+            else:
+                current.append(token)
+
+        parsed = []
+        for part in and_parts:
+            alternatives, current = [], []
+            for token in part + [("or", None)]:
+                if token[0] in ("or", "slash"):
+                    if current:
+                        alternatives.append(self.alternative(current))
+                    current = []
+                else:
+                    current.append(token)
+            parsed.append([a for a in alternatives if a is not None])
+
+        waiver = None
+        if len(parsed) > 1 and len(parsed[-1]) > 1 and _is_condition(parsed[-1][-1]):
+            waiver = parsed[-1].pop()
+        node = _node("AND", [_node("OR", alternatives) for alternatives in parsed])
+        if aside:
+            node = _mark_concurrent(node)
+        return _node("OR", [node, waiver]) if waiver else node
+
+    def parse(self):
+        if not _has_courses(self.tokens):
+            if ADVISORY.search(_text(self.tokens)):
+                return None
+            return _condition(self.tokens)
+
+        segments, current = [], []
+        for token in self.tokens + [("comma", ",")]:
+            if token[0] == "comma":
+                if current:
+                    segments.append(current)
+                current = []
+            else:
+                current.append(token)
+
+        entries = []  # (leading conjunction, node)
+        group = None  # "one of" collects the rest of the clause into one OR
+        for segment in segments:
+            conjunction = None
+            if segment[0][0] in ("and", "or"):
+                conjunction = segment[0][0]
+                segment = segment[1:]
+            starts_group = any(kind == "one_of" for kind, _ in segment)
+            if ADVISORY.search(_text(segment)):
+                if starts_group:
+                    break  # "strongly recommend one of A, B, C" is advisory throughout
+                continue
+            tokens = [token for token in segment if token[0] != "one_of"]
+            node = self.item(tokens)
+            if group is not None and conjunction == "and":
+                group = None  # "..., one of A or B, and C"
+            if group is not None:
+                group.append(node)
+            elif starts_group:
+                group = [node]
+                entries.append((conjunction, group))
+            elif node is not None:
+                entries.append((conjunction, node))
+
+        nodes = [
+            _node("OR", value) if isinstance(value, list) else value
+            for _, value in entries
+        ]
+        conjunctions = [c for c, _ in entries if c]
+        if conjunctions:
+            kind = conjunctions[-1].upper()
+        elif (
+            len(nodes) > 1
+            and isinstance(nodes[-1], dict)
+            and nodes[-1].get("type") == "OR"
+            and all(isinstance(node, str) for node in nodes[:-1])
+        ):
+            kind = "OR"  # "A, B or C"
+        else:
+            kind = "AND"
+        return _node(kind, nodes)
+
+
+def _text(tokens):
+    words = " ".join(value for kind, value in tokens if kind != "concurrent_prev")
+    return words.replace(" ,", ",")
+
+
+def _has_courses(tokens):
+    return any(kind == "course" for kind, _ in tokens)
+
+
+def _mark_concurrent(node):
+    if isinstance(node, str):
+        return _course(node, True)
+    if isinstance(node, dict) and node.get("type") in ("AND", "OR"):
+        return {**node, "courses": [_mark_concurrent(c) for c in node["courses"]]}
+    if isinstance(node, dict) and node.get("type") == "SINGLE":
+        return {**node, "concurrent": True}
+    return node
+
+
+def _strip_parentheticals(text):
+    def replace(match):
+        return " \x00 " if CONCURRENT_ASIDE.search(match.group(0)) else " "
+
+    return PARENTHETICAL.sub(replace, text)
+
+
+def parse_prerequisites(text):
+    """Prerequisite text -> normalized tree (see module docstring), or None"""
+    if not text or not text.strip():
+        return None
+    text = _strip_parentheticals(" ".join(text.split()))
+
+    tree = None
+    for clause in text.split(";"):
+        tokens = tokenize(clause)
+        if not tokens:
+            continue
+        waives_previous = tokens[0][0] == "or"
+        node = _ClauseParser(tokens[1:] if waives_previous else tokens).parse()
+        if node is None:
+            continue
+        if waives_previous and tree is not None:
+            tree = _node("OR", [tree, node])
+        else:
+            tree = _node("AND", [tree, node])
+
+    if isinstance(tree, str):
+        return {"type": "SINGLE", "course": tree}
+    return tree
+
+
+# ============================================================
+#  COVERAGE
+# ============================================================
+
+
+def tree_courses(tree):
+    """Every course ID referenced by a tree"""
+    if tree is None:
+        return set()
+    if isinstance(tree, str):
+        return {tree}
+    if tree.get("type") == "SINGLE":
+        return {tree["course"]}
+    return set().union(*(tree_courses(child) for child in tree.get("courses", [])))
+
+
+def _any_node(tree, predicate):
+    if not isinstance(tree, dict):
+        return False
+    if predicate(tree):
+        return True
+    return any(_any_node(child, predicate) for child in tree.get("courses", []))
+
+
+class ParseReport:
+    """How much of the catalog's prerequisite text became checkable trees"""
+
+    def __init__(self):
+        self.shapes = Counter()
+        self.concurrent = 0
+        self.dropped = []
+
+    def record(self, course_id, text, tree):
+        if not text or not text.strip():
+            return
+        courses = tree_courses(tree)
+        if tree is None:
+            shape = "advisory_only"
+        elif not courses:
+            shape = "conditions_only"
+        elif _any_node(tree, _is_condition):
+            shape = "courses_and_conditions"
+        else:
+            shape = "courses_only"
+        self.shapes[shape] += 1
+        if _any_node(tree, lambda node: node.get("concurrent")):
+            self.concurrent += 1
+
+        # Course codes outside asides and advisory items that the tree lost
+        required = set()
+        for clause in _strip_parentheticals(text).split(";"):
+            for segment in clause.split(","):
+                tokens = tokenize(segment)
+                if ADVISORY.search(segment):
+                    if any(kind == "one_of" for kind, _ in tokens):
+                        break
+                    continue
+                required.update(value for kind, value in tokens if kind == "course")
+        missing = sorted(required - courses)
+        if missing:
+            self.dropped.append(
+                {"course_id": course_id, "text": text, "missing": missing}
+            )
+
+    def as_dict(self):
+        total = sum(self.shapes.values())
+        structured = self.shapes["courses_only"] + self.shapes["courses_and_conditions"]
+        return {
+            "texts": total,
+            "shapes": dict(self.shapes),
+            "with_courses": structured,
+            "fully_structured_rate": (
+                round(self.shapes["courses_only"] / total, 4) if total else None
+            ),
+            "with_concurrent": self.concurrent,
+            "dropped_course_references": self.dropped,
+        }
+
+    def summary(self):
+        d = self.as_dict()
+        return (
+            f"Prerequisites: {d['texts']} texts, "
+            f"{self.shapes['courses_only']} courses only, "
+            f"{self.shapes['courses_and_conditions']} with conditions, "
+            f"{self.shapes['conditions_only']} conditions only, "
+            f"{self.shapes['advisory_only']} advisory only; "
+            f"{len(self.dropped)} with dropped course references"
+        )
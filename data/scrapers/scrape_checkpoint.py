@@ -0,0 +1,160 @@
+"""
+Checkpointed, resumable scraping into append-only JSONL shards.
+
+A scrape is split into (department, year, semester) work units. When a unit
+finishes, its courses are appended to shards/<department>.jsonl and fsynced,
+then the manifest records the unit as done together with the shard's new
+committed size. After a crash, bytes past the committed size (a half-written
+unit) are truncated and only the units not marked done are scraped again.
+
+compact() folds the shards into the usual {department: {course_id: course}}
+JSON one department at a time, applying terms in the original loop order so
+the result matches an uninterrupted in-memory run.
+"""
+
+import json
+import os
+import shutil
+import time
+
+MANIFEST_NAME = "manifest.json"
+SHARDS_DIR = "shards"
+
+
+def unit_id(dept, year, semester):
+    return f"{dept}/{year}/{semester}"
+
+
+def _write_atomic(path, text):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class ScrapeCheckpoint:
+    def __init__(self, run_dir, units, fresh=False):
+        """
+        run_dir: where the manifest and shards live (one per output file)
+        units: ordered (department, year, semester) tuples for this run
+        fresh: discard any previous progress in run_dir
+        """
+        self.run_dir = run_dir
+        self.units = list(units)
+        self.manifest_path = os.path.join(run_dir, MANIFEST_NAME)
+        if fresh and os.path.isdir(run_dir):
+            shutil.rmtree(run_dir)
+        os.makedirs(os.path.join(run_dir, SHARDS_DIR), exist_ok=True)
+
+        manifest = self._load_manifest()
+        self.done = manifest.get("done", {})
+        self.committed = manifest.get("committed", {})
+        self._truncate_uncommitted()
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self):
+        manifest = {
+            "units": [unit_id(*unit) for unit in self.units],
+            "done": self.done,
+            "committed": self.committed,
+            "updated_at": time.time(),
+        }
+        _write_atomic(self.manifest_path, json.dumps(manifest, indent=2))
+
+    def shard_path(self, dept):
+        return os.path.join(self.run_dir, SHARDS_DIR, f"{dept}.jsonl")
+
+    def _truncate_uncommitted(self):
+        """Drop lines a crashed run appended after its last committed unit"""
+        shards_dir = os.path.join(self.run_dir, SHARDS_DIR)
+        for name in os.listdir(shards_dir):
+            if not name.endswith(".jsonl"):
+                continue
+            dept = name[: -len(".jsonl")]
+            path = os.path.join(shards_dir, name)
+            size = self.committed.get(dept, 0)
+            if os.path.getsize(path) > size:
+                print(f"Discarding uncommitted tail of {name}")
+                with open(path, "r+b") as f:
+                    f.truncate(size)
+
+    def pending(self):
+        """Units still to scrape, in run order"""
+        return [unit for unit in self.units if unit_id(*unit) not in self.done]
+
+    def commit(self, dept, year, semester, results):
+        """
+        Durably records one finished unit.
+        results: (course ID, course record, instructors) tuples from fetch_term
+        """
+        uid = unit_id(dept, year, semester)
+        path = self.shard_path(dept)
+        with open(path, "a", encoding="utf-8") as f:
+            for full_id, course, instructors in results:
+                record = {
+                    **course,
+                    "instructors": sorted(instructors),
+                    "semesters": [semester],
+                }
+                f.write(json.dumps({"unit": uid, "course": record}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.committed[dept] = os.path.getsize(path)
+        self.done[uid] = len(results)
+        self._save_manifest()
+
+    def compact(self, output_path, departments):
+        """
+        Folds the shards into {department: {course_id: course}} JSON.
+        Memory holds one department at a time.
+        """
+        rank = {unit_id(*unit): i for i, unit in enumerate(self.units)}
+        total = 0
+        tmp_path = f"{output_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as out:
+            out.write("{\n")
+            for i, dept in enumerate(departments):
+                total += self._write_department(out, dept, rank, first=i == 0)
+            out.write("\n}")
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp_path, output_path)
+        return total
+
+    def _write_department(self, out, dept, rank, first):
+        lines = []
+        path = self.shard_path(dept)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                lines = [json.loads(line) for line in f if line.strip()]
+        lines = [line for line in lines if line["unit"] in rank]
+        # Stable sort keeps each unit's courses in the order they were listed
+        lines.sort(key=lambda line: rank[line["unit"]])
+
+        courses = {}
+        for line in lines:
+            record = line["course"]
+            course = courses.setdefault(
+                record["course_id"],
+                {**record, "instructors": [], "semesters": []},
+            )
+            for name in record["instructors"]:
+                if name not in course["instructors"]:
+                    course["instructors"].append(name)
+            for semester in record["semesters"]:
+                if semester not in course["semesters"]:
+                    course["semesters"].append(semester)
+
+        # Same layout as json.dump(departments, f, indent=4), one department at a time
+        if not first:
+            out.write(",\n")
+        out.write(json.dumps({dept: courses}, indent=4, ensure_ascii=False)[2:-2])
+        return len(courses)
@@ -1,3 +1,6 @@
 #!/bin/bash
 cd back-end
-exec gunicorn -w 4 -k uvicorn.workers.UvicornWorker --bind 0.0.0.0:$PORT main:app
+# Shared directory where each gunicorn worker writes its Prometheus samples
+export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/semester-planner-metrics}"
+rm -rf "$PROMETHEUS_MULTIPROC_DIR" && mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+exec gunicorn -c gunicorn.conf.py -w 4 -k uvicorn.workers.UvicornWorker --preload --bind 0.0.0.0:$PORT main:app